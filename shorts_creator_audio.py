@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+YouTube Shorts Creator - Audio Extraction
+Decodes the reaction soundtrack once and shares it between Whisper and the audio mix,
+and finds the parts of it that contain speech
+"""
+
+import os
+import subprocess
+import tempfile
+from bisect import bisect_right
+import numpy as np
+import imageio_ffmpeg
+from moviepy.audio.AudioClip import AudioArrayClip
+
+
+# Mixing rate: the output's audio rate (ShortsCreator.AUDIO_FPS), since
+# moviepy converts rates by picking the nearest sample, without filtering
+MIX_SAMPLE_RATE = 44100
+MIX_CHANNELS = 2
+
+# Whisper expects 16 kHz mono float32 (decoded as a second ffmpeg output,
+# resampled by ffmpeg from the same decode)
+WHISPER_SAMPLE_RATE = 16000
+
+# Voice activity detection: a frame is speech if its voice-band level is
+# VAD_THRESHOLD_DB above the noise floor (a low percentile of all frames)
+# and above VAD_MIN_LEVEL_DB (dB relative to a full-scale signal)
+VAD_FRAME_SECONDS = 0.032
+VAD_BAND_HZ = (250, 4000)
+VAD_FLOOR_PERCENTILE = 10
+VAD_THRESHOLD_DB = 9.0
+VAD_MIN_LEVEL_DB = -55.0
+# Speech frames are merged across short pauses, regions shorter than
+# VAD_MIN_SPEECH_SECONDS are dropped as clicks, and the rest are padded
+VAD_PAD_SECONDS = 0.25
+VAD_MERGE_GAP_SECONDS = 0.5
+VAD_MIN_SPEECH_SECONDS = 0.15
+
+
+def _lowpass_taps(decimation, num_taps=48):
+    """Windowed-sinc anti-aliasing filter for integer decimation"""
+    cutoff = 0.5 / decimation
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(num_taps)
+    return (taps / taps.sum()).astype(np.float32)
+
+
+def decimate(samples, decimation, block_size=1 << 18):
+    """
+    Low-pass filter and downsample a mono signal by an integer factor
+    Only the kept output samples are computed, in blocks to bound memory
+    """
+    if decimation == 1:
+        return np.ascontiguousarray(samples, dtype=np.float32)
+
+    taps = _lowpass_taps(decimation)
+    pad = len(taps) // 2
+    padded = np.pad(samples.astype(np.float32, copy=False), (pad, len(taps) - pad))
+    windows = np.lib.stride_tricks.sliding_window_view(padded, len(taps))[::decimation]
+    output_length = (len(samples) + decimation - 1) // decimation
+    windows = windows[:output_length]
+
+    output = np.empty(output_length, dtype=np.float32)
+    for start in range(0, output_length, block_size):
+        stop = min(start + block_size, output_length)
+        output[start:stop] = windows[start:stop] @ taps[::-1]
+    return output
+
+
+class PCMClip(AudioArrayClip):
+    """
+    AudioArrayClip that maps times to the nearest sample
+
+    moviepy's version truncates fps * t, so float error in t repeats or
+    skips samples (and it zeroes the first one), audible as distortion of
+    high tones even when the clip is written at its own rate.
+
+    The samples sit in one holder shared with every copy moviepy makes
+    (subclip, fx, set_duration), so release() frees them for all of them.
+    """
+
+    def __init__(self, array, fps):
+        super().__init__(array, fps)
+        self.array = None
+        self._source = source = [array]
+
+        def make_frame(t):
+            array = source[0]
+            indices = np.round(self.fps * np.asarray(t)).astype(int)
+            inside = (indices >= 0) & (indices < len(array))
+            if indices.ndim == 0:
+                return array[indices] if inside else 0 * array[0]
+            result = np.zeros((len(indices), array.shape[1]))
+            result[inside] = array[indices[inside]]
+            return result
+
+        self.make_frame = make_frame
+
+    def release(self):
+        """Drop the samples; this clip and its copies cannot be played afterwards"""
+        self._source[0] = None
+
+
+class DecodedAudio:
+    """
+    Reaction soundtrack decoded once to float32 PCM
+
+    The samples live in a memory-mapped temp file, so long reactions do not
+    have to fit in RAM, as does the 16 kHz mono copy for Whisper
+    (whisper_path) when decode_audio wrote one. Call close() when the job is
+    done to remove them.
+    """
+
+    def __init__(self, samples, sample_rate, temp_path=None, whisper_path=None):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.temp_path = temp_path
+        self.whisper_path = whisper_path
+        self._whisper_audio = None
+        self._clips = []
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate
+
+    def to_whisper(self):
+        """Return the soundtrack as 16 kHz mono float32, as whisper.transcribe() expects"""
+        if self._whisper_audio is None:
+            if self.whisper_path is not None:
+                self._whisper_audio = np.memmap(self.whisper_path, dtype=np.float32, mode='r')
+            elif self.sample_rate % WHISPER_SAMPLE_RATE == 0:
+                mono = self.samples.mean(axis=1, dtype=np.float32)
+                self._whisper_audio = decimate(mono, self.sample_rate // WHISPER_SAMPLE_RATE)
+            else:
+                raise ValueError(
+                    f"No 16 kHz copy to transcribe, and {self.sample_rate} Hz is not a multiple of it"
+                )
+        return self._whisper_audio
+
+    def to_audio_clip(self):
+        """Return the soundtrack as a moviepy audio clip for mixing"""
+        clip = PCMClip(self.samples, fps=self.sample_rate)
+        self._clips.append(clip)
+        return clip
+
+    def close(self):
+        """
+        Release the buffers and delete their temp files
+        Clips from to_audio_clip() stop working: Windows cannot delete a file
+        that is still mapped, and a mix that is still alive would keep it so
+        """
+        for clip in self._clips:
+            clip.release()
+        self._clips = []
+        # Dropping the last reference to a memmap unmaps its file
+        self.samples = None
+        self._whisper_audio = None
+        for attribute in ('temp_path', 'whisper_path'):
+            path = getattr(self, attribute)
+            if path is not None:
+                try:
+                    os.unlink(path)
+                except OSError as e:
+                    print(f"   ⚠️ Could not delete temporary audio {path}: {e}")
+                setattr(self, attribute, None)
+
+
+def _temp_pcm_path():
+    file_descriptor, temp_path = tempfile.mkstemp(prefix='shorts_audio_', suffix='.f32')
+    os.close(file_descriptor)
+    return temp_path
+
+
+def decode_audio(media_path, sample_rate=MIX_SAMPLE_RATE, channels=MIX_CHANNELS):
+    """
+    Decode the first audio stream of a media file to float32 PCM, plus a
+    16 kHz mono copy for Whisper from the same decode
+    Returns a DecodedAudio, or None if the file has no audio stream
+    """
+    temp_path = _temp_pcm_path()
+    whisper_path = _temp_pcm_path()
+
+    command = [
+        imageio_ffmpeg.get_ffmpeg_exe(), '-v', 'error', '-y', '-i', str(media_path),
+        '-map', '0:a:0', '-vn', '-ac', str(channels), '-ar', str(sample_rate),
+        '-f', 'f32le', temp_path,
+        '-map', '0:a:0', '-vn', '-ac', '1', '-ar', str(WHISPER_SAMPLE_RATE),
+        '-f', 'f32le', whisper_path
+    ]
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    frame_bytes = 4 * channels
+    size = os.path.getsize(temp_path)
+    if result.returncode != 0 or size < frame_bytes:
+        os.unlink(temp_path)
+        os.unlink(whisper_path)
+        if b'matches no streams' in result.stderr or result.returncode == 0:
+            return None
+        raise RuntimeError(
+            f"Failed to decode audio from {media_path}:\n"
+            f"{result.stderr.decode('utf-8', 'replace').strip()}"
+        )
+
+    samples = np.memmap(
+        temp_path, dtype=np.float32, mode='r', shape=(size // frame_bytes, channels)
+    )
+    if os.path.getsize(whisper_path) < 4:
+        os.unlink(whisper_path)
+        whisper_path = None
+    return DecodedAudio(samples, sample_rate, temp_path, whisper_path)
+
+
+def _voice_band_levels(samples, sample_rate, frame_length, block_frames=4096):
+    """Voice-band level of every frame in dB (0 dB = full-scale noise)"""
+    frame_count = len(samples) // frame_length
+    window = np.hanning(frame_length).astype(np.float32)
+    frequencies = np.fft.rfftfreq(frame_length, 1.0 / sample_rate)
+    band = (frequencies >= VAD_BAND_HZ[0]) & (frequencies <= VAD_BAND_HZ[1])
+    # One-sided Parseval: scales band power to the mean square of the signal
+    scale = 2.0 / (frame_length * np.sum(window ** 2))
+
+    levels = np.empty(frame_count, dtype=np.float32)
+    for start in range(0, frame_count, block_frames):
+        stop = min(start + block_frames, frame_count)
+        frames = np.asarray(samples[start * frame_length:stop * frame_length], dtype=np.float32)
+        spectrum = np.fft.rfft(frames.reshape(-1, frame_length) * window, axis=1)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2)[:, band].sum(axis=1) * scale
+        levels[start:stop] = 10 * np.log10(power + 1e-12)
+    return levels
+
+
+def find_speech_regions(samples, sample_rate=WHISPER_SAMPLE_RATE):
+    """
+    Energy-based voice activity detection on mono audio
+    Returns the (start, end) seconds of every speech region, in order
+    """
+    frame_length = int(sample_rate * VAD_FRAME_SECONDS)
+    if len(samples) < frame_length:
+        return []
+    levels = _voice_band_levels(samples, sample_rate, frame_length)
+    threshold = max(np.percentile(levels, VAD_FLOOR_PERCENTILE) + VAD_THRESHOLD_DB, VAD_MIN_LEVEL_DB)
+    speech = levels > threshold
+
+    # Runs of speech frames as [start, stop) frame indices
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], speech.view(np.int8), [0]))))
+    runs = edges.reshape(-1, 2) * VAD_FRAME_SECONDS
+
+    # Join syllables and words separated by short pauses, then drop clicks
+    merged = []
+    for start, end in runs:
+        if merged and start - merged[-1][1] < VAD_MERGE_GAP_SECONDS:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+
+    duration = len(samples) / sample_rate
+    regions = []
+    for start, end in merged:
+        if end - start < VAD_MIN_SPEECH_SECONDS:
+            continue
+        start, end = max(0.0, start - VAD_PAD_SECONDS), min(duration, end + VAD_PAD_SECONDS)
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return [(round(start, 3), round(end, 3)) for start, end in regions]
+
+
+def split_at_pauses(regions, chunks, min_chunk_seconds=0.0):
+    """
+    Split speech regions into at most `chunks` groups of consecutive regions
+    with roughly equal speech time, so every cut falls in a pause
+    Groups get at least min_chunk_seconds of speech (fewer groups otherwise)
+    """
+    total = sum(end - start for start, end in regions)
+    if min_chunk_seconds > 0:
+        chunks = min(chunks, int(total // min_chunk_seconds))
+    chunks = max(1, min(chunks, len(regions)))
+    groups = [[]]
+    done = 0.0
+    for index, (start, end) in enumerate(regions):
+        # Cut once this group reaches its share, leaving a region for every group still to come
+        if (groups[-1] and len(groups) < chunks and done >= total * len(groups) / chunks
+                and len(regions) - index >= chunks - len(groups)):
+            groups.append([])
+        groups[-1].append((start, end))
+        done += end - start
+    return groups
+
+
+class SpeechClip:
+    """
+    The speech regions of a soundtrack joined into one shorter clip
+
+    Regions are separated by GAP_SECONDS of silence, so Whisper does not run
+    words from neighbouring regions together while still filling its
+    30-second windows with speech. offset_words() moves timestamps from the
+    clip back onto the original timeline.
+    """
+
+    GAP_SECONDS = 0.2
+
+    def __init__(self, samples, regions, sample_rate=WHISPER_SAMPLE_RATE):
+        self.regions = list(regions)
+        self.sample_rate = sample_rate
+        self._clip_starts = []
+        gap = np.zeros(int(self.GAP_SECONDS * sample_rate), dtype=np.float32)
+        pieces = []
+        position = 0
+        for start, end in self.regions:
+            if pieces:
+                pieces.append(gap)
+                position += len(gap)
+            piece = np.asarray(samples[int(round(start * sample_rate)):int(round(end * sample_rate))],
+                               dtype=np.float32)
+            self._clip_starts.append(position / sample_rate)
+            pieces.append(piece)
+            position += len(piece)
+        self.samples = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate
+
+    def _region_index(self, clip_time):
+        return max(0, bisect_right(self._clip_starts, clip_time) - 1)
+
+    def to_original(self, clip_time):
+        """Original-timeline time of a time in the clip (gaps map to the end of the region before)"""
+        index = self._region_index(clip_time)
+        start, end = self.regions[index]
+        return min(end, start + max(0.0, clip_time - self._clip_starts[index]))
+
+    def offset_words(self, word_segments):
+        """Word segments with timestamps moved onto the original timeline"""
+        offset_segments = []
+        for word in word_segments:
+            index = self._region_index(word['start'])
+            start = self.to_original(word['start'])
+            # A word running into the gap ends where its region ends
+            end = min(self.regions[index][1], start + max(0.0, word['end'] - word['start']))
+            offset_segments.append(dict(word, start=round(start, 3), end=round(end, 3)))
+        return offset_segments
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+YouTube Shorts Creator - Headless Batch Mode
+Renders every job in a JSON or CSV manifest on a pool of worker processes
+
+Usage:
+    python shorts_creator_batch.py jobs.json [--workers N] [--summary results.json]
+                                   [--metrics metrics.jsonl]
+
+Manifest columns / keys (paths are relative to the manifest's folder):
+    original, reaction, music, output      required
+    caption_mode                           auto (default), manual or none
+    caption_text                           text for caption_mode=manual
+    whisper_model, render_engine,
+    transcription_backend                  optional ShortsCreator settings
+
+A JSON job may instead give one original plus a "variants" list of
+{reaction, music, output, caption_mode, caption_text}; the original is then
+decoded once for all of them (see MultiShortsCreator).
+
+Every job's progress events (stage start/progress/end with wall time,
+frames, fps, ETA and peak memory) and a final job_end record are written
+as JSON lines to the metrics file while the batch runs, ready to tail or
+scrape.
+
+Ctrl+C cancels the batch: running jobs stop before their next frame, their
+partial outputs are deleted, queued jobs are skipped and the summary is
+still written.
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from shorts_creator_progress import peak_rss_mb
+from shorts_creator_jobs import RenderCancelled, MAX_OUTPUTS_PER_PASS
+from shorts_creator_transcribe import estimate_model_memory_mb, get_model_pool, DEFAULT_BACKEND
+
+
+CAPTION_MODES = ('auto', 'manual', 'none')
+
+# Set in each worker by _init_worker; jobs stop at their next checkpoint once set
+_cancel_event = None
+
+# Set in each worker by _init_worker; progress records go to the parent's metrics file
+_metrics_queue = None
+
+# Rough peak memory of one render without Whisper (decoders, pipeline
+# canvases, x264 lookahead at 1080x1920)
+RENDER_MEMORY_MB = 1000
+
+# Each render already keeps about two cores busy (pipeline threads + x264)
+CORES_PER_JOB = 2
+
+
+class ManifestError(ValueError):
+    """The manifest file could not be read"""
+
+
+def _clean_entry(row, base_dir):
+    """Strip values, drop blanks and resolve paths of a job or variant"""
+    entry = {key.strip(): value.strip() if isinstance(value, str) else value
+             for key, value in dict(row).items() if key and value not in (None, '')}
+    for key in ('original', 'reaction', 'music', 'output'):
+        if key in entry:
+            entry[key] = str(base_dir / entry[key])
+    entry.setdefault('caption_mode', 'auto')
+    return entry
+
+
+def load_manifest(manifest_path):
+    """
+    Read jobs from a .json (list, or {"jobs": [...]}) or .csv manifest
+    Returns a list of dicts with paths resolved against the manifest folder
+    """
+    manifest_path = Path(manifest_path)
+    try:
+        if manifest_path.suffix.lower() == '.csv':
+            with open(manifest_path, newline='', encoding='utf-8-sig') as manifest_file:
+                rows = list(csv.DictReader(manifest_file))
+        else:
+            with open(manifest_path, encoding='utf-8') as manifest_file:
+                rows = json.load(manifest_file)
+            if isinstance(rows, dict):
+                rows = rows.get('jobs', [])
+    except (OSError, ValueError) as e:
+        raise ManifestError(f"Cannot read manifest {manifest_path}: {e}")
+    if not isinstance(rows, list):
+        raise ManifestError(f"Manifest {manifest_path} does not contain a list of jobs")
+
+    base_dir = manifest_path.resolve().parent
+    jobs = []
+    for index, row in enumerate(rows, start=1):
+        job = _clean_entry(row, base_dir)
+        if isinstance(job.get('variants'), list):
+            job['variants'] = [_clean_entry(variant, base_dir) for variant in job['variants']]
+        job['id'] = str(job.get('id', index))
+        jobs.append(job)
+    return jobs
+
+
+def _validate_entry(entry, required):
+    """Return an error message for a malformed job or variant, or None"""
+    missing = [key for key in required if key not in entry]
+    if missing:
+        return f"Missing field(s): {', '.join(missing)}"
+    if entry['caption_mode'] not in CAPTION_MODES:
+        return f"Unknown caption_mode '{entry['caption_mode']}' (use {', '.join(CAPTION_MODES)})"
+    if entry['caption_mode'] == 'manual' and not entry.get('caption_text'):
+        return "caption_mode 'manual' needs caption_text"
+    return None
+
+
+def validate_job(job):
+    """Return an error message for a malformed job, or None"""
+    if 'variants' not in job:
+        return _validate_entry(job, ('original', 'reaction', 'music', 'output'))
+    if 'original' not in job:
+        return "Missing field(s): original"
+    if not isinstance(job['variants'], list) or not job['variants']:
+        return "variants must be a non-empty list"
+    for number, variant in enumerate(job['variants'], start=1):
+        error = _validate_entry(variant, ('reaction', 'music', 'output'))
+        if error:
+            return f"Variant {number}: {error}"
+    return None
+
+
+def _uses_whisper(job):
+    """Whether a job (or any of its variants) needs auto-captions"""
+    return any(entry.get('caption_mode') == 'auto' for entry in job.get('variants') or [job])
+
+
+def estimate_job_memory_mb(job):
+    """Peak memory of one job: its renders plus its Whisper model if it transcribes"""
+    outputs = min(len(job.get('variants') or [job]), MAX_OUTPUTS_PER_PASS)
+    memory_mb = RENDER_MEMORY_MB * outputs
+    if _uses_whisper(job):
+        memory_mb += estimate_model_memory_mb(job.get('whisper_model', 'base'))
+    return memory_mb
+
+
+def _caption_kwargs(entry):
+    """ShortsCreator caption arguments for a job or variant's caption_mode"""
+    return {
+        'caption_text': entry.get('caption_text') if entry['caption_mode'] == 'manual' else None,
+        'auto_captions': entry['caption_mode'] == 'auto',
+    }
+
+
+def available_memory_mb():
+    """Physical memory currently available, or None if it cannot be determined"""
+    if sys.platform == 'win32':
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [
+                ('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+            ]
+
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys // (1024 * 1024)
+        return None
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def choose_worker_count(jobs, cpu_count=None, memory_mb=None):
+    """
+    Pick the pool size from core count and per-job memory estimates
+    Sized for the most memory-hungry job, since any worker may draw it
+    """
+    if not jobs:
+        return 1
+    cpu_count = cpu_count or os.cpu_count() or 1
+    workers = max(1, cpu_count // CORES_PER_JOB)
+    if memory_mb is None:
+        memory_mb = available_memory_mb()
+    if memory_mb is not None:
+        per_job_mb = max(estimate_job_memory_mb(job) for job in jobs)
+        workers = min(workers, max(1, memory_mb // per_job_mb))
+    return min(workers, len(jobs))
+
+
+def _init_worker(model_budget_mb, cancel_event=None, metrics_queue=None):
+    """
+    Keep each worker's Whisper pool to one model so the memory estimate holds
+    Ctrl+C is left to the parent, which cancels jobs through cancel_event
+    """
+    global _cancel_event, _metrics_queue
+    get_model_pool().set_memory_budget(model_budget_mb)
+    _cancel_event = cancel_event
+    _metrics_queue = metrics_queue
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _report_metrics(job_id):
+    """Progress callback sending a job's events to the metrics file, or None"""
+    if _metrics_queue is None:
+        return None
+    return lambda event: _metrics_queue.put({'job': job_id, **event.as_dict()})
+
+
+def _write_metrics(metrics_queue, metrics_path):
+    """Write metrics records as JSON lines until a None arrives (parent thread)"""
+    with open(metrics_path, 'w', encoding='utf-8') as metrics_file:
+        while True:
+            record = metrics_queue.get()
+            if record is None:
+                break
+            metrics_file.write(json.dumps(record) + '\n')
+            metrics_file.flush()
+
+
+def _job_outputs(job):
+    """Output files a job writes"""
+    if 'variants' in job:
+        return [variant['output'] for variant in job['variants']]
+    return [job['output']]
+
+
+def _remove_partial_outputs(job, since):
+    """Delete outputs a cancelled job wrote to after the given wall-clock time"""
+    for output in _job_outputs(job):
+        try:
+            if os.path.getmtime(output) >= since:
+                os.remove(output)
+                print(f"🗑️ Removed partial output: {output}")
+        except OSError:
+            pass
+
+
+def run_job(job, log_dir):
+    """
+    Render one manifest job (worker side), logging to <log_dir>/job_<id>.log
+    Returns a result dict; failures are reported, not raised
+    """
+    # The render stack is imported by the workers that use it, not by
+    # everything that imports this module (e.g. the GUI's job queue)
+    from shorts_creator_core import ShortsCreator, MultiShortsCreator
+    log_path = Path(log_dir) / f"job_{job['id']}.log"
+    result = {'id': job['id'], 'output': job.get('output'), 'log': str(log_path)}
+    started = time.perf_counter()
+    started_at = time.time()
+    with open(log_path, 'w', encoding='utf-8') as log_file, \
+            contextlib.redirect_stdout(log_file), contextlib.redirect_stderr(log_file):
+        try:
+            if 'variants' in job:
+                creator = MultiShortsCreator(
+                    job['original'],
+                    [
+                        {'reaction_video_path': variant['reaction'], 'music_path': variant['music'],
+                         'output_path': variant['output'], **_caption_kwargs(variant)}
+                        for variant in job['variants']
+                    ],
+                    whisper_model=job.get('whisper_model', 'base'),
+                    transcription_backend=job.get('transcription_backend', DEFAULT_BACKEND),
+                    cancel_event=_cancel_event,
+                    progress=_report_metrics(job['id']),
+                )
+                result['variants'] = creator.create_shorts()
+                result['shorts'] = sum(1 for variant in result['variants'] if variant['status'] == 'ok')
+                result['status'] = 'ok' if result['shorts'] == len(job['variants']) else 'failed'
+                if result['status'] == 'failed':
+                    result['error'] = f"{len(job['variants']) - result['shorts']} variant(s) failed"
+            else:
+                creator = ShortsCreator(
+                    original_video_path=job['original'],
+                    reaction_video_path=job['reaction'],
+                    music_path=job['music'],
+                    whisper_model=job.get('whisper_model', 'base'),
+                    output_path=job['output'],
+                    render_engine=job.get('render_engine', 'numpy'),
+                    transcription_backend=job.get('transcription_backend', DEFAULT_BACKEND),
+                    cancel_event=_cancel_event,
+                    progress=_report_metrics(job['id']),
+                    **_caption_kwargs(job)
+                )
+                creator.create_short()
+                result['status'] = 'ok'
+                result['shorts'] = 1
+        except Exception as e:
+            result.setdefault('shorts', 0)
+            if isinstance(e, RenderCancelled) or (_cancel_event is not None and _cancel_event.is_set()):
+                # Errors after a cancel are usually ffmpeg dying from the same Ctrl+C
+                print("⏹️ Job cancelled")
+                result['status'] = 'cancelled'
+                result['error'] = 'Cancelled'
+                _remove_partial_outputs(job, started_at)
+            else:
+                print(f"❌ {type(e).__name__}: {e}")
+                result['status'] = 'failed'
+                result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - started, 2)
+    if _metrics_queue is not None:
+        _metrics_queue.put({
+            'job': job['id'], 'kind': 'job_end', 'status': result['status'],
+            'seconds': result['seconds'], 'peak_rss_mb': peak_rss_mb(), 'time': round(time.time(), 3),
+        })
+    return result
+
+
+def _collect_result(future, job):
+    """Result dict of a finished job future, printing a one-line status"""
+    try:
+        result = future.result()
+    except Exception as e:
+        # The worker itself died (crash, out of memory)
+        result = {'id': job['id'], 'output': job.get('output'), 'status': 'failed',
+                  'error': f"Worker crashed: {type(e).__name__}: {e}", 'seconds': None}
+    if result['status'] == 'ok':
+        print(f"   ✓ Job {result['id']} done in {result['seconds']:.1f}s → "
+              f"{result['output'] or str(result['shorts']) + ' shorts'}")
+    elif result['status'] == 'cancelled':
+        print(f"   ⏹️ Job {result['id']} cancelled")
+    else:
+        print(f"   ❌ Job {result['id']} failed: {result['error']}")
+    return result
+
+
+def run_batch(jobs, workers=None, log_dir='batch_logs', metrics_path=None):
+    """
+    Run jobs on a process pool, continuing past failures
+    With metrics_path, every job's progress events are written there as JSON lines
+    Returns the summary dict (per-job results plus aggregate throughput)
+    """
+    log_dir = Path(log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or choose_worker_count(jobs)
+
+    results = []
+    runnable = []
+    for job in jobs:
+        error = validate_job(job)
+        if error:
+            print(f"   ❌ Job {job['id']}: {error}")
+            results.append({'id': job['id'], 'output': job.get('output'), 'status': 'failed',
+                            'error': error, 'seconds': 0.0})
+        else:
+            runnable.append(job)
+
+    model_budget_mb = max(
+        [estimate_model_memory_mb(job.get('whisper_model', 'base'))
+         for job in runnable if _uses_whisper(job)] or [0]
+    )
+
+    print(f"🚀 Rendering {len(runnable)} job(s) on {workers} worker process(es)...")
+    started = time.perf_counter()
+    if runnable:
+        # 'spawn' gives every worker a clean interpreter on all platforms
+        context = multiprocessing.get_context('spawn')
+        cancel_event = context.Event()
+        metrics_queue = metrics_writer = None
+        if metrics_path is not None:
+            metrics_queue = context.Queue()
+            metrics_writer = threading.Thread(
+                target=_write_metrics, args=(metrics_queue, metrics_path), daemon=True
+            )
+            metrics_writer.start()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(model_budget_mb, cancel_event, metrics_queue)) as executor:
+            pending = {executor.submit(run_job, job, log_dir): job for job in runnable}
+            try:
+                for future in as_completed(list(pending)):
+                    results.append(_collect_result(future, pending.pop(future)))
+            except KeyboardInterrupt:
+                print("⏹️ Interrupted: cancelling running jobs and skipping queued ones...")
+                cancel_event.set()
+                for future, job in pending.items():
+                    if future.cancel():
+                        results.append({'id': job['id'], 'output': job.get('output'), 'status': 'cancelled',
+                                        'error': 'Cancelled before it started', 'seconds': 0.0})
+                    else:
+                        results.append(_collect_result(future, job))
+        if metrics_writer is not None:
+            metrics_queue.put(None)
+            metrics_writer.join()
+    elapsed = time.perf_counter() - started
+
+    succeeded = sum(1 for result in results if result['status'] == 'ok')
+    cancelled = sum(1 for result in results if result['status'] == 'cancelled')
+    shorts = sum(result.get('shorts', 0) for result in results)
+    order = {job['id']: i for i, job in enumerate(jobs)}
+    results.sort(key=lambda result: order.get(result['id'], len(order)))
+    return {
+        'finished': datetime.now().isoformat(timespec='seconds'),
+        'workers': workers,
+        'jobs': len(jobs),
+        'succeeded': succeeded,
+        'failed': len(jobs) - succeeded - cancelled,
+        'cancelled': cancelled,
+        'shorts': shorts,
+        'elapsed_seconds': round(elapsed, 2),
+        'shorts_per_hour': round(shorts * 3600 / elapsed, 1) if elapsed > 0 else None,
+        'results': results,
+    }
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Render YouTube Shorts from a job manifest")
+    parser.add_argument('manifest', help="JSON or CSV file listing the jobs")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: from cores and memory)")
+    parser.add_argument('--summary', help="Results summary file (default: <manifest>_results.json)")
+    parser.add_argument('--logs', help="Folder for per-job logs (default: <manifest>_logs)")
+    parser.add_argument('--metrics', help="JSON-lines progress metrics file (default: <manifest>_metrics.jsonl)")
+    args = parser.parse_args()
+
+    manifest_path = Path(args.manifest)
+    try:
+        jobs = load_manifest(manifest_path)
+    except ManifestError as e:
+        print(f"❌ {e}")
+        return 2
+
+    summary_path = Path(args.summary or manifest_path.with_name(f"{manifest_path.stem}_results.json"))
+    log_dir = Path(args.logs or manifest_path.with_name(f"{manifest_path.stem}_logs"))
+    metrics_path = Path(args.metrics or manifest_path.with_name(f"{manifest_path.stem}_metrics.jsonl"))
+
+    summary = run_batch(jobs, workers=args.workers, log_dir=log_dir, metrics_path=metrics_path)
+    with open(summary_path, 'w', encoding='utf-8') as summary_file:
+        json.dump(summary, summary_file, indent=2)
+
+    print(f"✅ {summary['succeeded']}/{summary['jobs']} jobs done, {summary['shorts']} shorts rendered in "
+          f"{summary['elapsed_seconds']:.1f}s ({summary['shorts_per_hour']} shorts/hour)")
+    print(f"📄 Summary: {summary_path}")
+    print(f"📈 Metrics: {metrics_path}")
+    if summary['cancelled']:
+        return 130
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
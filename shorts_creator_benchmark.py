@@ -0,0 +1,782 @@
+#!/usr/bin/env python3
+"""
+YouTube Shorts Creator - Benchmarks
+Times pipeline stages on synthetic inputs generated locally (NumPy test
+pattern video at several resolutions, tone/noise music and a speech-like
+voice track), so results only depend on this machine and library versions
+
+Usage:
+    python shorts_creator_benchmark.py all [--json results.json] [--baseline baseline.json]
+    python shorts_creator_benchmark.py resize|captions|composite|audio|encode|e2e|startup|vad [--repeat 20]
+    python shorts_creator_benchmark.py transcribe --whisper-model base [--clip speech.mp4 --reference-text speech.txt]
+    python shorts_creator_benchmark.py compare results.json --baseline baseline.json
+
+Results are written as JSON (with Python, platform and library versions).
+Given --baseline, every timing that got more than --threshold slower is
+flagged as a regression and the exit code is 1.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+import numpy as np
+from PIL import Image
+from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+
+from shorts_creator_audio import decode_audio, find_speech_regions, SpeechClip, WHISPER_SAMPLE_RATE
+from shorts_creator_captions import CaptionRenderer, CaptionTimeline
+from shorts_creator_core import ShortsCreator
+from shorts_creator_progress import STAGE_END
+from shorts_creator_render import ResizeMap, count_frames
+from shorts_creator_transcribe import WhisperModelPool, TRANSCRIPTION_BACKENDS, DEFAULT_BACKEND
+
+
+BENCHMARKS = ('resize', 'captions', 'composite', 'audio', 'encode', 'e2e', 'startup', 'vad', 'transcribe')
+
+# Voice activity detection cases: (name, share of phrases kept, music bleed level)
+VAD_CASES = (('talkative', 1.0, 0.0), ('sparse', 0.3, 0.0), ('sparse_music', 0.3, 0.1))
+VAD_SECONDS = 60.0
+
+# Length of the synthetic voice track transcribed when no --clip is given
+TRANSCRIBE_SECONDS = 30.0
+
+# Modules timed by the startup benchmark: the GUI window, a render job, auto-captions
+STARTUP_MODULES = ('shorts_creator_gui', 'shorts_creator_core', 'whisper')
+STARTUP_RUNS = 5
+
+# Heavy modules reported when an import drags them in
+HEAVY_MODULES = ('moviepy', 'imageio', 'PIL', 'numpy', 'IPython', 'whisper', 'torch')
+
+# Common source resolutions (landscape HD, landscape 4K, portrait phone video)
+RESIZE_INPUTS = [(1920, 1080), (3840, 2160), (1080, 1920)]
+
+# Synthetic input videos for the render benchmarks
+VIDEO_INPUTS = {'720p': (1280, 720), '1080p': (1920, 1080), 'portrait': (1080, 1920)}
+FIXTURE_FPS = 30
+FIXTURE_SECONDS = 3.0
+AUDIO_SAMPLE_RATE = 44100
+
+# Caption counts for the caption-building benchmark (short clip vs long video)
+CAPTION_COUNTS = (10, 100)
+
+# Slowdown (fraction of the baseline) reported as a regression
+REGRESSION_THRESHOLD = 0.15
+
+# Timings below this are too noisy to compare (single-run e2e stages need more)
+MIN_COMPARED_MS = 0.05
+E2E_MIN_COMPARED_MS = 50.0
+
+# Libraries whose upgrades the benchmarks are meant to catch
+TRACKED_PACKAGES = ('moviepy', 'numpy', 'Pillow', 'imageio-ffmpeg', 'openai-whisper')
+
+
+def layout_panels():
+    """Top and bottom panel sizes of the split-screen layout"""
+    top_height = int(ShortsCreator.HEIGHT * ShortsCreator.TOP_VIDEO_HEIGHT_RATIO) - ShortsCreator.DIVIDER_HEIGHT // 2
+    bottom_height = int(ShortsCreator.HEIGHT * ShortsCreator.BOTTOM_VIDEO_HEIGHT_RATIO) - ShortsCreator.DIVIDER_HEIGHT // 2
+    return {
+        'top': (ShortsCreator.WIDTH, top_height),
+        'bottom': (ShortsCreator.WIDTH, bottom_height),
+    }
+
+
+def synthetic_frame(width, height, seed=0):
+    """Deterministic RGB test frame: gradients plus noise, so resamplers can't shortcut"""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 255, width, dtype=np.float32)[None, :]
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:, :, 0] = x + 0 * y
+    frame[:, :, 1] = y + 0 * x
+    frame[:, :, 2] = rng.integers(0, 256, (height, width), dtype=np.uint8)
+    return frame
+
+
+def tone_audio(duration, sample_rate=AUDIO_SAMPLE_RATE, seed=0):
+    """Stereo float32 music stand-in: a chord of sine tones plus a little noise"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sample_rate), dtype=np.float32) / sample_rate
+    signal = sum(np.sin(2 * np.pi * frequency * t) for frequency in (220.0, 277.2, 329.6)) / 3
+    signal = 0.4 * signal + 0.02 * rng.standard_normal(len(t)).astype(np.float32)
+    return np.column_stack([signal, signal]).astype(np.float32)
+
+
+def speech_like_audio(duration, sample_rate=AUDIO_SAMPLE_RATE, seed=0):
+    """
+    Stereo float32 voice stand-in without TTS: harmonic "syllables" with a
+    gliding pitch, grouped into phrases separated by pauses
+    Returns (samples, speech_regions) where speech_regions lists the
+    (start, end) seconds of every phrase
+    """
+    rng = np.random.default_rng(seed)
+    count = int(duration * sample_rate)
+    t = np.arange(count, dtype=np.float32) / sample_rate
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(harmonic * phase) / harmonic for harmonic in range(1, 9))
+
+    envelope = np.zeros(count, dtype=np.float32)
+    speech_regions = []
+    position = 0.3
+    while position < duration - 0.3:
+        phrase_start = position
+        for _ in range(rng.integers(3, 8)):
+            length = rng.uniform(0.12, 0.25)
+            start, end = int(position * sample_rate), min(count, int((position + length) * sample_rate))
+            envelope[start:end] = np.hanning(end - start)
+            position += length + 0.05
+            if position >= duration - 0.3:
+                break
+        speech_regions.append((round(phrase_start, 3), round(min(position, duration), 3)))
+        position += rng.uniform(0.4, 0.9)
+
+    signal = 0.3 * voiced * envelope + 0.005 * rng.standard_normal(count)
+    return np.column_stack([signal, signal]).astype(np.float32), speech_regions
+
+
+def write_wav(path, samples, sample_rate=AUDIO_SAMPLE_RATE):
+    """Write float32 samples (frames x channels) as 16-bit PCM WAV"""
+    pcm = (np.clip(samples, -1, 1) * 32767).astype('<i2')
+    with wave.open(str(path), 'wb') as wav_file:
+        wav_file.setnchannels(pcm.shape[1])
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm.tobytes())
+
+
+def synthetic_video(path, size, duration, fps=FIXTURE_FPS, audio_path=None, seed=0):
+    """Encode a moving test pattern (synthetic_frame scrolling sideways) with optional audio"""
+    width, height = size
+    frame = synthetic_frame(width, height, seed)
+    writer = FFMPEG_VideoWriter(
+        str(path), (width, height), fps, codec='libx264', preset='ultrafast',
+        audiofile=str(audio_path) if audio_path else None
+    )
+    try:
+        for frame_index in range(count_frames(duration, fps)):
+            writer.write_frame(np.roll(frame, frame_index * 8, axis=1))
+    finally:
+        writer.close()
+
+
+def make_fixtures(work_dir, resolution, duration=FIXTURE_SECONDS):
+    """
+    Generate one job's inputs at a VIDEO_INPUTS resolution in work_dir
+    Returns a dict of ShortsCreator paths plus the voice track's speech regions
+    """
+    work_dir = Path(work_dir)
+    size = VIDEO_INPUTS[resolution]
+    music_path = work_dir / 'music.wav'
+    if not music_path.exists():
+        write_wav(music_path, tone_audio(duration + 1.0))
+    voice, speech_regions = speech_like_audio(duration)
+    voice_path = work_dir / 'voice.wav'
+    write_wav(voice_path, voice)
+
+    original_path = work_dir / f"original_{resolution}.mp4"
+    reaction_path = work_dir / f"reaction_{resolution}.mp4"
+    synthetic_video(original_path, size, duration, seed=1)
+    synthetic_video(reaction_path, size, duration, audio_path=voice_path, seed=2)
+    return {
+        'original_video_path': str(original_path),
+        'reaction_video_path': str(reaction_path),
+        'music_path': str(music_path),
+        'speech_regions': speech_regions,
+    }
+
+
+def fixture_creator(fixtures, output_path, **kwargs):
+    """ShortsCreator over generated fixtures"""
+    return ShortsCreator(
+        fixtures['original_video_path'], fixtures['reaction_video_path'], fixtures['music_path'],
+        output_path=str(output_path), **kwargs
+    )
+
+
+def quiet():
+    """Keep ShortsCreator's log out of the benchmark tables"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def time_runs(func, runs=1):
+    """Median wall time of func() in seconds, for calls too slow to repeat many times"""
+    samples = []
+    for _ in range(max(1, runs)):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def time_call(func, *args, repeat=20, warmup=2):
+    """Median wall time of func(*args) in milliseconds"""
+    for _ in range(warmup):
+        func(*args)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def resize_then_crop(frame, target_size):
+    """Reference: resize the whole frame (like moviepy's resize fx), then crop the center"""
+    target_width, target_height = target_size
+    height, width = frame.shape[:2]
+    if width / height > target_width / target_height:
+        new_size = (int(target_height * width / height), target_height)
+    else:
+        new_size = (target_width, int(target_width * height / width))
+    resized = np.asarray(Image.fromarray(frame).resize(new_size, Image.LANCZOS))
+    x = (new_size[0] - target_width) // 2
+    y = (new_size[1] - target_height) // 2
+    return resized[y:y + target_height, x:x + target_width]
+
+
+def bench_resize(repeat=20):
+    """Per-frame cost of crop-then-resize vs resize-then-crop for each input and panel"""
+    results = []
+    for source_size in RESIZE_INPUTS:
+        frame = synthetic_frame(*source_size)
+        for panel, target_size in layout_panels().items():
+            resize_map = ResizeMap(source_size, target_size)
+            crop_first_ms = time_call(resize_map, frame, repeat=repeat)
+            reference_ms = time_call(resize_then_crop, frame, target_size, repeat=repeat)
+            results.append({
+                'input': f"{source_size[0]}x{source_size[1]}",
+                'panel': panel,
+                'output': f"{target_size[0]}x{target_size[1]}",
+                'crop_then_resize_ms': round(crop_first_ms, 3),
+                'resize_then_crop_ms': round(reference_ms, 3),
+                # A pure slice takes no measurable time, so no meaningful ratio
+                'speedup': round(reference_ms / crop_first_ms, 1) if crop_first_ms >= 0.01 else None,
+            })
+    return results
+
+
+def synthetic_words(count):
+    """Word segments like Whisper's, 0.3 s per word"""
+    vocabulary = ['THIS', 'IS', 'A', 'REACTION', 'VIDEO', 'WOW', 'LOOK', 'AT', 'THAT', 'AMAZING']
+    return [
+        {'word': f"{vocabulary[i % len(vocabulary)]}{i // len(vocabulary)}", 'start': 0.3 * i, 'end': 0.3 * i + 0.25}
+        for i in range(count)
+    ]
+
+
+def bench_captions(creator, repeat=20):
+    """Caption building (word chunking, banner rendering, timeline index) with cold caches"""
+    results = []
+    style = creator._get_caption_renderer()
+    for captions in CAPTION_COUNTS:
+        words = synthetic_words(captions * 4)
+
+        def build():
+            # A fresh renderer, so no banner or layout is cached between runs
+            renderer = CaptionRenderer(
+                (style.banner_width, style.banner_height), style.bg_color,
+                style.text_color, style.font_name, style.font_size
+            )
+            with quiet():
+                chunks = creator._chunk_words(words, words_per_caption=4)
+            return CaptionTimeline(chunks, renderer.render_many([chunk['text'] for chunk in chunks]))
+
+        build_ms = time_call(build, repeat=max(1, repeat // 4), warmup=1)
+        timeline = build()
+        lookup_ms = time_call(lambda: [timeline.active_index(0.01 * i) for i in range(1000)], repeat=repeat)
+        results.append({
+            'captions': str(captions),
+            'build_ms': round(build_ms, 3),
+            'lookup_1000_ms': round(lookup_ms, 3),
+        })
+    return results
+
+
+def bench_composite(creator, repeat=20):
+    """Per-frame cost of the NumPy split-screen compositor (with a caption active)"""
+    layout = creator._get_layout()
+    timeline = creator._create_static_caption("BENCHMARK CAPTION", 10.0)
+    compositor = creator._create_compositor(timeline)
+    canvas = compositor.new_canvas()
+    top_frame = synthetic_frame(creator.WIDTH, layout['top_height'], seed=3)
+    bottom_frame = synthetic_frame(creator.WIDTH, layout['bottom_height'], seed=4)
+    compose_ms = time_call(compositor.compose, top_frame, bottom_frame, 1.0, canvas, repeat=repeat)
+    return [{
+        'output': f"{creator.WIDTH}x{creator.HEIGHT}",
+        'compose_ms': round(compose_ms, 3),
+    }]
+
+
+def sparse_speech_audio(duration, keep, music_level, seed=0):
+    """
+    16 kHz mono voice track that keeps only a share of speech_like_audio's
+    phrases (the rest is faint noise), optionally over music bleed
+    Returns (samples, speech_regions)
+    """
+    rng = np.random.default_rng(seed)
+    voice, phrases = speech_like_audio(duration, seed=seed)
+    kept = [phrase for phrase in phrases if rng.random() < keep]
+    mask = np.zeros(len(voice), dtype=bool)
+    for start, end in kept:
+        mask[int(start * AUDIO_SAMPLE_RATE):int(end * AUDIO_SAMPLE_RATE)] = True
+    voice[~mask] = 0.003 * rng.standard_normal((int((~mask).sum()), voice.shape[1]))
+    if music_level:
+        voice += music_level * tone_audio(duration, seed=seed)
+    # AUDIO_SAMPLE_RATE (44.1 kHz) is not a multiple of 16 kHz: resample by index
+    mono = voice.mean(axis=1)
+    positions = np.arange(0, len(mono), AUDIO_SAMPLE_RATE / WHISPER_SAMPLE_RATE)
+    return np.interp(positions, np.arange(len(mono)), mono).astype(np.float32), kept
+
+
+def _coverage(regions, duration, resolution=100):
+    """Boolean timeline (1/resolution s steps) of the given regions"""
+    covered = np.zeros(int(duration * resolution), dtype=bool)
+    for start, end in regions:
+        covered[int(start * resolution):int(end * resolution)] = True
+    return covered
+
+
+def bench_vad(repeat=20, whisper_model=None):
+    """
+    Speech detection cost and recall on voice tracks with known speech, and
+    with a Whisper model, transcription time and words of the whole track
+    vs its speech regions only
+    """
+    results = []
+    for case, keep, music_level in VAD_CASES:
+        samples, truth = sparse_speech_audio(VAD_SECONDS, keep, music_level)
+        regions = find_speech_regions(samples)
+        detect_ms = time_call(find_speech_regions, samples, repeat=repeat)
+        expected, detected = _coverage(truth, VAD_SECONDS), _coverage(regions, VAD_SECONDS)
+        row = {
+            'case': case,
+            'detect_ms': round(detect_ms, 2),
+            'speech_s': round(expected.sum() / 100, 1),
+            'detected_s': round(detected.sum() / 100, 1),
+            'recall': round((expected & detected).sum() / max(1, expected.sum()), 3),
+        }
+        if whisper_model:
+            from shorts_creator_transcribe import get_model_pool, word_segments_from_result
+            with quiet():
+                pooled_model = get_model_pool().acquire(whisper_model)
+            speech = SpeechClip(samples, regions)
+
+            def transcribe(audio):
+                with quiet(), pooled_model.lock:
+                    return word_segments_from_result(
+                        pooled_model.model.transcribe(audio, word_timestamps=True, language='en')
+                    )
+
+            full_words, speech_words = [], []
+            full_seconds = time_runs(lambda: full_words.extend(transcribe(samples)))
+            speech_seconds = time_runs(lambda: speech_words.extend(transcribe(speech.samples)))
+            row.update({
+                'full_transcribe_ms': round(full_seconds * 1000, 1),
+                'speech_transcribe_ms': round(speech_seconds * 1000, 1),
+                'full_words': len(full_words),
+                'speech_words': len(speech_words),
+            })
+        results.append(row)
+    return results
+
+
+def transcript_words(text):
+    """Lowercase words of a transcript, without punctuation"""
+    return re.findall(r"[\w']+", text.lower())
+
+
+def word_error_rate(reference, hypothesis):
+    """Word-level edit distance of hypothesis from reference, per reference word"""
+    previous = list(range(len(hypothesis) + 1))
+    for index, ref_word in enumerate(reference, 1):
+        current = [index]
+        for hyp_index, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(
+                previous[hyp_index] + 1, current[hyp_index - 1] + 1,
+                previous[hyp_index - 1] + (ref_word != hyp_word)
+            ))
+        previous = current
+    return previous[-1] / max(1, len(reference))
+
+
+def bench_transcribe(whisper_model, clip=None, reference_text=None, runs=1):
+    """
+    Model load time, transcription time and accuracy of every
+    transcription backend on a speech clip (default: a synthetic voice
+    track). With reference_text, word_accuracy is 1 - word error rate
+    against it; without, only agreement_with_reference_backend (the same
+    measure against the reference backend's transcript) is reported, which
+    says how closely a backend follows the reference, not how accurate it is.
+    """
+    if clip:
+        decoded = decode_audio(clip)
+        try:
+            samples = decoded.to_whisper()
+        finally:
+            decoded.close()
+    else:
+        samples = sparse_speech_audio(TRANSCRIBE_SECONDS, 1.0, 0.0)[0]
+    audio_seconds = len(samples) / WHISPER_SAMPLE_RATE
+    reference = transcript_words(reference_text) if reference_text else None
+    accuracy_column = 'word_accuracy' if reference is not None else 'agreement_with_reference_backend'
+
+    results = []
+    for name in TRANSCRIPTION_BACKENDS:
+        # A pool of its own, so every backend pays its full load time
+        pool = WhisperModelPool()
+        try:
+            with quiet():
+                start = time.perf_counter()
+                pooled_model = pool.acquire(whisper_model, backend=name)
+                load_seconds = time.perf_counter() - start
+        except Exception as e:
+            print(f"   ⚠️ {name}: {e}")
+            continue
+        words = []
+
+        def transcribe():
+            with quiet():
+                words[:] = pooled_model.transcribe(samples, language='en')
+
+        transcribe_seconds = time_runs(transcribe, runs)
+        hypothesis = transcript_words(' '.join(word['word'] for word in words))
+        if reference is None and name == DEFAULT_BACKEND:
+            reference = hypothesis
+        results.append({
+            'backend': name,
+            'model': whisper_model,
+            'load_ms': round(load_seconds * 1000, 1),
+            'transcribe_ms': round(transcribe_seconds * 1000, 1),
+            'realtime_x': round(audio_seconds / transcribe_seconds, 2),
+            'memory_mb': pooled_model.memory_mb,
+            'words': len(hypothesis),
+            accuracy_column: round(max(0.0, 1 - word_error_rate(reference, hypothesis)), 3) if reference else None,
+        })
+        pool.clear()
+    return results
+
+
+def bench_audio(creator, work_dir, runs=1):
+    """Reaction audio decode, and mixing with the music plus AAC encoding"""
+    audio_path = Path(work_dir) / 'bench_audio.m4a'
+    decode_seconds = time_runs(lambda: decode_audio(creator.reaction_video_path).close(), runs)
+
+    reaction_audio = decode_audio(creator.reaction_video_path)
+    try:
+        def mix_and_encode():
+            with quiet():
+                final_audio, music_clip = creator._mix_audio(reaction_audio.duration, reaction_audio)
+            try:
+                creator._write_audio_track(final_audio, str(audio_path))
+            finally:
+                music_clip.close()
+
+        mix_seconds = time_runs(mix_and_encode, runs)
+    finally:
+        reaction_audio.close()
+    return [{
+        'audio_seconds': f"{FIXTURE_SECONDS:g}",
+        'decode_ms': round(decode_seconds * 1000, 1),
+        'mix_encode_ms': round(mix_seconds * 1000, 1),
+    }]
+
+
+def bench_encode(creator, work_dir, runs=1):
+    """x264 encoding of full-size frames at the output settings"""
+    frame = synthetic_frame(creator.WIDTH, creator.HEIGHT, seed=5)
+    frames = count_frames(FIXTURE_SECONDS, creator.OUTPUT_FPS)
+    output_path = Path(work_dir) / 'bench_encode.mp4'
+
+    def encode():
+        writer = creator._open_writer(output_path)
+        try:
+            for frame_index in range(frames):
+                writer.write_frame(np.roll(frame, frame_index * 8, axis=1))
+        finally:
+            writer.close()
+
+    seconds = time_runs(encode, runs)
+    return [{
+        'output': f"{creator.WIDTH}x{creator.HEIGHT}",
+        'preset': creator.ENCODER_PRESET,
+        'frame_ms': round(seconds * 1000 / frames, 2),
+        'fps': round(frames / seconds, 1),
+    }]
+
+
+def bench_e2e(fixtures_by_resolution, work_dir, runs=1, engines=('numpy', 'ffmpeg'), whisper_model=None):
+    """
+    Full create_short() per input resolution and engine, with stage times
+    taken from the job's progress events
+    """
+    results = []
+    for resolution, fixtures in fixtures_by_resolution.items():
+        for engine in engines:
+            stage_seconds = {}
+
+            def record(event):
+                if event.kind == STAGE_END:
+                    stage_seconds[event.stage] = stage_seconds.get(event.stage, 0.0) + event.elapsed
+
+            if whisper_model:
+                captions = {'auto_captions': True, 'whisper_model': whisper_model, 'force_transcribe': True}
+            else:
+                captions = {'caption_text': "BENCHMARK CAPTION"}
+            creator = fixture_creator(
+                fixtures, Path(work_dir) / f"e2e_{resolution}_{engine}.mp4",
+                render_engine=engine, progress=record, **captions
+            )
+
+            def render():
+                stage_seconds.clear()
+                with quiet():
+                    creator.create_short()
+
+            seconds = time_runs(render, runs)
+            row = {'input': resolution, 'engine': engine, 'captions': 'auto' if whisper_model else 'manual',
+                   'total_ms': round(seconds * 1000, 1)}
+            row.update({f"{stage}_ms": round(value * 1000, 1) for stage, value in stage_seconds.items()})
+            results.append(row)
+    return results
+
+
+def time_import(module, pycache_dir=None):
+    """
+    Import module in a fresh interpreter; returns (ms, heavy modules it loaded),
+    or None if it cannot be imported. pycache_dir redirects the bytecode cache.
+    """
+    script = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+        f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))\n"
+    )
+    command = [sys.executable]
+    if pycache_dir is not None:
+        command += ['-X', f'pycache_prefix={pycache_dir}']
+    result = subprocess.run(
+        command + ['-c', script], cwd=Path(__file__).parent,
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+    lines = result.stdout.splitlines()
+    return float(lines[-2]), [name for name in lines[-1].split(',') if name]
+
+
+def bench_startup(runs=STARTUP_RUNS):
+    """
+    Import time of the GUI, a render job and Whisper in fresh interpreters:
+    cold with an empty bytecode cache (first launch after an install or
+    update), warm with the cache in place
+    """
+    results = []
+    for module in STARTUP_MODULES:
+        if time_import(module) is None:
+            continue
+        cold, warm = [], []
+        for _ in range(max(1, runs)):
+            with tempfile.TemporaryDirectory(prefix='shorts_pycache_') as pycache_dir:
+                cold.append(time_import(module, pycache_dir)[0])
+            warm_ms, heavy = time_import(module)
+            warm.append(warm_ms)
+        results.append({
+            'module': module,
+            'cold_ms': round(statistics.median(cold), 1),
+            'warm_ms': round(statistics.median(warm), 1),
+            'heavy_imports': heavy,
+        })
+    return results
+
+
+def library_versions():
+    """Installed versions of the libraries that affect render speed"""
+    versions = {}
+    for package in TRACKED_PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+def run_benchmarks(names, repeat=20, runs=1, resolutions=None, whisper_model=None,
+                   clip=None, reference_text=None):
+    """
+    Run the named benchmarks on freshly generated fixtures (transcribe uses
+    clip and reference_text when given, and runs only with a whisper_model)
+    Returns the results document (environment, settings and rows per benchmark)
+    """
+    resolutions = list(resolutions or VIDEO_INPUTS)
+    document = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'versions': library_versions(),
+        'settings': {'repeat': repeat, 'runs': runs, 'resolutions': resolutions,
+                     'fixture_seconds': FIXTURE_SECONDS, 'whisper_model': whisper_model,
+                     'clip': str(clip) if clip else None},
+        'benchmarks': {},
+    }
+    with tempfile.TemporaryDirectory(prefix='shorts_benchmark_') as work_dir:
+        fixtures = {}
+        if set(names) - {'resize', 'startup', 'vad', 'transcribe'}:
+            print(f"🧪 Generating {FIXTURE_SECONDS:g}s synthetic inputs ({', '.join(resolutions)})...")
+            for resolution in resolutions:
+                fixtures[resolution] = make_fixtures(work_dir, resolution)
+            creator = fixture_creator(fixtures[resolutions[0]], Path(work_dir) / 'bench.mp4')
+
+        for name in names:
+            print(f"⏱️ {name}...")
+            if name == 'resize':
+                rows = bench_resize(repeat=repeat)
+            elif name == 'captions':
+                rows = bench_captions(creator, repeat=repeat)
+            elif name == 'composite':
+                rows = bench_composite(creator, repeat=repeat)
+            elif name == 'audio':
+                rows = bench_audio(creator, work_dir, runs=runs)
+            elif name == 'encode':
+                rows = bench_encode(creator, work_dir, runs=runs)
+            elif name == 'startup':
+                rows = bench_startup(runs=max(runs, STARTUP_RUNS))
+            elif name == 'vad':
+                rows = bench_vad(repeat=repeat, whisper_model=whisper_model)
+            elif name == 'transcribe':
+                if not whisper_model:
+                    print("   ⏭️ Skipped: needs --whisper-model")
+                    continue
+                rows = bench_transcribe(whisper_model, clip, reference_text, runs=runs)
+            else:
+                rows = bench_e2e(fixtures, work_dir, runs=runs, whisper_model=whisper_model)
+            document['benchmarks'][name] = rows
+            print_table(rows)
+    return document
+
+
+def _row_key(row):
+    """Identity of a result row: its text fields (input, panel, engine, ...)"""
+    return tuple(sorted((key, value) for key, value in row.items() if isinstance(value, str)))
+
+
+def compare_results(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare every *_ms timing in current against the matching baseline row
+    Returns one dict per compared timing, with 'regression' set when it got
+    more than threshold slower
+    """
+    comparisons = []
+    for name, rows in current.get('benchmarks', {}).items():
+        baseline_rows = {_row_key(row): row for row in baseline.get('benchmarks', {}).get(name, [])}
+        for row in rows:
+            baseline_row = baseline_rows.get(_row_key(row))
+            if baseline_row is None:
+                continue
+            for metric, value in row.items():
+                old = baseline_row.get(metric)
+                floor = E2E_MIN_COMPARED_MS if name == 'e2e' else MIN_COMPARED_MS
+                if not metric.endswith('_ms') or value is None or old is None or old < floor:
+                    continue
+                change = (value - old) / old
+                comparisons.append({
+                    'benchmark': name,
+                    'case': ' '.join(value for _, value in _row_key(row)),
+                    'metric': metric,
+                    'baseline': old,
+                    'current': value,
+                    'change': f"{change:+.0%}",
+                    'regression': change > threshold,
+                })
+    return comparisons
+
+
+def report_comparison(comparisons, threshold=REGRESSION_THRESHOLD):
+    """Print the comparison table; returns the number of regressions"""
+    print_table([dict(row, regression='⚠️ SLOWER' if row['regression'] else '') for row in comparisons])
+    regressions = sum(1 for row in comparisons if row['regression'])
+    if regressions:
+        print(f"❌ {regressions} timing(s) more than {threshold:.0%} slower than the baseline")
+    else:
+        print(f"✅ No timing more than {threshold:.0%} slower than the baseline")
+    return regressions
+
+
+def print_table(results):
+    """Print benchmark rows as an aligned table"""
+    if not results:
+        return
+    # Rows may differ in columns (e.g. stages an engine does not have)
+    columns = list(dict.fromkeys(c for row in results for c in row))
+    widths = {c: max(len(c), *(len(str(row.get(c, ''))) for row in results)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in results:
+        print("  ".join(str(row.get(c, '')).ljust(widths[c]) for c in columns))
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="YouTube Shorts Creator benchmarks")
+    parser.add_argument('benchmark', choices=BENCHMARKS + ('all', 'compare'),
+                        help="Benchmark to run, 'all', or 'compare' to check a saved results file")
+    parser.add_argument('results', nargs='?', help="Results file to check (compare only)")
+    parser.add_argument('--repeat', type=int, default=20, help="Timed iterations per per-frame case")
+    parser.add_argument('--runs', type=int, default=1,
+                        help="Timed runs of slow cases (audio, encode, e2e; startup runs at least 5)")
+    parser.add_argument('--resolutions', nargs='+', choices=list(VIDEO_INPUTS),
+                        help="Synthetic input resolutions (default: all)")
+    parser.add_argument('--whisper-model',
+                        help="Run e2e with auto-captions, and time vad transcription and "
+                             "the transcription backends using this Whisper model")
+    parser.add_argument('--clip', help="Speech recording for the transcribe benchmark (default: synthetic voice)")
+    parser.add_argument('--reference-text',
+                        help="Text file with the clip's exact words, needed for word accuracy "
+                             "(without it: agreement with the reference backend only)")
+    parser.add_argument('--json', default='benchmark_results.json', help="Results file to write")
+    parser.add_argument('--baseline', help="Saved results to compare against")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Slowdown reported as a regression (default: 0.15 = 15%%)")
+    args = parser.parse_args()
+
+    if args.benchmark == 'compare':
+        if not args.results or not args.baseline:
+            parser.error("compare needs a results file and --baseline")
+        with open(args.results, encoding='utf-8') as results_file:
+            document = json.load(results_file)
+    else:
+        names = BENCHMARKS if args.benchmark == 'all' else (args.benchmark,)
+        reference_text = None
+        if args.reference_text:
+            reference_text = Path(args.reference_text).read_text(encoding='utf-8')
+        document = run_benchmarks(
+            names, repeat=args.repeat, runs=args.runs,
+            resolutions=args.resolutions, whisper_model=args.whisper_model,
+            clip=args.clip, reference_text=reference_text
+        )
+        with open(args.json, 'w', encoding='utf-8') as results_file:
+            json.dump(document, results_file, indent=2)
+        print(f"📄 Results: {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f"📊 Compared with {args.baseline} ({baseline.get('created')}, versions {baseline.get('versions')}):")
+        if report_comparison(compare_results(baseline, document, args.threshold), args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+YouTube Shorts Creator - Caption Rendering
+Draws yellow caption banners with black text straight into RGBA NumPy arrays
+"""
+
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+
+# Font files to try for each ImageMagick-style font name
+FONT_CANDIDATES = {
+    'Arial-Bold': [
+        'arialbd.ttf', 'Arial Bold.ttf', 'Arial_Bold.ttf',
+        'LiberationSans-Bold.ttf', 'DejaVuSans-Bold.ttf',
+    ],
+    'Arial': [
+        'arial.ttf', 'Arial.ttf', 'LiberationSans-Regular.ttf', 'DejaVuSans.ttf',
+    ],
+}
+
+# Horizontal padding on each side of the caption text
+TEXT_PADDING = 10
+
+# Smallest font size used when shrinking long captions to fit the banner
+MIN_FONT_SIZE = 24
+
+# Finished banners kept per renderer (a 972x80 banner is ~300 KB)
+MAX_CACHED_BANNERS = 256
+
+
+@lru_cache(maxsize=32)
+def load_font(font_name, font_size):
+    """
+    Load a TrueType font by ImageMagick-style name or file path
+    Falls back to Pillow's built-in font if no candidate is installed
+    """
+    for candidate in [font_name] + FONT_CANDIDATES.get(font_name, []):
+        try:
+            return ImageFont.truetype(candidate, font_size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(font_size)
+    except TypeError:
+        # Pillow < 10.1 has no scalable default font
+        return ImageFont.load_default()
+
+
+class CaptionRenderer:
+    """
+    Renders caption banners with Pillow
+
+    Fonts, measured layouts and finished banners are cached, so repeated
+    caption texts (and repeated jobs with the same style) cost nothing.
+    """
+
+    def __init__(self, banner_size, bg_color, text_color, font_name, font_size):
+        self.banner_width, self.banner_height = banner_size
+        self.bg_color = tuple(bg_color)
+        self.text_color = text_color
+        self.font_name = font_name
+        self.font_size = font_size
+        self._banners = OrderedDict()
+        self._lock = threading.Lock()
+        self._layout = lru_cache(maxsize=1024)(self._measure_layout)
+
+    def _wrap(self, text, font, max_width):
+        """Greedy word wrap to the given pixel width"""
+        lines = []
+        current = ''
+        for word in text.split():
+            candidate = f"{current} {word}" if current else word
+            if current and font.getlength(candidate) > max_width:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+        if current:
+            lines.append(current)
+        return lines or ['']
+
+    def _measure_layout(self, text):
+        """
+        Work out font size, line breaks and line positions for a caption
+        Shrinks the font until the wrapped text fits the banner height
+        """
+        max_width = self.banner_width - 2 * TEXT_PADDING
+        font_size = self.font_size
+        while True:
+            font = load_font(self.font_name, font_size)
+            lines = self._wrap(text, font, max_width)
+            ascent, descent = font.getmetrics()
+            line_height = ascent + descent
+            text_height = line_height * len(lines)
+            if text_height <= self.banner_height or font_size <= MIN_FONT_SIZE:
+                break
+            font_size = max(MIN_FONT_SIZE, font_size - 4)
+
+        top = (self.banner_height - text_height) // 2
+        positions = []
+        for i, line in enumerate(lines):
+            line_width = font.getlength(line)
+            positions.append(((self.banner_width - line_width) / 2, top + i * line_height))
+        return font_size, tuple(lines), tuple(positions)
+
+    def render(self, text):
+        """Return the banner for a caption as an RGBA uint8 array (height, width, 4)"""
+        with self._lock:
+            banner = self._banners.get(text)
+            if banner is not None:
+                self._banners.move_to_end(text)
+                return banner
+
+        font_size, lines, positions = self._layout(text)
+        font = load_font(self.font_name, font_size)
+        image = Image.new('RGBA', (self.banner_width, self.banner_height), self.bg_color + (255,))
+        draw = ImageDraw.Draw(image)
+        for line, position in zip(lines, positions):
+            draw.text(position, line, font=font, fill=self.text_color)
+
+        banner = np.asarray(image)
+        with self._lock:
+            self._banners[text] = banner
+            while len(self._banners) > MAX_CACHED_BANNERS:
+                self._banners.popitem(last=False)
+        return banner
+
+    def render_many(self, texts, max_workers=None):
+        """Render several captions in parallel, returning arrays in input order"""
+        unique_texts = list(dict.fromkeys(texts))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            rendered = dict(zip(unique_texts, executor.map(self.render, unique_texts)))
+        return [rendered[text] for text in texts]
+
+
+class CaptionTimeline:
+    """
+    Sorted interval index over pre-rendered caption banners
+
+    Looking up the caption for time t is a binary search over chunk start
+    times, so per-frame cost stays O(log n) however long the transcript is.
+    """
+
+    def __init__(self, chunks, banners):
+        ordered = sorted(zip(chunks, banners), key=lambda item: item[0]['start'])
+        self.starts = [chunk['start'] for chunk, _ in ordered]
+        self.ends = [chunk['end'] for chunk, _ in ordered]
+        self.banners = [banner for _, banner in ordered]
+        self._opaque = [bool(banner[:, :, 3].min() == 255) for banner in self.banners]
+
+    def __len__(self):
+        return len(self.banners)
+
+    def active_index(self, t):
+        """Index of the caption shown at time t, or None"""
+        i = bisect_right(self.starts, t) - 1
+        if i >= 0 and t < self.ends[i]:
+            return i
+        return None
+
+    def banner_at(self, t):
+        """RGBA banner shown at time t, or None"""
+        i = self.active_index(t)
+        return self.banners[i] if i is not None else None
+
+    def blit(self, frame, t, position):
+        """
+        Draw the caption active at time t onto an RGB uint8 frame in place
+        Returns False (and leaves the frame untouched) if no caption is active
+        """
+        i = self.active_index(t)
+        if i is None:
+            return False
+
+        banner = self.banners[i]
+        x, y = position
+        height, width = banner.shape[:2]
+        region = frame[y:y + height, x:x + width]
+        if self._opaque[i]:
+            region[:] = banner[:, :, :3]
+        else:
+            alpha = banner[:, :, 3:4].astype(np.uint16)
+            region[:] = ((banner[:, :, :3] * alpha + region * (255 - alpha) + 127) // 255).astype(np.uint8)
+        return True
+
+
+@lru_cache(maxsize=8)
+def get_caption_renderer(banner_size, bg_color, text_color, font_name, font_size):
+    """Return a shared renderer for a caption style, keeping its caches warm across jobs"""
+    return CaptionRenderer(banner_size, bg_color, text_color, font_name, font_size)
@@ -7,20 +7,77 @@ Creates vertical 9:16 videos with reaction overlay and automatic styled captions
 
 import tempfile
 import os
+import copy
+import contextlib
+import math
 import sys
+import signal
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from moviepy.editor import (
-    VideoFileClip, AudioFileClip, CompositeVideoClip, 
-    ColorClip, TextClip, CompositeAudioClip
-)
-from moviepy.video.fx import resize
-import whisper
+# moviepy.editor would also import every effect, IPython and pygame; load
+# only the pieces used here
+from moviepy.video.io.VideoFileClip import VideoFileClip
+from moviepy.video.VideoClip import ColorClip, VideoClip
+from moviepy.video.compositing.CompositeVideoClip import CompositeVideoClip
+from moviepy.audio.io.AudioFileClip import AudioFileClip
+from moviepy.audio.AudioClip import CompositeAudioClip
+from moviepy.audio.fx.volumex import volumex
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
 import warnings
+import numpy as np
+from shorts_creator_transcribe import (
+    get_model_pool, hash_audio_stream, TranscriptCache, merge_word_segments,
+    TRANSCRIPTION_BACKENDS, DEFAULT_BACKEND
+)
+from shorts_creator_server import TranscriptionClient, TranscriptionServerError
+from shorts_creator_audio import (
+    decode_audio, find_speech_regions, split_at_pauses, SpeechClip, MIX_CHANNELS, WHISPER_SAMPLE_RATE
+)
+from shorts_creator_captions import get_caption_renderer, CaptionTimeline
+from shorts_creator_render import (
+    ResizeMap, SplitScreenCompositor, CompositorClip,
+    FFmpegRenderError, write_caption_track, build_filtergraph_command, run_ffmpeg,
+    count_frames, plan_segments, gop_params, encode_frames, concat_segments,
+    FramePipeline, format_pipeline_stats, RenditionWriter, VideoWriter, write_clip_frames, abort_writer
+)
+from shorts_creator_jobs import RenderCancelled, check_cancelled, MAX_OUTPUTS_PER_PASS
+from shorts_creator_progress import ProgressReporter, STAGES
+from shorts_creator_profile import StageProfiler
 
 # Suppress Whisper warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="whisper")
 
 
+class CaptionLayerClip(VideoClip):
+    """
+    Single moviepy layer holding every caption of a video
+    Only the caption active at time t is looked up and blitted
+    """
+    
+    def __init__(self, timeline, caption_y, duration):
+        self.timeline = timeline
+        self.caption_y = caption_y
+        banner_height, banner_width = timeline.banners[0].shape[:2]
+        blank = np.zeros((banner_height, banner_width, 3), dtype=np.uint8)
+        
+        def make_frame(t):
+            banner = timeline.banner_at(t)
+            return banner[:, :, :3] if banner is not None else blank
+        
+        VideoClip.__init__(self, make_frame=make_frame, duration=duration)
+    
+    def blit_on(self, picture, t):
+        """Copy the active caption (if any) onto the frame at its fixed position"""
+        ct = t - self.start
+        if self.timeline.active_index(ct) is None:
+            return picture
+        picture = picture.copy()
+        x = (picture.shape[1] - self.w) // 2
+        self.timeline.blit(picture, ct, (x, self.caption_y))
+        return picture
+
+
 class ShortsCreator:
     """Creates YouTube Shorts with split-screen layout"""
     
@@ -39,9 +96,69 @@ class ShortsCreator:
     CAPTION_FONT = 'Arial-Bold'
     CAPTION_FONT_SIZE = 50
     
+    # Caption banner size
+    CAPTION_BANNER_WIDTH_RATIO = 0.9  # 90% of screen width
+    CAPTION_BANNER_HEIGHT = 80
+    
+    # Output encoding
+    OUTPUT_FPS = 30
+    VIDEO_CODEC = 'libx264'
+    AUDIO_CODEC = 'aac'
+    ENCODER_PRESET = 'medium'
+    VIDEO_BITRATE = '8000k'
+    MUSIC_VOLUME = 0.3  # Background music at 30% so reaction is clear
+    AUDIO_FPS = 44100
+    
+    # Keyframe interval for segmented rendering (segments start on GOP boundaries)
+    SEGMENT_GOP_FRAMES = 60  # 2 seconds at 30 fps
+    
+    # Frames buffered between pipeline stages (each composited frame is ~6 MB)
+    PIPELINE_QUEUE_DEPTH = 4
+    
+    # Extra renditions by name; written next to the main output as <name>_<profile>.mp4
+    RENDITION_PROFILES = {
+        '720p': {'width': 720, 'height': 1280, 'bitrate': '4000k'},
+        'preview': {'width': 360, 'height': 640, 'bitrate': '500k', 'preset': 'veryfast'},
+    }
+    
+    # Preview renders: the same layout scaled down, fewer frames, fastest encode
+    PREVIEW_WIDTH = 270
+    PREVIEW_FPS = 15
+    PREVIEW_PRESET = 'ultrafast'
+    PREVIEW_BITRATE = '1000k'
+    PREVIEW_DURATION = 5.0  # seconds
+    
+    # Render engines:
+    #   'numpy'   - single-buffer NumPy compositor, encoded by moviepy
+    #   'moviepy' - moviepy CompositeVideoClip (reference path)
+    #   'ffmpeg'  - one native ffmpeg filtergraph, no Python frame loop
+    #               (falls back to 'numpy' if ffmpeg fails)
+    RENDER_ENGINES = ('numpy', 'moviepy', 'ffmpeg')
+    
+    # Transcription settings (part of the transcript cache key)
+    WHISPER_LANGUAGE = 'en'
+    WORD_TIMESTAMPS = True
+    
+    # With detect_speech, transcribe the whole soundtrack anyway when speech
+    # covers more than this fraction of it (little to gain)
+    SPEECH_ONLY_MAX_FRACTION = 0.8
+    
+    # With transcribe_workers, every chunk gets at least this much speech
+    # (shorter reactions use fewer chunks, down to one sequential pass)
+    TRANSCRIBE_CHUNK_MIN_SECONDS = 60.0
+    
+    # Writable Whisper cache directory, resolved once per process
+    _whisper_cache_dir = None
+    
     def __init__(self, original_video_path, reaction_video_path, 
                  music_path, caption_text=None, auto_captions=True, 
-                 whisper_model='base', output_path='output.mp4'):
+                 whisper_model='base', output_path='output.mp4',
+                 whisper_device=None, model_pool=None,
+                 force_transcribe=False, transcript_cache=None,
+                 render_engine='numpy', parallel_segments=0, pipelined=True,
+                 renditions=None, cancel_event=None, progress=None, profile=False,
+                 use_transcription_server=True, detect_speech=False, transcribe_workers=0,
+                 transcription_backend=DEFAULT_BACKEND):
         """
         Initialize the Shorts Creator
         
@@ -53,6 +170,39 @@ class ShortsCreator:
             auto_captions: Enable automatic speech-to-text captions (default: True)
             whisper_model: Whisper model size (tiny/base/small/medium/large, default: base)
             output_path: Output file path
+            whisper_device: Torch device for Whisper (default: auto-detect)
+            model_pool: WhisperModelPool to load models from (default: process-wide pool)
+            force_transcribe: Ignore cached transcripts and re-run Whisper (default: False)
+            transcript_cache: TranscriptCache to use (default: 'transcripts' in the Whisper cache dir)
+            render_engine: Frame compositing engine, one of RENDER_ENGINES (default: numpy)
+            parallel_segments: Render the timeline as this many segments in worker
+                processes and join them without re-encoding (0 or 1 = off, default: 0)
+            pipelined: Run decoding, compositing and encoding as concurrent stages
+                (numpy engine only, default: True)
+            renditions: Extra outputs encoded from the same composited frames and
+                mixed audio, as RENDITION_PROFILES names or dicts with output_path
+                and optional width, height, fps, bitrate and preset (default: none)
+            cancel_event: threading or multiprocessing Event; once set, the job
+                raises RenderCancelled at its next checkpoint (between stages,
+                or before the next frame while rendering)
+            progress: Called with a ProgressEvent as each stage (probe, model_load,
+                transcription, caption_build, composite, encode, mux) starts,
+                advances and ends; may be called from worker threads
+            profile: Profile every stage with cProfile and tracemalloc and write
+                .pstats files and a summary.txt to <output name>_profile/
+                next to the output (default: False)
+            use_transcription_server: Send auto-caption transcription to the local
+                transcription server (shorts_creator_server.py) when one is
+                running, instead of loading a model here (default: True)
+            detect_speech: Find speech in the reaction audio first (energy-based
+                voice activity detection) and transcribe only those parts, with
+                word times mapped back to the full soundtrack (default: False)
+            transcribe_workers: Split long reaction audio at pauses into this many
+                chunks and transcribe them in parallel worker processes, each
+                loading its own Whisper model (0 or 1 = off, default: 0)
+            transcription_backend: How Whisper runs, one of TRANSCRIPTION_BACKENDS:
+                'whisper' (PyTorch, the reference) or 'whisper-int8' (CPU with
+                int8-quantized linear layers) (default: whisper)
         """
         self.original_video_path = Path(original_video_path)
         self.reaction_video_path = Path(reaction_video_path)
@@ -61,10 +211,91 @@ class ShortsCreator:
         self.auto_captions = auto_captions
         self.whisper_model = whisper_model
         self.output_path = Path(output_path)
+        self.whisper_device = whisper_device
+        self.model_pool = model_pool or get_model_pool()
+        self.force_transcribe = force_transcribe
+        self.transcript_cache = transcript_cache
+        self.render_engine = render_engine
+        self.parallel_segments = parallel_segments
+        self.pipelined = pipelined
+        self.pipeline_stats = None
+        self.cancel_event = cancel_event
+        self.progress = progress
+        self._progress = ProgressReporter(progress)
+        self.profile = profile
+        self.use_transcription_server = use_transcription_server
+        self.detect_speech = detect_speech
+        self.transcribe_workers = transcribe_workers
+        self.transcription_backend = transcription_backend
+        
+        if render_engine not in self.RENDER_ENGINES:
+            raise ValueError(
+                f"Unknown render engine '{render_engine}'. "
+                f"Choose one of: {', '.join(self.RENDER_ENGINES)}"
+            )
+        if transcription_backend not in TRANSCRIPTION_BACKENDS:
+            raise ValueError(
+                f"Unknown transcription backend '{transcription_backend}'. "
+                f"Choose one of: {', '.join(TRANSCRIPTION_BACKENDS)}"
+            )
+        
+        self.renditions = self._resolve_renditions(renditions or [])
+        if self.renditions and parallel_segments and parallel_segments > 1:
+            raise ValueError("Extra renditions cannot be combined with parallel_segments")
         
         # Validate input files exist
         self._validate_inputs()
         
+    def _resolve_renditions(self, renditions):
+        """Expand profile names and fill in defaults, returning complete rendition dicts"""
+        resolved = []
+        for rendition in renditions:
+            if isinstance(rendition, str):
+                if rendition not in self.RENDITION_PROFILES:
+                    raise ValueError(
+                        f"Unknown rendition '{rendition}'. "
+                        f"Choose one of: {', '.join(self.RENDITION_PROFILES)}"
+                    )
+                spec = dict(self.RENDITION_PROFILES[rendition])
+                spec['output_path'] = self.output_path.with_name(
+                    f"{self.output_path.stem}_{rendition}{self.output_path.suffix}"
+                )
+            else:
+                spec = dict(rendition)
+                if 'output_path' not in spec:
+                    raise ValueError("Each rendition needs an output_path")
+            
+            # Keep 9:16 when only one dimension is given (libx264 needs even sizes)
+            if 'width' in spec and 'height' not in spec:
+                spec['height'] = int(spec['width'] * self.HEIGHT / self.WIDTH) // 2 * 2
+            elif 'height' in spec and 'width' not in spec:
+                spec['width'] = int(spec['height'] * self.WIDTH / self.HEIGHT) // 2 * 2
+            spec.setdefault('width', self.WIDTH)
+            spec.setdefault('height', self.HEIGHT)
+            if spec['width'] % 2 or spec['height'] % 2:
+                raise ValueError(f"Rendition size must be even: {spec['width']}x{spec['height']}")
+            spec.setdefault('fps', self.OUTPUT_FPS)
+            spec.setdefault('bitrate', self.VIDEO_BITRATE)
+            spec.setdefault('preset', self.ENCODER_PRESET)
+            spec['output_path'] = Path(spec['output_path'])
+            resolved.append(spec)
+        return resolved
+    
+    def _plan_progress(self, frame_loop=True):
+        """Tell the progress reporter which stages this render will run"""
+        stages = ['probe', 'encode']
+        if frame_loop:
+            stages += ['composite', 'mux']
+        if self.caption_text or self.auto_captions:
+            stages.append('caption_build')
+        if self.auto_captions and not self.caption_text:
+            stages += ['model_load', 'transcription']
+        self._progress.plan(stages)
+    
+    def _check_cancelled(self):
+        """Cancellation checkpoint: raise RenderCancelled if the job was cancelled"""
+        check_cancelled(self.cancel_event)
+    
     def _validate_inputs(self):
         """Check that all input files exist"""
         for file_path in [self.original_video_path, self.reaction_video_path, self.music_path]:
@@ -75,7 +306,12 @@ class ShortsCreator:
         """
         Get a writable cache directory for Whisper models
         Tries multiple locations with fallbacks for Windows permission issues
+        The result is remembered for the rest of the process
         """
+        cached_dir = ShortsCreator._whisper_cache_dir
+        if cached_dir is not None and Path(cached_dir).is_dir():
+            return cached_dir
+        
         # Try multiple cache locations in order of preference
         cache_locations = []
         
@@ -110,7 +346,8 @@ class ShortsCreator:
                 test_file.unlink()
                 
                 print(f"   ✓ Using Whisper cache directory: {cache_dir}")
-                return str(cache_dir)
+                ShortsCreator._whisper_cache_dir = str(cache_dir)
+                return ShortsCreator._whisper_cache_dir
                 
             except (PermissionError, OSError) as e:
                 print(f"   ⚠️ Cannot use {cache_dir}: {e}")
@@ -124,22 +361,210 @@ class ShortsCreator:
             f"\n\nPlease ensure you have write permissions or run as administrator."
         )
     
-    def _transcribe_audio(self, video_path):
+    def _get_transcript_cache(self):
+        """
+        Return the transcript cache for this job
+        Defaults to a 'transcripts' folder inside the Whisper cache directory
+        """
+        if self.transcript_cache is None:
+            try:
+                cache_dir = Path(self._get_whisper_cache_dir()) / 'transcripts'
+            except PermissionError:
+                print("   ⚠️ Transcript cache disabled (no writable cache directory)")
+                return None
+            self.transcript_cache = TranscriptCache(cache_dir)
+        return self.transcript_cache
+    
+    def _transcribe_audio(self, video_path, reaction_audio=None):
         """
         Transcribe audio from video using Whisper
+        Uses the already decoded reaction_audio when given instead of letting
+        Whisper decode the file again
         Returns list of word segments with timestamps
         """
-        print(f"🎤 Transcribing audio with Whisper ({self.whisper_model} model)...")
+        audio = reaction_audio.to_whisper() if reaction_audio is not None else str(video_path)
+        # Decided before the cache lookup: a speech-only transcript is keyed
+        # apart from a whole-soundtrack one, including the fallback to the latter
+        regions, speech_only = self._find_speech(audio) if reaction_audio is not None else (None, False)
+        
+        # A cached transcript skips model loading entirely
+        transcript_cache = self._get_transcript_cache()
+        cache_key = None
+        if transcript_cache is not None:
+            print("🔎 Checking transcript cache...")
+            cache_key = TranscriptCache.make_key(
+                hash_audio_stream(video_path), self.whisper_model,
+                self.WHISPER_LANGUAGE, self.WORD_TIMESTAMPS,
+                speech_only=speech_only, backend=self.transcription_backend
+            )
+            if self.force_transcribe:
+                print("   🔄 Force re-transcribe enabled, ignoring cached transcript")
+            else:
+                word_segments = transcript_cache.get(cache_key)
+                if word_segments is not None:
+                    print(f"   ✓ Using cached transcript ({len(word_segments)} words)")
+                    self._progress.skip('model_load', 'transcription')
+                    return word_segments
+        
+        self._check_cancelled()
+        backend = "" if self.transcription_backend == DEFAULT_BACKEND else f", {self.transcription_backend} backend"
+        print(f"🎤 Transcribing audio with Whisper ({self.whisper_model} model{backend})...")
         print("   ⏳ This may take a minute...")
         
+        clips = self._transcription_clips(audio, regions, speech_only) if regions is not None else None
+        if clips is None:
+            word_segments = self._transcribe_whole(audio)
+        elif len(clips) == 1:
+            word_segments = clips[0].offset_words(self._transcribe_whole(clips[0].samples))
+        else:
+            word_segments = merge_word_segments(
+                clip.offset_words(chunk_words)
+                for clip, chunk_words in zip(clips, self._transcribe_chunks(clips))
+            )
+        print(f"   ✓ Transcribed {len(word_segments)} words")
+        
+        if transcript_cache is not None:
+            try:
+                transcript_cache.put(cache_key, word_segments)
+            except OSError as e:
+                print(f"   ⚠️ Could not cache transcript: {e}")
+        return word_segments
+    
+    def _find_speech(self, audio):
+        """
+        Speech regions of the 16 kHz reaction audio, and whether to transcribe
+        only those (detect_speech, unless speech is missing or nearly
+        everywhere); regions is None when neither detect_speech nor
+        transcribe_workers needs them
+        """
+        parallel = self.transcribe_workers is not None and self.transcribe_workers > 1
+        if not (self.detect_speech or parallel):
+            return None, False
+        regions = find_speech_regions(audio)
+        total_seconds = len(audio) / WHISPER_SAMPLE_RATE
+        speech_seconds = sum(end - start for start, end in regions)
+        
+        speech_only = False
+        if self.detect_speech:
+            if not regions:
+                print("   🗣️ No clear speech found, transcribing the whole soundtrack")
+            elif speech_seconds > self.SPEECH_ONLY_MAX_FRACTION * total_seconds:
+                print("   🗣️ Speech throughout, transcribing the whole soundtrack")
+            else:
+                print(f"   🗣️ Speech in {speech_seconds:.1f}s of {total_seconds:.1f}s "
+                      f"({len(regions)} regions), transcribing only those")
+                speech_only = True
+        return regions, speech_only
+    
+    def _transcription_clips(self, audio, regions, speech_only):
+        """
+        What to transcribe of the 16 kHz reaction audio given its speech
+        regions: None for all of it in one pass, else SpeechClips (the speech
+        regions if speech_only, one per chunk with transcribe_workers)
+        """
+        parallel = self.transcribe_workers is not None and self.transcribe_workers > 1
+        total_seconds = len(audio) / WHISPER_SAMPLE_RATE
+        groups = [regions]
+        if parallel and regions:
+            groups = split_at_pauses(regions, self.transcribe_workers, self.TRANSCRIBE_CHUNK_MIN_SECONDS)
+        if speech_only:
+            return [SpeechClip(audio, group) for group in groups]
+        if len(groups) < 2:
+            return None
+        # Whole-soundtrack chunks, cut in the middle of the pauses between groups
+        cuts = [(previous[-1][1] + following[0][0]) / 2 for previous, following in zip(groups, groups[1:])]
+        bounds = [0.0] + cuts + [total_seconds]
+        return [SpeechClip(audio, [(start, end)]) for start, end in zip(bounds, bounds[1:])]
+    
+    def _transcribe_whole(self, audio):
+        """Transcribe audio in one pass, on the transcription server if one is running"""
+        word_segments = self._transcribe_on_server(audio) if self.use_transcription_server else None
+        if word_segments is None:
+            word_segments = self._transcribe_in_process(audio)
+        return word_segments
+    
+    def _transcribe_chunks(self, clips):
+        """
+        Transcribe SpeechClips in parallel worker processes, one Whisper model each
+        Returns each clip's word segments (on the clip's own timeline)
+        """
+        workers = min(self.transcribe_workers, len(clips))
+        print(f"   🧩 Transcribing {len(clips)} chunks in parallel "
+              f"({workers} workers, one '{self.whisper_model}' model each)...")
+        # Split the cores between the workers instead of letting each torch use all of them
+        torch_threads = max(1, (os.cpu_count() or 1) // workers)
+        context = multiprocessing.get_context('spawn')
+        worker_pids = context.SimpleQueue()
+        self._progress.skip('model_load')
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=context, initializer=_init_worker,
+                initargs=(worker_pids, _init_transcribe_worker,
+                          (self.whisper_model, self.whisper_device, self._get_whisper_cache_dir(),
+                           self.transcription_backend, torch_threads))
+            ) as executor, self._progress.stage('transcription'):
+                futures = [
+                    executor.submit(_transcribe_chunk, clip.samples, self.WHISPER_LANGUAGE, self.WORD_TIMESTAMPS)
+                    for clip in clips
+                ]
+                # Poll so a cancelled job stops its workers instead of waiting them out
+                poll_seconds = 0.2 if self.cancel_event is not None else None
+                pending = set(futures)
+                while pending:
+                    finished, pending = wait(pending, timeout=poll_seconds, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        future.result()
+                        print(f"   ✓ Chunk {len(futures) - len(pending)}/{len(clips)} transcribed")
+                    if pending and self.cancel_event is not None and self.cancel_event.is_set():
+                        _stop_workers(executor, worker_pids)
+                        self._check_cancelled()
+                return [future.result() for future in futures]
+        except RenderCancelled:
+            raise
+        except Exception as e:
+            print(f"   ❌ Error during transcription: {e}")
+            raise RuntimeError(
+                f"Failed to transcribe audio. Error: {e}\n"
+                f"Make sure the video file has audio and is not corrupted."
+            )
+    
+    def _transcribe_on_server(self, audio):
+        """
+        Transcribe on the local transcription server if one is running
+        Returns None (transcribe in-process) if there is none or it fails
+        """
+        client = TranscriptionClient.connect()
+        if client is None:
+            return None
+        print("   🛰️ Sending audio to the transcription server...")
+        try:
+            with client, self._progress.stage('transcription'):
+                word_segments = client.transcribe(
+                    audio, self.whisper_model,
+                    language=self.WHISPER_LANGUAGE,
+                    word_timestamps=self.WORD_TIMESTAMPS,
+                    device=self.whisper_device,
+                    backend=self.transcription_backend,
+                    check_cancelled=self._check_cancelled
+                )
+        except TranscriptionServerError as e:
+            print(f"   ⚠️ Transcription server failed ({e}), transcribing here instead")
+            return None
+        self._progress.skip('model_load')
+        return word_segments
+    
+    def _transcribe_in_process(self, audio):
+        """Transcribe with a model from this process's pool"""
         try:
             # Get a writable cache directory
             cache_dir = self._get_whisper_cache_dir()
             
-            # Load Whisper model with explicit cache location
-            print(f"   📥 Loading Whisper model (will download if needed)...")
-            model = whisper.load_model(self.whisper_model, download_root=cache_dir)
-            print(f"   ✓ Model loaded successfully")
+            # Borrow a warm model from the pool (loaded on first use)
+            with self._progress.stage('model_load'):
+                pooled_model = self.model_pool.acquire(
+                    self.whisper_model, device=self.whisper_device, download_root=cache_dir,
+                    backend=self.transcription_backend
+                )
             
         except PermissionError as e:
             print(f"   ❌ Permission Error: {e}")
@@ -151,28 +576,16 @@ class ShortsCreator:
                 f"Try running the application as administrator or check your internet connection."
             )
         
+        self._check_cancelled()
         try:
             # Transcribe with word-level timestamps
             print(f"   🎯 Transcribing audio...")
-            result = model.transcribe(
-                str(video_path),
-                word_timestamps=True,
-                language='en'  # You can make this configurable
-            )
-            
-            # Extract word-level segments
-            word_segments = []
-            for segment in result['segments']:
-                if 'words' in segment:
-                    for word in segment['words']:
-                        word_segments.append({
-                            'word': word['word'].strip(),
-                            'start': word['start'],
-                            'end': word['end']
-                        })
-            
-            print(f"   ✓ Transcribed {len(word_segments)} words")
-            return word_segments
+            with self._progress.stage('transcription'):
+                return pooled_model.transcribe(
+                    audio,
+                    language=self.WHISPER_LANGUAGE,
+                    word_timestamps=self.WORD_TIMESTAMPS
+                )
             
         except Exception as e:
             print(f"   ❌ Error during transcription: {e}")
@@ -216,249 +629,906 @@ class ShortsCreator:
     
     def create_short(self):
         """Main method to create the YouTube Short"""
-        print("🎬 Loading videos...")
+        if self.profile:
+            with self._profiled(self.output_path):
+                self._create_short()
+        else:
+            self._create_short()
+    
+    def _create_short(self):
+        if self.render_engine == 'ffmpeg':
+            try:
+                self._create_short_ffmpeg()
+                return
+            except FFmpegRenderError as e:
+                print(f"⚠️ ffmpeg engine failed: {e}")
+                print("↩️ Falling back to the numpy engine...")
+        
+        self._create_short_moviepy()
+    
+    def _get_layout(self):
+        """
+        Calculate the split-screen geometry
+        Returns section heights and the y positions of the divider and bottom video
+        """
+        top_section_height = int(self.HEIGHT * self.TOP_VIDEO_HEIGHT_RATIO) - self.DIVIDER_HEIGHT // 2
+        bottom_section_height = int(self.HEIGHT * self.BOTTOM_VIDEO_HEIGHT_RATIO) - self.DIVIDER_HEIGHT // 2
+        return {
+            'top_height': top_section_height,
+            'bottom_height': bottom_section_height,
+            'divider_y': top_section_height,
+            'bottom_y': self.HEIGHT - bottom_section_height,
+        }
+    
+    def _build_captions(self, duration, reaction_audio=None):
+        """
+        Create the caption timeline (manual or auto)
+        Returns a CaptionTimeline, or None if there are no captions
+        """
+        # Manual caption overrides auto-captions
+        if self.caption_text:
+            print(f"💬 Adding manual caption: '{self.caption_text}'")
+            with self._progress.stage('caption_build'):
+                return self._create_static_caption(self.caption_text, duration)
+        
+        if self.auto_captions:
+            print("💬 Generating automatic captions from speech...")
+            timeline = self._create_auto_captions(reaction_audio)
+            if timeline is not None:
+                print(f"   ✓ Added {len(timeline)} dynamic captions")
+            return timeline
+        
+        return None
+    
+    def _load_video_clips(self, decode_to_panels=False):
+        """
+        Open both videos without audio and trim them to the shorter duration
+        With decode_to_panels, ffmpeg scales each video down to just cover its
+        panel while decoding (used for small previews)
+        Returns (original_clip, reaction_clip, duration)
+        """
+        original_size = reaction_size = None
+        if decode_to_panels:
+            layout = self._get_layout()
+            original_size = self._panel_decode_size(self.original_video_path, layout['top_height'])
+            reaction_size = self._panel_decode_size(self.reaction_video_path, layout['bottom_height'])
         
-        # Load videos
-        original_clip = VideoFileClip(str(self.original_video_path))
-        reaction_clip = VideoFileClip(str(self.reaction_video_path))
+        # Load videos (audio is decoded separately, only once)
+        original_clip = VideoFileClip(str(self.original_video_path), audio=False,
+                                      target_resolution=original_size)
+        reaction_clip = VideoFileClip(str(self.reaction_video_path), audio=False,
+                                      target_resolution=reaction_size)
         
         # Get the shortest duration to sync everything
         duration = min(original_clip.duration, reaction_clip.duration)
         
-        print(f"📏 Video duration: {duration:.2f} seconds")
-        
         # Trim videos to match duration
         original_clip = original_clip.subclip(0, duration)
         reaction_clip = reaction_clip.subclip(0, duration)
-        
-        print("🔇 Muting original video (only using reaction audio + music)...")
-        # IMPORTANT: Remove audio from original video
-        original_clip = original_clip.without_audio()
-        
-        print("📐 Creating layout...")
-        # Calculate dimensions for video sections
-        top_section_height = int(self.HEIGHT * self.TOP_VIDEO_HEIGHT_RATIO) - self.DIVIDER_HEIGHT // 2
-        bottom_section_height = int(self.HEIGHT * self.BOTTOM_VIDEO_HEIGHT_RATIO) - self.DIVIDER_HEIGHT // 2
+        return original_clip, reaction_clip, duration
+    
+    def _panel_decode_size(self, video_path, panel_height):
+        """
+        Smallest (height, width) that still covers a WIDTH x panel_height panel
+        Returns None if the video is already that small
+        """
+        width, height = ffmpeg_parse_infos(str(video_path))['video_size']
+        scale = max(self.WIDTH / width, panel_height / height)
+        if scale >= 1:
+            return None
+        return math.ceil(height * scale), math.ceil(width * scale)
+    
+    def _compose_video(self, original_clip, reaction_clip, caption_timeline, duration, engine):
+        """
+        Lay out both videos, the divider and the captions
+        Returns the composited (silent) video clip
+        """
+        layout = self._get_layout()
         
         # Resize and position original video (top)
-        original_resized = self._resize_and_crop(original_clip, self.WIDTH, top_section_height)
+        original_resized = self._resize_and_crop(original_clip, self.WIDTH, layout['top_height'])
         original_resized = original_resized.set_position(('center', 0))
         
         # Resize and position reaction video (bottom)
-        reaction_resized = self._resize_and_crop(reaction_clip, self.WIDTH, bottom_section_height)
-        bottom_y_position = self.HEIGHT - bottom_section_height
-        reaction_resized = reaction_resized.set_position(('center', bottom_y_position))
+        reaction_resized = self._resize_and_crop(reaction_clip, self.WIDTH, layout['bottom_height'])
+        reaction_resized = reaction_resized.set_position(('center', layout['bottom_y']))
         
         # Create black divider bar
-        divider_y = top_section_height
         black_divider = ColorClip(
             size=(self.WIDTH, self.DIVIDER_HEIGHT), 
             color=(0, 0, 0)
-        ).set_duration(duration).set_position(('center', divider_y))
+        ).set_duration(duration).set_position(('center', layout['divider_y']))
         
-        # Create captions (auto or manual)
+        # Captions (auto or manual) live on one time-indexed layer
         clips_to_composite = [original_resized, black_divider, reaction_resized]
+        caption_layer = None
+        if caption_timeline is not None:
+            caption_y = self._caption_position(layout['divider_y'])[1]
+            caption_layer = CaptionLayerClip(caption_timeline, caption_y, duration)
+            clips_to_composite.insert(2, caption_layer)
         
-        # Manual caption overrides auto-captions
-        if self.caption_text:
-            print(f"💬 Adding manual caption: '{self.caption_text}'")
-            caption_clip = self._create_static_caption(self.caption_text, duration, divider_y)
-            clips_to_composite.insert(2, caption_clip)
-        elif self.auto_captions:
-            print("💬 Generating automatic captions from speech...")
-            caption_clips = self._create_auto_captions(divider_y)
-            if caption_clips:
-                # Add all auto-caption clips
-                for cap_clip in caption_clips:
-                    clips_to_composite.insert(2, cap_clip)
-                print(f"   ✓ Added {len(caption_clips)} dynamic captions")
-        
-        # Composite all video elements
-        print("🎨 Compositing video layers...")
-        final_video = CompositeVideoClip(
+        if engine == 'numpy':
+            return self._create_compositor_clip(
+                original_resized, reaction_resized, caption_layer, duration
+            )
+        return CompositeVideoClip(
             clips_to_composite,
             size=(self.WIDTH, self.HEIGHT)
         ).set_duration(duration)
+    
+    def _create_short_moviepy(self):
+        """Render the short frame by frame through moviepy (numpy or moviepy engine)"""
+        engine = 'moviepy' if self.render_engine == 'moviepy' else 'numpy'
+        self._plan_progress()
+        original_clip = reaction_clip = None
+        reaction_audio = None
+        music_clip = None
+        
+        try:
+            with self._progress.stage('probe'):
+                print("🎬 Loading videos...")
+                original_clip, reaction_clip, duration = self._load_video_clips()
+                self._check_cancelled()
+                print("🔊 Decoding reaction audio...")
+                reaction_audio = decode_audio(self.reaction_video_path)
+            
+            print(f"📏 Video duration: {duration:.2f} seconds")
+            
+            # IMPORTANT: Original video audio is never loaded (only reaction audio + music)
+            print("🔇 Muting original video (only using reaction audio + music)...")
+            
+            # Create captions (auto or manual)
+            caption_timeline = self._build_captions(duration, reaction_audio)
+            self._check_cancelled()
+            
+            # Composite all video elements
+            with self._progress.stage('composite'):
+                print(f"📐 Creating layout and compositing video layers ({engine} engine)...")
+                final_video = self._compose_video(original_clip, reaction_clip, caption_timeline, duration, engine)
+                
+                final_audio, music_clip = self._mix_audio(duration, reaction_audio)
+            
+            # Export video
+            print(f"🚀 Exporting to {self.output_path}...")
+            print("⏳ This may take a few minutes...")
+            
+            if self.parallel_segments and self.parallel_segments > 1:
+                self._write_segmented(final_audio, duration, caption_timeline)
+            elif ((engine == 'numpy' and self.pipelined) or self.renditions
+                  or self.cancel_event is not None or self.progress is not None):
+                # Our own frame loop can stop between frames and report
+                # progress; write_videofile cannot
+                self._write_encoded(final_video, final_audio, duration, engine)
+            else:
+                final_video = final_video.set_audio(final_audio)
+                final_video.write_videofile(
+                    str(self.output_path),
+                    codec=self.VIDEO_CODEC,
+                    audio_codec=self.AUDIO_CODEC,
+                    fps=self.OUTPUT_FPS,
+                    preset=self.ENCODER_PRESET,
+                    bitrate=self.VIDEO_BITRATE
+                )
+        finally:
+            # Cleanup
+            for resource in (original_clip, reaction_clip, music_clip, reaction_audio):
+                if resource is not None:
+                    resource.close()
+        
+        self._print_summary()
+    
+    def _write_encoded(self, final_video, final_audio, duration, engine):
+        """
+        Encode the composited video with our own encoder (and any renditions)
+        The mixed audio is encoded first and muxed in by the video encoder,
+        as moviepy's write_videofile does. The numpy engine feeds the encoder
+        through the threaded frame pipeline when pipelined is on.
+        """
+        end_frame = count_frames(duration, self.OUTPUT_FPS)
+        with tempfile.TemporaryDirectory(prefix='shorts_pipeline_') as work_dir:
+            audio_path = os.path.join(work_dir, 'audio.m4a')
+            with self._progress.stage('mux'):
+                self._write_audio_track(final_audio, audio_path)
+            if engine == 'numpy' and self.pipelined:
+                self._run_pipeline(final_video, self.output_path, 0, end_frame, audio_path=audio_path)
+            else:
+                writer = self._open_writer(self.output_path, audio_path)
+                try:
+                    with self._progress.stage('encode', frames_total=end_frame) as stage:
+                        write_clip_frames(
+                            final_video, writer, 0, end_frame, self.OUTPUT_FPS,
+                            self.cancel_event, progress=stage.update
+                        )
+                except RenderCancelled:
+                    abort_writer(writer)
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                with self._progress.stage('mux'):
+                    writer.close()
         
+        if self.pipeline_stats is not None:
+            print("📊 Pipeline stages:")
+            for line in format_pipeline_stats(self.pipeline_stats):
+                print(f"   {line}")
+    
+    def _run_pipeline(self, final_video, output_path, start_frame, end_frame,
+                      audio_path=None, ffmpeg_params=None):
+        """Encode frames [start_frame, end_frame) of a CompositorClip with FramePipeline"""
+        pipeline = FramePipeline(
+            final_video.top_clip, self.OUTPUT_FPS, queue_depth=self.PIPELINE_QUEUE_DEPTH
+        )
+        writer = self._open_writer(output_path, audio_path, ffmpeg_params)
+        try:
+            pipeline.add_output(final_video.compositor, final_video.bottom_clip, writer, end_frame)
+            with self._progress.stage('encode', frames_total=end_frame - start_frame) as stage:
+                self.pipeline_stats = pipeline.run(
+                    start_frame, cancel_event=self.cancel_event, progress=stage.update
+                )
+        except RenderCancelled:
+            abort_writer(writer)
+            raise
+        except BaseException:
+            writer.close()
+            raise
+        # Closing flushes the encoder and muxes in the audio
+        with self._progress.stage('mux'):
+            writer.close()
+    
+    def _open_writer(self, output_path, audio_path=None, ffmpeg_params=None):
+        """
+        Start an ffmpeg encoder for raw frames at the output size and settings
+        With extra renditions, one ffmpeg process encodes all of them
+        """
+        if self.renditions:
+            main_output = {
+                'output_path': Path(output_path),
+                'width': self.WIDTH,
+                'height': self.HEIGHT,
+                'fps': self.OUTPUT_FPS,
+                'bitrate': self.VIDEO_BITRATE,
+                'preset': self.ENCODER_PRESET,
+            }
+            return RenditionWriter(
+                (self.WIDTH, self.HEIGHT), self.OUTPUT_FPS, [main_output] + self.renditions,
+                codec=self.VIDEO_CODEC, audio_path=audio_path, ffmpeg_params=ffmpeg_params
+            )
+        return VideoWriter(
+            str(output_path), (self.WIDTH, self.HEIGHT), self.OUTPUT_FPS,
+            codec=self.VIDEO_CODEC,
+            audiofile=audio_path,
+            preset=self.ENCODER_PRESET,
+            bitrate=self.VIDEO_BITRATE,
+            ffmpeg_params=ffmpeg_params
+        )
+    
+    def _mix_audio(self, duration, reaction_audio):
+        """
+        Mix the reaction soundtrack with the background music
+        Returns (final_audio, music_clip); close music_clip when done
+        """
         # Audio mixing (ONLY 2 sources: reaction + music)
         print("🎵 Mixing audio (reaction + background music)...")
         audio_clips = []
         
         # Add reaction audio
-        if reaction_clip.audio is not None:
-            audio_clips.append(reaction_clip.audio)
+        if reaction_audio is not None:
+            reaction_audio_clip = reaction_audio.to_audio_clip()
+            audio_clips.append(reaction_audio_clip.subclip(0, min(duration, reaction_audio.duration)))
             print("  ✓ Added reaction audio")
         
         # Add background music
         music_clip = AudioFileClip(str(self.music_path))
         music_clip = music_clip.subclip(0, min(duration, music_clip.duration))
         
-        # Lower music volume to 30% so reaction is clear
-        music_clip = music_clip.volumex(0.3)
+        # Lower music volume so reaction is clear
+        music_clip = music_clip.fx(volumex, self.MUSIC_VOLUME)
         audio_clips.append(music_clip)
-        print("  ✓ Added background music (30% volume)")
+        print(f"  ✓ Added background music ({self.MUSIC_VOLUME:.0%} volume)")
         
         # Composite audio
-        if audio_clips:
-            final_audio = CompositeAudioClip(audio_clips)
-            final_video = final_video.set_audio(final_audio)
-        
-        # Export video
-        print(f"🚀 Exporting to {self.output_path}...")
-        print("⏳ This may take a few minutes...")
-        
-        final_video.write_videofile(
-            str(self.output_path),
-            codec='libx264',
-            audio_codec='aac',
-            fps=30,
-            preset='medium',
-            bitrate='8000k'
+        return CompositeAudioClip(audio_clips).set_duration(duration), music_clip
+    
+    def _write_audio_track(self, final_audio, audio_path):
+        """Encode the mixed audio on its own, for muxing into a separately encoded video"""
+        final_audio.write_audiofile(
+            audio_path, fps=self.AUDIO_FPS, nbytes=4, codec=self.AUDIO_CODEC, logger=None
         )
+    
+    def create_preview(self, start=0.0, duration=None, output_path=None):
+        """
+        Render a quick low-resolution preview of a time window
+        
+        The layout is scaled to PREVIEW_WIDTH and encoded at PREVIEW_FPS with
+        the ultrafast preset. Both videos are decoded at preview size and
+        seeked straight to the window, so a few seconds render in about one.
+        
+        Args:
+            start: Window start in seconds (default: 0)
+            duration: Window length in seconds (default: PREVIEW_DURATION)
+            output_path: Preview file (default: <output name>.preview.mp4)
+        
+        Returns:
+            Path of the preview file
+        """
+        preview = self._scaled_for_preview()
+        preview.output_path = self.preview_path(output_path)
+        if self.profile:
+            with self._profiled(preview.output_path):
+                preview._render_preview(start, duration or self.PREVIEW_DURATION)
+        else:
+            preview._render_preview(start, duration or self.PREVIEW_DURATION)
+        return preview.output_path
+    
+    @contextlib.contextmanager
+    def _profiled(self, output_path):
+        """Profile the stages run inside the block; the report goes to <output name>_profile/"""
+        profiler = StageProfiler(output_path.with_name(f"{output_path.stem}_profile"))
+        self._progress.profiler = profiler
+        try:
+            yield profiler
+        finally:
+            self._progress.profiler = None
+            summary_path = profiler.write_summary()
+            if summary_path is not None:
+                print(f"🔬 Profile report: {summary_path}")
+    
+    def preview_path(self, output_path=None):
+        """Where create_preview() writes: output_path, or <output name>.preview.mp4"""
+        if output_path is not None:
+            return Path(output_path)
+        return self.output_path.with_name(f"{self.output_path.stem}.preview{self.output_path.suffix}")
+    
+    def _scaled_for_preview(self):
+        """Copy of this creator with every layout size scaled to the preview width"""
+        preview = copy.copy(self)
+        scale = self.PREVIEW_WIDTH / self.WIDTH
+        preview.WIDTH = self.PREVIEW_WIDTH
+        preview.HEIGHT = int(round(self.HEIGHT * scale / 2)) * 2
+        preview.DIVIDER_HEIGHT = int(round(self.DIVIDER_HEIGHT * scale))
+        preview.CAPTION_BANNER_HEIGHT = int(round(self.CAPTION_BANNER_HEIGHT * scale))
+        preview.CAPTION_FONT_SIZE = max(1, int(round(self.CAPTION_FONT_SIZE * scale)))
+        preview.OUTPUT_FPS = self.PREVIEW_FPS
+        preview.ENCODER_PRESET = self.PREVIEW_PRESET
+        preview.VIDEO_BITRATE = self.PREVIEW_BITRATE
+        preview.renditions = []
+        preview.pipeline_stats = None
+        return preview
+    
+    def _render_preview(self, start, length):
+        """Render [start, start + length) of the scaled layout (preview copy only)"""
+        print(f"👀 Rendering {length:.0f}s preview from {start:.1f}s "
+              f"({self.WIDTH}x{self.HEIGHT}, {self.OUTPUT_FPS} fps)...")
+        self._plan_progress()
+        original_clip = reaction_clip = None
+        reaction_audio = None
+        music_clip = None
+        try:
+            with self._progress.stage('probe'):
+                original_clip, reaction_clip, duration = self._load_video_clips(decode_to_panels=True)
+                start_frame = int(round(min(max(start, 0.0), duration) * self.OUTPUT_FPS))
+                end_frame = count_frames(min(duration, start_frame / self.OUTPUT_FPS + length), self.OUTPUT_FPS)
+                if end_frame <= start_frame:
+                    raise ValueError(f"Preview start {start:.1f}s is past the end of the video ({duration:.1f}s)")
+                
+                reaction_audio = decode_audio(self.reaction_video_path)
+            caption_timeline = self._build_captions(duration, reaction_audio)
+            self._check_cancelled()
+            with self._progress.stage('composite'):
+                final_video = self._compose_video(original_clip, reaction_clip, caption_timeline, duration, 'numpy')
+                final_audio, music_clip = self._mix_audio(duration, reaction_audio)
+            
+            with tempfile.TemporaryDirectory(prefix='shorts_preview_') as work_dir:
+                audio_path = os.path.join(work_dir, 'audio.m4a')
+                with self._progress.stage('mux'):
+                    self._write_audio_track(
+                        final_audio.subclip(start_frame / self.OUTPUT_FPS, end_frame / self.OUTPUT_FPS),
+                        audio_path
+                    )
+                self._run_pipeline(final_video, self.output_path, start_frame, end_frame, audio_path=audio_path)
+        finally:
+            for resource in (original_clip, reaction_clip, music_clip, reaction_audio):
+                if resource is not None:
+                    resource.close()
         
-        # Cleanup
-        original_clip.close()
-        reaction_clip.close()
-        music_clip.close()
+        print(f"✅ Preview ready: {self.output_path}")
+    
+    def _segment_worker_kwargs(self):
+        """Constructor arguments that rebuild this job inside a worker process"""
+        return {
+            'original_video_path': str(self.original_video_path),
+            'reaction_video_path': str(self.reaction_video_path),
+            'music_path': str(self.music_path),
+            'auto_captions': False,
+            'output_path': str(self.output_path),
+            'render_engine': self.render_engine,
+            'pipelined': self.pipelined,
+        }
+    
+    def _write_segmented(self, final_audio, duration, caption_timeline):
+        """
+        Render the video as GOP-aligned segments in parallel worker processes
+        The audio is mixed and encoded once for the whole timeline (no seams),
+        then muxed in while the segments are joined without re-encoding
+        """
+        total_frames = count_frames(duration, self.OUTPUT_FPS)
+        segments = plan_segments(total_frames, self.parallel_segments, self.SEGMENT_GOP_FRAMES)
         
+        with tempfile.TemporaryDirectory(prefix='shorts_segments_') as work_dir:
+            print("🎵 Encoding mixed audio once for the whole timeline...")
+            audio_path = os.path.join(work_dir, 'audio.m4a')
+            with self._progress.stage('mux'):
+                self._write_audio_track(final_audio, audio_path)
+            
+            print(f"🧩 Rendering {len(segments)} segments in parallel...")
+            segment_paths = [
+                os.path.join(work_dir, f"segment_{i:03d}.mp4") for i in range(len(segments))
+            ]
+            worker_kwargs = self._segment_worker_kwargs()
+            
+            # 'spawn' keeps workers independent of the parent's threads (GUI, pools)
+            context = multiprocessing.get_context('spawn')
+            worker_pids = context.SimpleQueue()
+            with ProcessPoolExecutor(
+                max_workers=len(segments), mp_context=context,
+                initializer=_init_worker, initargs=(worker_pids, None, ())
+            ) as executor, self._progress.stage('encode', frames_total=total_frames) as stage:
+                futures = [
+                    executor.submit(
+                        _render_segment, worker_kwargs, caption_timeline,
+                        start_frame, end_frame, segment_path
+                    )
+                    for (start_frame, end_frame), segment_path in zip(segments, segment_paths)
+                ]
+                # Poll so a cancelled job stops its workers instead of waiting them out
+                poll_seconds = 0.2 if self.cancel_event is not None else None
+                pending = set(futures)
+                frames_done = 0
+                while pending:
+                    finished, pending = wait(pending, timeout=poll_seconds, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        future.result()
+                        start_frame, end_frame = segments[futures.index(future)]
+                        frames_done += end_frame - start_frame
+                        stage.update(frames_done)
+                        print(f"   ✓ Segment {len(futures) - len(pending)}/{len(segments)} rendered")
+                    if pending and self.cancel_event is not None and self.cancel_event.is_set():
+                        _stop_workers(executor, worker_pids)
+                        self._check_cancelled()
+            
+            print("🔗 Joining segments (no re-encode)...")
+            with self._progress.stage('mux'):
+                concat_segments(segment_paths, audio_path, self.output_path)
+    
+    def _render_segment_frames(self, caption_timeline, start_frame, end_frame, segment_path):
+        """Encode frames [start_frame, end_frame) of the composited video (worker side)"""
+        engine = 'moviepy' if self.render_engine == 'moviepy' else 'numpy'
+        original_clip, reaction_clip, duration = self._load_video_clips()
+        try:
+            final_video = self._compose_video(original_clip, reaction_clip, caption_timeline, duration, engine)
+            if engine == 'numpy' and self.pipelined:
+                self._run_pipeline(
+                    final_video, segment_path, start_frame, end_frame,
+                    ffmpeg_params=gop_params(self.SEGMENT_GOP_FRAMES)
+                )
+                return
+            encode_frames(
+                final_video, start_frame, end_frame, self.OUTPUT_FPS, segment_path,
+                codec=self.VIDEO_CODEC,
+                preset=self.ENCODER_PRESET,
+                bitrate=self.VIDEO_BITRATE,
+                ffmpeg_params=gop_params(self.SEGMENT_GOP_FRAMES)
+            )
+        finally:
+            original_clip.close()
+            reaction_clip.close()
+    
+    def _create_short_ffmpeg(self):
+        """
+        Render the short with a single native ffmpeg filtergraph
+        Scaling, compositing, caption overlay, audio mixing and encoding all run
+        inside ffmpeg, with no per-frame Python work
+        """
+        self._plan_progress(frame_loop=False)
+        reaction_audio = None
+        
+        with tempfile.TemporaryDirectory(prefix='shorts_ffmpeg_') as work_dir:
+            try:
+                with self._progress.stage('probe'):
+                    print("🎬 Probing videos...")
+                    original_info = ffmpeg_parse_infos(str(self.original_video_path))
+                    reaction_info = ffmpeg_parse_infos(str(self.reaction_video_path))
+                    
+                    # Get the shortest duration to sync everything
+                    duration = min(original_info['duration'], reaction_info['duration'])
+                    print(f"📏 Video duration: {duration:.2f} seconds")
+                    
+                    # Transcription needs the decoded soundtrack; ffmpeg then mixes
+                    # that same PCM buffer instead of decoding the reaction again
+                    if self.auto_captions and not self.caption_text and reaction_info['audio_found']:
+                        print("🔊 Decoding reaction audio...")
+                        reaction_audio = decode_audio(self.reaction_video_path)
+                
+                layout = self._get_layout()
+                caption_playlist = None
+                caption_timeline = self._build_captions(duration, reaction_audio)
+                self._check_cancelled()
+                if caption_timeline is not None:
+                    with self._progress.stage('caption_build'):
+                        caption_playlist = write_caption_track(caption_timeline, duration, work_dir)
+                
+                reaction_pcm = None
+                if reaction_audio is not None:
+                    reaction_pcm = (reaction_audio.temp_path, reaction_audio.sample_rate, MIX_CHANNELS)
+                
+                print("🔇 Muting original video (only using reaction audio + music)...")
+                print(f"🚀 Rendering with ffmpeg to {self.output_path}...")
+                command = build_filtergraph_command(
+                    original_path=self.original_video_path,
+                    original_size=original_info['video_size'],
+                    reaction_path=self.reaction_video_path,
+                    reaction_size=reaction_info['video_size'],
+                    music_path=self.music_path,
+                    output_path=self.output_path,
+                    duration=duration,
+                    width=self.WIDTH,
+                    height=self.HEIGHT,
+                    top_height=layout['top_height'],
+                    bottom_y=layout['bottom_y'],
+                    fps=self.OUTPUT_FPS,
+                    video_codec=self.VIDEO_CODEC,
+                    audio_codec=self.AUDIO_CODEC,
+                    preset=self.ENCODER_PRESET,
+                    bitrate=self.VIDEO_BITRATE,
+                    music_volume=self.MUSIC_VOLUME,
+                    reaction_has_audio=reaction_info['audio_found'],
+                    reaction_pcm=reaction_pcm,
+                    caption_playlist=caption_playlist,
+                    caption_position=self._caption_position(layout['divider_y']),
+                    renditions=self.renditions
+                )
+                # Layout, encode and mux all happen inside this one ffmpeg run
+                with self._progress.stage('encode', frames_total=count_frames(duration, self.OUTPUT_FPS)) as stage:
+                    run_ffmpeg(
+                        command, duration, cancel_event=self.cancel_event,
+                        on_progress=lambda seconds: stage.update(int(seconds * self.OUTPUT_FPS))
+                    )
+            finally:
+                if reaction_audio is not None:
+                    reaction_audio.close()
+        
+        self._print_summary()
+    
+    def _print_summary(self):
+        """Print the final success message"""
         print(f"✅ Done! Your YouTube Short is ready: {self.output_path}")
         print(f"📊 Output: {self.WIDTH}x{self.HEIGHT} (9:16 vertical)")
+        for rendition in self.renditions:
+            print(f"   + {rendition['width']}x{rendition['height']} @ {rendition['bitrate']}: "
+                  f"{rendition['output_path']}")
         print(f"🔊 Audio sources: Reaction + Background Music (Original video muted)")
     
+    def _create_compositor_clip(self, top_clip, bottom_clip, caption_layer, duration):
+        """
+        Build the final video on the single-buffer NumPy compositor
+        Produces the same pixels as the CompositeVideoClip layout
+        """
+        caption_timeline = caption_layer.timeline if caption_layer is not None else None
+        compositor = self._create_compositor(caption_timeline)
+        return CompositorClip(compositor, top_clip, bottom_clip, duration)
+    
+    def _create_compositor(self, caption_timeline=None):
+        """SplitScreenCompositor for this layout, drawing captions from caption_timeline"""
+        layout = self._get_layout()
+        return SplitScreenCompositor(
+            self.WIDTH, self.HEIGHT,
+            top_y=0,
+            divider_y=layout['divider_y'],
+            divider_height=self.DIVIDER_HEIGHT,
+            bottom_y=layout['bottom_y'],
+            caption_timeline=caption_timeline,
+            caption_position=self._caption_position(layout['divider_y'])
+        )
+    
     def _resize_and_crop(self, clip, target_width, target_height):
         """
         Resize and crop clip to fit target dimensions while maintaining aspect ratio
+        The crop is computed first, so only the visible part of each frame is resampled
         """
-        clip_aspect = clip.w / clip.h
-        target_aspect = target_width / target_height
-        
-        if clip_aspect > target_aspect:
-            # Clip is wider - fit to height and crop width
-            new_height = target_height
-            new_width = int(new_height * clip_aspect)
-            resized = clip.resize(height=new_height)
-            x_center = (new_width - target_width) // 2
-            cropped = resized.crop(x1=x_center, width=target_width)
-        else:
-            # Clip is taller - fit to width and crop height
-            new_width = target_width
-            new_height = int(new_width / clip_aspect)
-            resized = clip.resize(width=new_width)
-            y_center = (new_height - target_height) // 2
-            cropped = resized.crop(y1=y_center, height=target_height)
-        
-        return cropped
+        resize_map = ResizeMap(clip.size, (target_width, target_height))
+        return clip.fl_image(resize_map)
+    
+    def _get_caption_renderer(self):
+        """Return the shared Pillow renderer for this caption style"""
+        banner_width = int(self.WIDTH * self.CAPTION_BANNER_WIDTH_RATIO)
+        return get_caption_renderer(
+            (banner_width, self.CAPTION_BANNER_HEIGHT),
+            self.CAPTION_BG_COLOR,
+            self.CAPTION_TEXT_COLOR,
+            self.CAPTION_FONT,
+            self.CAPTION_FONT_SIZE
+        )
+    
+    def _caption_position(self, divider_y):
+        """Top-left corner of the caption banner, centered in the divider"""
+        banner_width = int(self.WIDTH * self.CAPTION_BANNER_WIDTH_RATIO)
+        caption_x = (self.WIDTH - banner_width) // 2
+        caption_y = divider_y + (self.DIVIDER_HEIGHT - self.CAPTION_BANNER_HEIGHT) // 2
+        return caption_x, caption_y
     
-    def _create_static_caption(self, caption_text, duration, divider_y):
+    def _create_static_caption(self, caption_text, duration):
         """
         Create static yellow caption banner with black text (for manual captions)
+        Returns a single-entry CaptionTimeline covering the whole video
         """
-        # Caption banner dimensions
-        banner_width = int(self.WIDTH * 0.9)  # 90% of screen width
-        banner_height = 80
-        
-        # Create yellow background banner
-        banner = ColorClip(
-            size=(banner_width, banner_height),
-            color=self.CAPTION_BG_COLOR
-        ).set_duration(duration)
-        
-        # Create black text
-        try:
-            text = TextClip(
-                caption_text,
-                fontsize=self.CAPTION_FONT_SIZE,
-                color=self.CAPTION_TEXT_COLOR,
-                font=self.CAPTION_FONT,
-                method='caption',
-                size=(banner_width - 20, None)  # Add padding
-            ).set_duration(duration)
-        except:
-            # Fallback if Arial-Bold not available
-            text = TextClip(
-                caption_text,
-                fontsize=self.CAPTION_FONT_SIZE,
-                color=self.CAPTION_TEXT_COLOR,
-                method='caption',
-                size=(banner_width - 20, None)
-            ).set_duration(duration)
-        
-        # Center text on banner
-        text = text.set_position(('center', 'center'))
-        
-        # Composite text on banner
-        caption_composite = CompositeVideoClip(
-            [banner, text],
-            size=(banner_width, banner_height)
-        ).set_duration(duration)
-        
-        # Position caption in the middle of the divider
-        caption_y = divider_y + (self.DIVIDER_HEIGHT - banner_height) // 2
-        caption_composite = caption_composite.set_position(('center', caption_y))
-        
-        return caption_composite
+        # Draw the banner and text into one RGBA image
+        renderer = self._get_caption_renderer()
+        return CaptionTimeline(
+            [{'start': 0, 'end': duration}], [renderer.render(caption_text)]
+        )
     
-    def _create_auto_captions(self, divider_y):
+    def _create_auto_captions(self, reaction_audio=None):
         """
         Create dynamic auto-captions from speech-to-text transcription
-        Returns list of caption clips with timing
+        Returns a CaptionTimeline, or None if no speech was found
         """
         # Transcribe the reaction video
-        word_segments = self._transcribe_audio(self.reaction_video_path)
+        word_segments = self._transcribe_audio(self.reaction_video_path, reaction_audio)
         
         if not word_segments:
             print("   ⚠️ No speech detected in reaction video")
-            return []
-        
-        # Chunk words into caption segments
-        caption_chunks = self._chunk_words(word_segments, words_per_caption=4)
-        
-        # Create a caption clip for each chunk
-        caption_clips = []
-        banner_width = int(self.WIDTH * 0.9)
-        banner_height = 80
-        caption_y = divider_y + (self.DIVIDER_HEIGHT - banner_height) // 2
-        
-        for i, chunk in enumerate(caption_chunks):
-            # Create yellow background banner
-            banner = ColorClip(
-                size=(banner_width, banner_height),
-                color=self.CAPTION_BG_COLOR
-            ).set_duration(chunk['end'] - chunk['start'])
-            
-            # Create black text
-            try:
-                text = TextClip(
-                    chunk['text'],
-                    fontsize=self.CAPTION_FONT_SIZE,
-                    color=self.CAPTION_TEXT_COLOR,
-                    font=self.CAPTION_FONT,
-                    method='caption',
-                    size=(banner_width - 20, None)
-                ).set_duration(chunk['end'] - chunk['start'])
-            except:
-                # Fallback if Arial-Bold not available
-                text = TextClip(
-                    chunk['text'],
-                    fontsize=self.CAPTION_FONT_SIZE,
-                    color=self.CAPTION_TEXT_COLOR,
-                    method='caption',
-                    size=(banner_width - 20, None)
-                ).set_duration(chunk['end'] - chunk['start'])
-            
-            # Center text on banner
-            text = text.set_position(('center', 'center'))
-            
-            # Composite text on banner
-            caption_composite = CompositeVideoClip(
-                [banner, text],
-                size=(banner_width, banner_height)
-            ).set_duration(chunk['end'] - chunk['start'])
+            return None
+        
+        self._check_cancelled()
+        
+        with self._progress.stage('caption_build'):
+            # Chunk words into caption segments
+            caption_chunks = self._chunk_words(word_segments, words_per_caption=4)
             
-            # Position and time the caption
-            caption_composite = caption_composite.set_position(('center', caption_y))
-            caption_composite = caption_composite.set_start(chunk['start'])
+            # Render every banner up front (in parallel, cached by text)
+            renderer = self._get_caption_renderer()
+            banners = renderer.render_many([chunk['text'] for chunk in caption_chunks])
             
-            caption_clips.append(caption_composite)
+            # Index the captions by time so each frame only touches the active one
+            return CaptionTimeline(caption_chunks, banners)
+
+
+class MultiShortsCreator:
+    """
+    Renders many shorts that share one original (top) video
+    
+    Each pass decodes and resizes the top panel once per frame and fans it
+    out to up to MAX_OUTPUTS_PER_PASS compositors and encoders, so the
+    original's decode cost is paid once per pass instead of once per short.
+    Captions and audio are prepared per variant exactly as ShortsCreator does.
+    """
+    
+    # Variants encoded together in one pass (see shorts_creator_jobs)
+    MAX_OUTPUTS_PER_PASS = MAX_OUTPUTS_PER_PASS
+    
+    def __init__(self, original_video_path, variants, whisper_model='base',
+                 whisper_device=None, model_pool=None, force_transcribe=False,
+                 transcript_cache=None, max_outputs_per_pass=None, cancel_event=None,
+                 progress=None, transcription_backend=DEFAULT_BACKEND):
+        """
+        Initialize the multi-output job
+        
+        Args:
+            original_video_path: Path to the original video shared by every short
+            variants: List of dicts with reaction_video_path, music_path and
+                output_path, plus optional caption_text and auto_captions
+            whisper_model, whisper_device, model_pool, force_transcribe,
+                transcript_cache: As for ShortsCreator
+            max_outputs_per_pass: Variants per decode pass (default: MAX_OUTPUTS_PER_PASS)
+            cancel_event: As for ShortsCreator; cancelling stops the whole job
+            progress: As for ShortsCreator; stages repeat per variant, and the
+                percentage restarts with each pass
+            transcription_backend: As for ShortsCreator
+        """
+        self.original_video_path = Path(original_video_path)
+        self.variants = list(variants)
+        self.whisper_model = whisper_model
+        self.whisper_device = whisper_device
+        self.model_pool = model_pool or get_model_pool()
+        self.force_transcribe = force_transcribe
+        self.transcript_cache = transcript_cache
+        self.max_outputs_per_pass = max_outputs_per_pass or self.MAX_OUTPUTS_PER_PASS
+        self.cancel_event = cancel_event
+        self.progress = progress
+        self._progress = ProgressReporter(progress)
+        self.transcription_backend = transcription_backend
+        self.results = []
+        self.pipeline_stats = []
         
-        return caption_clips
+        if not self.original_video_path.exists():
+            raise FileNotFoundError(f"File not found: {self.original_video_path}")
+    
+    def _make_creator(self, variant):
+        """ShortsCreator for one variant (validates its inputs)"""
+        creator = ShortsCreator(
+            self.original_video_path,
+            variant['reaction_video_path'],
+            variant['music_path'],
+            caption_text=variant.get('caption_text'),
+            auto_captions=variant.get('auto_captions', True),
+            whisper_model=self.whisper_model,
+            output_path=variant['output_path'],
+            whisper_device=self.whisper_device,
+            model_pool=self.model_pool,
+            force_transcribe=self.force_transcribe,
+            transcript_cache=self.transcript_cache,
+            cancel_event=self.cancel_event,
+            transcription_backend=self.transcription_backend
+        )
+        # Variants report their caption stages through the job's reporter
+        creator._progress = self._progress
+        return creator
+    
+    def create_shorts(self):
+        """
+        Render every variant, continuing past failed ones
+        Returns one result dict per variant (output, status, error); raises
+        RenderCancelled if the job is cancelled
+        """
+        self.results = []
+        creators = []
+        for variant in self.variants:
+            result = {'output': str(variant.get('output_path')), 'status': 'pending'}
+            self.results.append(result)
+            try:
+                creators.append((self._make_creator(variant), result))
+            except (KeyError, FileNotFoundError, ValueError) as e:
+                self._fail(result, e)
+        
+        step = self.max_outputs_per_pass
+        for pass_number, start in enumerate(range(0, len(creators), step), start=1):
+            group = creators[start:start + step]
+            print(f"🎬 Pass {pass_number}: decoding the original once for {len(group)} short(s)...")
+            self._progress.plan(STAGES)
+            try:
+                self._render_pass(group)
+            except RenderCancelled:
+                raise
+            except Exception as e:
+                for _, result in group:
+                    if result['status'] == 'pending':
+                        self._fail(result, e)
+        
+        succeeded = sum(1 for result in self.results if result['status'] == 'ok')
+        print(f"✅ Done! {succeeded}/{len(self.results)} shorts rendered from {self.original_video_path.name}")
+        return self.results
+    
+    def _fail(self, result, error):
+        """Record a failed variant"""
+        result['status'] = 'failed'
+        result['error'] = f"{type(error).__name__}: {error}"
+        print(f"   ❌ {result['output']}: {result['error']}")
+    
+    def _render_pass(self, group):
+        """Encode a group of variants in one pass over the original video"""
+        with self._progress.stage('probe'):
+            original_clip = VideoFileClip(str(self.original_video_path), audio=False)
+        opened = []
+        writers = []
+        rendering = []
+        try:
+            first = group[0][0]
+            layout = first._get_layout()
+            top_clip = first._resize_and_crop(original_clip, first.WIDTH, layout['top_height'])
+            pipeline = FramePipeline(top_clip, first.OUTPUT_FPS, queue_depth=first.PIPELINE_QUEUE_DEPTH)
+            
+            with tempfile.TemporaryDirectory(prefix='shorts_multi_') as work_dir:
+                for i, (creator, result) in enumerate(group):
+                    print(f"📐 Preparing {creator.output_path.name}...")
+                    try:
+                        with self._progress.stage('probe'):
+                            reaction_clip = VideoFileClip(str(creator.reaction_video_path), audio=False)
+                            opened.append(reaction_clip)
+                            duration = min(original_clip.duration, reaction_clip.duration)
+                            
+                            reaction_audio = decode_audio(creator.reaction_video_path)
+                            if reaction_audio is not None:
+                                opened.append(reaction_audio)
+                        caption_timeline = creator._build_captions(duration, reaction_audio)
+                        
+                        with self._progress.stage('composite'):
+                            bottom_clip = creator._resize_and_crop(
+                                reaction_clip, creator.WIDTH, layout['bottom_height']
+                            )
+                            final_audio, music_clip = creator._mix_audio(duration, reaction_audio)
+                            opened.append(music_clip)
+                        audio_path = os.path.join(work_dir, f"audio_{i:03d}.m4a")
+                        with self._progress.stage('mux'):
+                            creator._write_audio_track(final_audio, audio_path)
+                        
+                        writer = creator._open_writer(creator.output_path, audio_path)
+                        writers.append(writer)
+                        pipeline.add_output(
+                            creator._create_compositor(caption_timeline), bottom_clip, writer,
+                            count_frames(duration, creator.OUTPUT_FPS)
+                        )
+                        rendering.append(result)
+                    except RenderCancelled:
+                        raise
+                    except Exception as e:
+                        self._fail(result, e)
+                
+                if not rendering:
+                    return
+                print(f"🚀 Encoding {len(rendering)} short(s) in one pass...")
+                frames_total = sum(output.end_frame for output in pipeline.outputs)
+                try:
+                    with self._progress.stage('encode', frames_total=frames_total) as stage:
+                        self.pipeline_stats.append(
+                            pipeline.run(cancel_event=self.cancel_event, progress=stage.update)
+                        )
+                except RenderCancelled:
+                    for writer in writers:
+                        abort_writer(writer)
+                    raise
+                # Other failures leave the writers to the outer finally
+                with self._progress.stage('mux'):
+                    for writer in writers:
+                        writer.close()
+                writers = []
+                for result in rendering:
+                    result['status'] = 'ok'
+                    print(f"   ✓ {result['output']}")
+        finally:
+            for writer in writers:
+                writer.close()
+            for resource in opened:
+                resource.close()
+            original_clip.close()
+
+
+def _init_worker(worker_pids, initializer, initargs):
+    """Worker-process initializer: report this worker's PID, then run initializer(*initargs)"""
+    worker_pids.put(os.getpid())
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _stop_workers(executor, worker_pids):
+    """
+    Drop a pool's queued work and terminate its workers (segment renders or
+    transcription chunks) on cancel; worker_pids is the queue the pool's
+    workers reported to from _init_worker
+    """
+    executor.shutdown(wait=False, cancel_futures=True)
+    # The executor has no public way to stop busy workers
+    while not worker_pids.empty():
+        try:
+            os.kill(worker_pids.get(), signal.SIGTERM)
+        except OSError:
+            # Already exited
+            pass
+
+
+# Whisper settings of a transcription worker process (set by its initializer)
+_chunk_model = None
+
+
+def _init_transcribe_worker(model_name, device, download_root, backend, torch_threads):
+    """Worker-process initializer for chunked transcription: load this worker's model"""
+    global _chunk_model
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+    _chunk_model = (model_name, device, download_root, backend)
+    get_model_pool().acquire(*_chunk_model)
+
+
+def _transcribe_chunk(samples, language, word_timestamps):
+    """Worker-process entry point for chunked transcription"""
+    return get_model_pool().acquire(*_chunk_model).transcribe(samples, language, word_timestamps)
+
+
+def _render_segment(creator_kwargs, caption_timeline, start_frame, end_frame, segment_path):
+    """Worker-process entry point for segmented rendering"""
+    creator = ShortsCreator(**creator_kwargs)
+    creator._render_segment_frames(caption_timeline, start_frame, end_frame, segment_path)
+    return segment_path
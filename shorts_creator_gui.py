@@ -8,40 +8,138 @@ User-friendly interface for creating split-screen reaction videos with auto-capt
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
+import multiprocessing
 import sys
 import os
 from pathlib import Path
 import queue
 from datetime import datetime
 
-# Import the core shorts creator logic
-from shorts_creator_core import ShortsCreator
+# Import the core shorts creator logic (jobs run in a cancellable child process)
+from shorts_creator_process import RenderProcess
+from shorts_creator_queue import JobScheduler, FINISHED_STATES
+from shorts_creator_jobs import RenderCancelled
 
 
 class TextRedirector:
-    """Redirect stdout/stderr to GUI text widget"""
-    def __init__(self, text_widget, tag="stdout"):
-        self.text_widget = text_widget
+    """Redirect stdout/stderr to a queue (safe to call from any thread)"""
+    def __init__(self, log_queue, tag="stdout"):
+        self.log_queue = log_queue
         self.tag = tag
 
     def write(self, text):
-        self.text_widget.configure(state='normal')
-        self.text_widget.insert(tk.END, text, (self.tag,))
-        self.text_widget.see(tk.END)
-        self.text_widget.configure(state='disabled')
-        self.text_widget.update_idletasks()
+        if text:
+            self.log_queue.put((self.tag, text))
 
     def flush(self):
         pass
 
 
+class ConsolePump:
+    """
+    Drains queued output into the console text widget from the Tk main loop
+
+    Output is applied in batches every POLL_MS. Carriage-return progress
+    updates rewrite the last line instead of adding new ones, so only the
+    latest state of a progress bar is drawn, and only the newest MAX_LINES
+    lines are kept.
+    """
+
+    POLL_MS = 100
+    MAX_LINES = 2000
+    MAX_ITEMS_PER_POLL = 5000
+
+    def __init__(self, root, text_widget):
+        self.root = root
+        self.text_widget = text_widget
+        self.log_queue = queue.Queue()
+        self._partial = ''  # unfinished last line currently shown
+        self._partial_tag = 'stdout'
+
+    def start(self):
+        """Begin draining the queue"""
+        self.root.after(self.POLL_MS, self._poll)
+
+    def clear(self):
+        """Empty the console"""
+        self.text_widget.configure(state='normal')
+        self.text_widget.delete(1.0, tk.END)
+        self.text_widget.configure(state='disabled')
+        self._partial = ''
+
+    def _poll(self):
+        try:
+            self._drain()
+        finally:
+            self.root.after(self.POLL_MS, self._poll)
+
+    def _drain(self):
+        """Apply everything queued since the last poll in one widget update"""
+        items = []
+        try:
+            while len(items) < self.MAX_ITEMS_PER_POLL:
+                items.append(self.log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if not items:
+            return
+
+        # Replay the output as a terminal would: \n ends a line, \r restarts it
+        had_partial = bool(self._partial)
+        partial, partial_tag = self._partial, self._partial_tag
+        lines = []
+        for tag, text in items:
+            for i, piece in enumerate(text.replace('\r\n', '\n').split('\n')):
+                if i > 0:
+                    lines.append((partial + '\n', partial_tag))
+                    partial = ''
+                if '\r' in piece:
+                    partial = piece.rsplit('\r', 1)[1]
+                else:
+                    partial += piece
+                if piece:
+                    partial_tag = tag
+        lines = lines[-self.MAX_LINES:]
+
+        widget = self.text_widget
+        widget.configure(state='normal')
+        if had_partial:
+            widget.delete('end-1c linestart', 'end-1c')
+        # Merge consecutive lines with the same tag into one insert
+        run_tag, run = None, []
+        for line, tag in lines:
+            if tag != run_tag and run:
+                widget.insert(tk.END, ''.join(run), (run_tag,))
+                run = []
+            run_tag = tag
+            run.append(line)
+        if run:
+            widget.insert(tk.END, ''.join(run), (run_tag,))
+        if partial:
+            widget.insert(tk.END, partial, (partial_tag,))
+
+        line_count = int(widget.index('end-1c').split('.')[0])
+        if line_count > self.MAX_LINES:
+            widget.delete(1.0, f"{line_count - self.MAX_LINES + 1}.0")
+        widget.see(tk.END)
+        widget.configure(state='disabled')
+        self._partial, self._partial_tag = partial, partial_tag
+
+
 class ShortsCreatorGUI:
     """Main GUI application for YouTube Shorts Creator"""
     
+    # How often the job queue panel refreshes
+    QUEUE_POLL_MS = 500
+    
+    # Delay after the window appears before a render worker is started in
+    # the background (it imports moviepy, and Whisper for auto-captions)
+    WARM_UP_DELAY_MS = 1000
+    
     def __init__(self, root):
         self.root = root
         self.root.title("YouTube Shorts Creator v2.0 - Windows Edition")
-        self.root.geometry("900x800")
+        self.root.geometry("900x900")
         self.root.resizable(True, True)
         
         # Set icon (if available)
@@ -61,19 +159,52 @@ class ShortsCreatorGUI:
         self.caption_mode = tk.StringVar(value="auto")  # auto, manual, none
         self.manual_caption_text = tk.StringVar()
         self.whisper_model = tk.StringVar(value="base")
+        self.transcription_backend = tk.StringVar(value="whisper")
+        self.force_transcribe = tk.BooleanVar(value=False)
+        
+        # Render settings
+        self.render_engine = tk.StringVar(value="numpy")
+        self.extra_renditions = tk.BooleanVar(value=False)
+        self.profile_render = tk.BooleanVar(value=False)
+        self.preview_start = tk.DoubleVar(value=0.0)
         
-        # Processing flag
-        self.is_processing = False
+        # Job queue (runs as many jobs at once as CPU cores and memory allow)
+        self.scheduler = JobScheduler()
+        self._job_states = {}
+        self._finished_jobs = []
+        self._queue_busy = False
+        
+        # Preview render and its child process
+        self.preview_running = False
+        self.preview_process = None
+        self.preview_progress = None  # last ProgressEvent of the preview
         
         # Create UI
         self._create_widgets()
         
-        # Redirect stdout to console
-        sys.stdout = TextRedirector(self.console, "stdout")
-        sys.stderr = TextRedirector(self.console, "stderr")
+        # Redirect stdout to console (drained on the Tk main loop)
+        self.console_pump = ConsolePump(self.root, self.console)
+        sys.stdout = TextRedirector(self.console_pump.log_queue, "stdout")
+        sys.stderr = TextRedirector(self.console_pump.log_queue, "stderr")
+        self.console_pump.start()
+        
+        # Closing the window stops a running render instead of orphaning it
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._poll_queue()
         
         # Print welcome message
         self._print_welcome()
+        
+        # Get a worker ready for the first job once the window is up
+        self.root.after(self.WARM_UP_DELAY_MS, self._warm_up)
+    
+    def _warm_up(self):
+        """Start a render worker in the background (keeps the Tk loop responsive)"""
+        threading.Thread(
+            target=self.scheduler.warm_up,
+            kwargs={'preload_whisper': self.caption_mode.get() == "auto"},
+            daemon=True
+        ).start()
     
     def _create_widgets(self):
         """Create all GUI widgets"""
@@ -174,6 +305,28 @@ class ShortsCreatorGUI:
         self.whisper_combo.grid(row=1, column=1, sticky=tk.W, pady=5)
         self.whisper_combo.current(1)  # Default to "base"
         
+        # Transcription backend (how the Whisper model runs)
+        self.backend_label = ttk.Label(caption_frame, text="Transcription:")
+        self.backend_label.grid(row=2, column=0, sticky=tk.W, pady=5)
+        
+        self.backend_combo = ttk.Combobox(
+            caption_frame,
+            textvariable=self.transcription_backend,
+            values=["whisper (reference)", "whisper-int8 (faster on CPU)"],
+            state="readonly",
+            width=25
+        )
+        self.backend_combo.grid(row=2, column=1, sticky=tk.W, pady=5)
+        self.backend_combo.current(0)  # Default to "whisper"
+        
+        # Bypass the transcript cache (for auto captions)
+        self.force_transcribe_check = ttk.Checkbutton(
+            caption_frame,
+            text="Force re-transcribe (ignore cached transcript)",
+            variable=self.force_transcribe
+        )
+        self.force_transcribe_check.grid(row=1, column=2, sticky=tk.W, padx=5, pady=5)
+        
         # Manual Caption Text Entry
         self.manual_caption_label = ttk.Label(caption_frame, text="Caption Text:")
         self.manual_caption_entry = ttk.Entry(caption_frame, textvariable=self.manual_caption_text, width=50)
@@ -185,7 +338,7 @@ class ShortsCreatorGUI:
             font=("Arial", 8),
             foreground="gray"
         )
-        self.caption_info_label.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=5)
+        self.caption_info_label.grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=5)
         
         # ===== OUTPUT SECTION =====
         output_frame = ttk.LabelFrame(main_frame, text="💾 Output Settings", padding="10")
@@ -196,19 +349,72 @@ class ShortsCreatorGUI:
         ttk.Entry(output_frame, textvariable=self.output_path).grid(row=0, column=1, sticky=(tk.W, tk.E), padx=5)
         ttk.Button(output_frame, text="Browse...", command=self._browse_output).grid(row=0, column=2)
         
+        # Render engine selection
+        ttk.Label(output_frame, text="Render Engine:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        self.render_engine_combo = ttk.Combobox(
+            output_frame,
+            textvariable=self.render_engine,
+            values=["numpy (recommended)", "ffmpeg (fastest)", "moviepy (compatibility)"],
+            state="readonly",
+            width=25
+        )
+        self.render_engine_combo.grid(row=1, column=1, sticky=tk.W, padx=5, pady=5)
+        self.render_engine_combo.current(0)  # Default to "numpy"
+        
+        # Extra renditions from the same render pass
+        ttk.Checkbutton(
+            output_frame,
+            text="Also save 720p and preview copies (same render pass)",
+            variable=self.extra_renditions
+        ).grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=5)
+        
+        # Per-stage timing and memory reports
+        ttk.Checkbutton(
+            output_frame,
+            text="Profile render (timing and memory reports next to the output)",
+            variable=self.profile_render
+        ).grid(row=3, column=0, columnspan=3, sticky=tk.W, pady=5)
+        
         # ===== PROGRESS SECTION =====
         progress_frame = ttk.LabelFrame(main_frame, text="⚙️ Processing", padding="10")
         progress_frame.grid(row=4, column=0, sticky=(tk.W, tk.E), pady=5)
         progress_frame.columnconfigure(0, weight=1)
         
         # Progress bar
-        self.progress_bar = ttk.Progressbar(progress_frame, mode='indeterminate')
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate', maximum=100)
         self.progress_bar.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=5)
         
         # Status label
         self.status_label = ttk.Label(progress_frame, text="Ready to create your YouTube Short!", font=("Arial", 9))
         self.status_label.grid(row=1, column=0, sticky=tk.W)
         
+        # Job queue: each "Create" adds a job; several run at once when resources allow
+        self.queue_tree = ttk.Treeview(
+            progress_frame,
+            columns=('job', 'output', 'whisper', 'status', 'progress', 'time'),
+            show='headings',
+            height=4
+        )
+        for column, heading, width in (
+            ('job', '#', 40), ('output', 'Output', 170), ('whisper', 'Whisper', 70),
+            ('status', 'Status', 75), ('progress', 'Progress', 340), ('time', 'Time', 55),
+        ):
+            self.queue_tree.heading(column, text=heading)
+            self.queue_tree.column(column, width=width, stretch=(column == 'progress'))
+        self.queue_tree.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=5)
+        
+        queue_controls = ttk.Frame(progress_frame)
+        queue_controls.grid(row=3, column=0, sticky=tk.W)
+        
+        ttk.Button(queue_controls, text="Cancel Selected", command=self._cancel_selected_jobs).pack(side=tk.LEFT)
+        ttk.Button(queue_controls, text="Clear Finished", command=self._clear_finished_jobs).pack(side=tk.LEFT, padx=5)
+        ttk.Label(
+            queue_controls,
+            text=f"ℹ️ Up to {self.scheduler.max_concurrent} job(s) at once on this computer",
+            font=("Arial", 8),
+            foreground="gray"
+        ).pack(side=tk.LEFT, padx=5)
+        
         # ===== CONSOLE OUTPUT =====
         console_frame = ttk.LabelFrame(main_frame, text="📋 Console Output", padding="10")
         console_frame.grid(row=5, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
@@ -246,6 +452,24 @@ class ShortsCreatorGUI:
         )
         self.create_button.pack(side=tk.LEFT, padx=5)
         
+        self.preview_button = ttk.Button(
+            button_frame,
+            text="👀 Preview",
+            command=self._create_preview
+        )
+        self.preview_button.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(button_frame, text="from").pack(side=tk.LEFT)
+        ttk.Spinbox(
+            button_frame,
+            from_=0,
+            to=3600,
+            increment=5,
+            textvariable=self.preview_start,
+            width=5
+        ).pack(side=tk.LEFT, padx=2)
+        ttk.Label(button_frame, text="s").pack(side=tk.LEFT)
+        
         self.cancel_button = ttk.Button(
             button_frame,
             text="❌ Cancel",
@@ -281,6 +505,9 @@ class ShortsCreatorGUI:
             # Show Whisper model selection
             self.whisper_label.grid(row=1, column=0, sticky=tk.W, pady=5)
             self.whisper_combo.grid(row=1, column=1, sticky=tk.W, pady=5)
+            self.force_transcribe_check.grid(row=1, column=2, sticky=tk.W, padx=5, pady=5)
+            self.backend_label.grid(row=2, column=0, sticky=tk.W, pady=5)
+            self.backend_combo.grid(row=2, column=1, sticky=tk.W, pady=5)
             
             # Hide manual caption entry
             self.manual_caption_label.grid_remove()
@@ -290,12 +517,15 @@ class ShortsCreatorGUI:
             self.caption_info_label.config(
                 text="ℹ️ Auto mode: Transcribes speech from reaction video and creates synced captions"
             )
-            self.caption_info_label.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=5)
+            self.caption_info_label.grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=5)
             
         elif mode == "manual":
             # Hide Whisper model selection
             self.whisper_label.grid_remove()
             self.whisper_combo.grid_remove()
+            self.force_transcribe_check.grid_remove()
+            self.backend_label.grid_remove()
+            self.backend_combo.grid_remove()
             
             # Show manual caption entry
             self.manual_caption_label.grid(row=1, column=0, sticky=tk.W, pady=5)
@@ -305,12 +535,15 @@ class ShortsCreatorGUI:
             self.caption_info_label.config(
                 text="ℹ️ Manual mode: Enter your custom caption text (e.g., 'THE DOG MAN')"
             )
-            self.caption_info_label.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=5)
+            self.caption_info_label.grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=5)
             
         else:  # none
             # Hide both
             self.whisper_label.grid_remove()
             self.whisper_combo.grid_remove()
+            self.force_transcribe_check.grid_remove()
+            self.backend_label.grid_remove()
+            self.backend_combo.grid_remove()
             self.manual_caption_label.grid_remove()
             self.manual_caption_entry.grid_remove()
             
@@ -318,7 +551,7 @@ class ShortsCreatorGUI:
             self.caption_info_label.config(
                 text="ℹ️ No captions will be added to the video"
             )
-            self.caption_info_label.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=5)
+            self.caption_info_label.grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=5)
     
     def _browse_original_video(self):
         """Browse for original video file"""
@@ -372,9 +605,7 @@ class ShortsCreatorGUI:
     
     def _clear_console(self):
         """Clear console output"""
-        self.console.configure(state='normal')
-        self.console.delete(1.0, tk.END)
-        self.console.configure(state='disabled')
+        self.console_pump.clear()
     
     def _open_output_folder(self):
         """Open the output folder in file explorer"""
@@ -426,133 +657,278 @@ class ShortsCreatorGUI:
         return True
     
     def _create_short(self):
-        """Start the video creation process"""
-        if self.is_processing:
-            messagebox.showwarning("Already Processing", "A video is already being created. Please wait.")
-            return
-        
+        """Add a job with the current settings to the queue"""
         # Validate inputs
         if not self._validate_inputs():
             return
         
-        # Confirm before processing
-        response = messagebox.askyesno(
-            "Create YouTube Short",
-            "Ready to create your YouTube Short!\n\n"
-            "This may take several minutes depending on video length.\n\n"
-            "Continue?"
-        )
+        creator_kwargs = self._creator_kwargs()
+        output_path = Path(creator_kwargs['output_path'])
+        for job in self.scheduler.snapshot():
+            if job.status in ('queued', 'running') and job.output_path == output_path:
+                messagebox.showwarning(
+                    "Already Queued",
+                    f"A queued job is already writing to:\n{output_path}\n\n"
+                    "Choose a different output file for this short."
+                )
+                return
         
-        if not response:
+        # Start a fresh console when the queue was idle
+        if not self.scheduler.busy and not self.preview_running:
+            self._clear_console()
+        
+        job = self.scheduler.submit(creator_kwargs)
+        print(f"📥 Queued job #{job.id}: {job.label}")
+        self._refresh_queue()
+    
+    def _create_preview(self):
+        """Start a quick low-resolution preview render"""
+        if self.preview_running:
+            messagebox.showwarning("Already Processing", "A preview is already being rendered. Please wait.")
             return
         
-        # Disable create button and enable cancel
-        self.create_button.config(state='disabled')
-        self.cancel_button.config(state='normal')
-        self.is_processing = True
+        if not self._validate_inputs():
+            return
         
-        # Start progress bar
-        self.progress_bar.start()
-        self.status_label.config(text="Processing... Please wait")
+        try:
+            start = max(0.0, float(self.preview_start.get()))
+        except (tk.TclError, ValueError):
+            messagebox.showerror("Input Error", "Preview start must be a number of seconds")
+            return
         
-        # Clear console
-        self._clear_console()
+        self.preview_button.config(state='disabled')
+        self.preview_running = True
+        self._update_activity()
+        self.status_label.config(text=f"Rendering preview from {start:.0f}s...")
+        if not self.scheduler.busy:
+            self._clear_console()
         
-        # Start processing in separate thread
-        thread = threading.Thread(target=self._process_video, daemon=True)
+        thread = threading.Thread(target=self._process_preview, args=(start,), daemon=True)
         thread.start()
     
-    def _process_video(self):
-        """Process the video (runs in separate thread)"""
+    def _process_preview(self, start):
+        """Render the preview in a child process (runs in separate thread)"""
+        self.preview_process = RenderProcess(self._creator_kwargs(), 'create_preview', {'start': start})
+        self.preview_progress = None
         try:
-            print("=" * 70)
-            print(f"🎬 YouTube Shorts Creator - Started at {datetime.now().strftime('%H:%M:%S')}")
-            print("=" * 70)
-            print()
-            
-            # Get caption settings
-            caption_text = None
-            auto_captions = False
-            whisper_model = "base"
-            
-            mode = self.caption_mode.get()
-            if mode == "auto":
-                auto_captions = True
-                # Extract model name from selection (e.g., "base (recommended)" -> "base")
-                whisper_model = self.whisper_model.get().split()[0]
-            elif mode == "manual":
-                caption_text = self.manual_caption_text.get().strip()
-            
-            # Create shorts creator instance
-            creator = ShortsCreator(
-                original_video_path=self.original_video_path.get(),
-                reaction_video_path=self.reaction_video_path.get(),
-                music_path=self.music_path.get(),
-                caption_text=caption_text,
-                auto_captions=auto_captions,
-                whisper_model=whisper_model,
-                output_path=self.output_path.get()
-            )
-            
-            # Create the short
-            creator.create_short()
-            
-            print()
-            print("=" * 70)
-            print("✅ SUCCESS! Your YouTube Short is ready!")
-            print("=" * 70)
-            
-            # Update UI on success
-            self.root.after(0, self._processing_complete, True)
-            
+            self.preview_process.start()
+            # Read by the Tk loop on its next queue poll
+            preview_path = self.preview_process.wait(progress=lambda event: setattr(self, 'preview_progress', event))
+            self.root.after(0, self._preview_complete, preview_path)
+        except RenderCancelled:
+            self.root.after(0, self._preview_finished, "⏹️ Preview cancelled")
         except Exception as e:
-            print()
-            print("=" * 70)
             print(f"❌ ERROR: {str(e)}")
-            print("=" * 70)
-            
-            # Update UI on error
-            self.root.after(0, self._processing_complete, False, str(e))
-    
-    def _processing_complete(self, success, error_message=None):
-        """Called when processing is complete"""
-        self.is_processing = False
-        self.progress_bar.stop()
-        self.create_button.config(state='normal')
-        self.cancel_button.config(state='disabled')
-        
-        if success:
-            self.status_label.config(text="✅ Video created successfully!")
+            self.root.after(0, self._preview_failed, str(e))
+        finally:
+            self.preview_process = None
+    
+    def _preview_complete(self, preview_path):
+        """Called when a preview render finishes; opens it in the default player"""
+        self._preview_finished(f"👀 Preview ready: {preview_path.name}")
+        os.startfile(preview_path) if sys.platform == 'win32' else os.system(f'open "{preview_path}"')
+    
+    def _preview_failed(self, error_message):
+        """Called when a preview render fails"""
+        self._preview_finished("❌ Error occurred while rendering the preview")
+        messagebox.showerror(
+            "Error",
+            f"An error occurred while rendering the preview:\n\n{error_message}\n\n"
+            "Check the console output for more details."
+        )
+    
+    def _preview_finished(self, status):
+        """Re-enable the preview button and show how the preview ended"""
+        self.preview_running = False
+        self.preview_button.config(state='normal')
+        self.status_label.config(text=status)
+        self._update_activity()
+    
+    def _creator_kwargs(self):
+        """ShortsCreator arguments for the current settings"""
+        # Get caption settings
+        caption_text = None
+        auto_captions = False
+        whisper_model = "base"
+        transcription_backend = "whisper"
+        
+        mode = self.caption_mode.get()
+        if mode == "auto":
+            auto_captions = True
+            # Extract model name from selection (e.g., "base (recommended)" -> "base")
+            whisper_model = self.whisper_model.get().split()[0]
+            transcription_backend = self.transcription_backend.get().split()[0]
+        elif mode == "manual":
+            caption_text = self.manual_caption_text.get().strip()
+        
+        return dict(
+            original_video_path=self.original_video_path.get(),
+            reaction_video_path=self.reaction_video_path.get(),
+            music_path=self.music_path.get(),
+            caption_text=caption_text,
+            auto_captions=auto_captions,
+            whisper_model=whisper_model,
+            transcription_backend=transcription_backend,
+            output_path=self.output_path.get(),
+            force_transcribe=self.force_transcribe.get(),
+            # Extract engine name from selection (e.g., "ffmpeg (fastest)" -> "ffmpeg")
+            render_engine=self.render_engine.get().split()[0],
+            renditions=['720p', 'preview'] if self.extra_renditions.get() else None,
+            profile=self.profile_render.get()
+        )
+    
+    def _poll_queue(self):
+        """Refresh the queue panel (runs on the Tk loop every QUEUE_POLL_MS)"""
+        self._refresh_queue()
+        self.root.after(self.QUEUE_POLL_MS, self._poll_queue)
+    
+    def _refresh_queue(self):
+        """Update the queue panel and status from the scheduler's jobs"""
+        shown = set(self.queue_tree.get_children())
+        for job in self.scheduler.snapshot():
+            iid = str(job.id)
+            elapsed = int(job.elapsed)
+            values = (
+                f"#{job.id}", job.label, job.whisper_model or "-", job.status,
+                self._job_progress_text(job), f"{elapsed // 60}:{elapsed % 60:02d}"
+            )
+            if iid in shown:
+                self.queue_tree.item(iid, values=values)
+                shown.discard(iid)
+            else:
+                self.queue_tree.insert('', tk.END, iid=iid, values=values)
             
-            response = messagebox.showinfo(
+            previous = self._job_states.get(job.id)
+            if job.status != previous:
+                self._job_states[job.id] = job.status
+                self._report_job(job)
+        for iid in shown:
+            self.queue_tree.delete(iid)
+        
+        busy = self.scheduler.busy
+        if busy:
+            jobs = self.scheduler.snapshot()
+            running = sum(1 for job in jobs if job.status == 'running')
+            queued = sum(1 for job in jobs if job.status == 'queued')
+            self.status_label.config(
+                text=f"Processing... {running} running, {queued} queued ({self._overall_percent():.0f}%)"
+            )
+        elif self._queue_busy:
+            self._queue_finished()
+        elif self.preview_running and self.preview_progress is not None:
+            self.status_label.config(text=f"👀 Preview: {self.preview_progress.describe()}")
+        self._queue_busy = busy
+        self._update_activity()
+    
+    def _job_progress_text(self, job):
+        """Progress column text: error, current stage with frames/fps/ETA, or last output line"""
+        if job.error:
+            return job.error
+        if job.status == 'running' and job.progress is not None and not job.cancel_requested:
+            return f"{job.percent:.0f}% · {job.progress.describe()}"
+        return job.stage
+    
+    def _overall_percent(self):
+        """Completion of everything started since the GUI was last idle"""
+        percents = [100.0] * len(self._finished_jobs)
+        percents += [job.percent for job in self.scheduler.snapshot() if job.status in ('queued', 'running')]
+        if self.preview_running:
+            percents.append(self.preview_progress.percent if self.preview_progress is not None else 0.0)
+        return sum(percents) / len(percents) if percents else 0.0
+    
+    def _report_job(self, job):
+        """Print a job's state change to the console"""
+        if job.status == 'running':
+            print(f"🎬 Job #{job.id} started at {datetime.now().strftime('%H:%M:%S')}: {job.label}")
+        elif job.status == 'done':
+            print(f"✅ Job #{job.id} done in {job.elapsed:.0f}s: {job.output_path}")
+        elif job.status == 'failed':
+            print(f"❌ Job #{job.id} failed: {job.error}")
+        elif job.status == 'cancelled':
+            print(f"⏹️ Job #{job.id} cancelled")
+        if job.status in FINISHED_STATES:
+            self._finished_jobs.append(job)
+    
+    def _queue_finished(self):
+        """Called when the last queued job has finished"""
+        finished, self._finished_jobs = self._finished_jobs, []
+        done = [job for job in finished if job.status == 'done']
+        failed = [job for job in finished if job.status == 'failed']
+        cancelled = [job for job in finished if job.status == 'cancelled']
+        summary = f"{len(done)} created, {len(failed)} failed, {len(cancelled)} cancelled"
+        
+        if failed:
+            self.status_label.config(text=f"❌ Queue finished: {summary}")
+            messagebox.showerror(
+                "Error",
+                "Some videos could not be created:\n\n" +
+                "\n".join(f"#{job.id} {job.label}: {job.error}" for job in failed) +
+                "\n\nCheck the console output for more details."
+            )
+        elif done:
+            self.status_label.config(text=f"✅ Queue finished: {summary}")
+            messagebox.showinfo(
                 "Success!",
-                f"Your YouTube Short has been created successfully!\n\n"
-                f"Location: {self.output_path.get()}\n\n"
-                f"Would you like to open the output folder?"
+                f"{len(done)} YouTube Short(s) created successfully!\n\n"
+                f"Location: {done[-1].output_path.parent}"
             )
             
             # Auto-open output folder
             self._open_output_folder()
-            
         else:
-            self.status_label.config(text="❌ Error occurred during processing")
-            messagebox.showerror(
-                "Error",
-                f"An error occurred while creating the video:\n\n{error_message}\n\n"
-                "Check the console output for more details."
-            )
+            self.status_label.config(text=f"⏹️ Queue finished: {summary}")
+    
+    def _update_activity(self):
+        """Show overall progress and enable Cancel while anything is rendering"""
+        active = self.preview_running or self.scheduler.busy
+        self.progress_bar.config(value=self._overall_percent() if active else 0)
+        self.cancel_button.config(state='normal' if active else 'disabled')
     
     def _cancel_processing(self):
-        """Cancel the current processing (not fully implemented due to threading limitations)"""
+        """Stop the preview and every queued and running job"""
+        if not (self.preview_running or self.scheduler.busy):
+            return
+        
         response = messagebox.askyesno(
             "Cancel Processing",
-            "Note: The processing cannot be stopped immediately due to video encoding.\n\n"
-            "You can close this window, but the process will continue in the background.\n\n"
-            "Close the application?"
+            "Stop all running and queued renders?\n\n"
+            "Partly written videos will be deleted."
         )
         
         if response:
-            self.root.quit()
+            preview_process = self.preview_process
+            if preview_process is not None:
+                preview_process.cancel()
+            self.scheduler.cancel_all()
+            self.status_label.config(text="Cancelling...")
+            self._refresh_queue()
+    
+    def _cancel_selected_jobs(self):
+        """Cancel the jobs selected in the queue panel"""
+        selected = set(self.queue_tree.selection())
+        for job in self.scheduler.snapshot():
+            if str(job.id) in selected:
+                self.scheduler.cancel(job)
+        self._refresh_queue()
+    
+    def _clear_finished_jobs(self):
+        """Remove finished jobs from the queue panel"""
+        self.scheduler.clear_finished()
+        self._refresh_queue()
+    
+    def _on_close(self):
+        """Window closed: stop renders and worker processes before quitting"""
+        if self.preview_running or self.scheduler.busy:
+            if not messagebox.askyesno(
+                "Quit",
+                "Videos are still being created.\n\nStop them and quit?"
+            ):
+                return
+        preview_process = self.preview_process
+        if preview_process is not None:
+            preview_process.kill()
+        self.scheduler.shutdown()
+        self.root.destroy()
     
     def _show_help(self):
         """Show help dialog"""
@@ -571,6 +947,13 @@ YouTube Shorts Creator - Help
   - base: Good balance (recommended)
   - small: Better accuracy, slower
   - medium/large: Best accuracy, very slow
+  Transcripts are cached, so re-rendering the same reaction skips Whisper.
+  Tick "Force re-transcribe" to ignore the cached transcript.
+  If shorts_creator_server.py is running, transcription is sent to it, so
+  every open window shares its loaded models.
+• Transcription: "whisper" runs the model as published; "whisper-int8"
+  runs it on the CPU with int8 weights - usually faster on computers
+  without a graphics card, with slightly less accurate words
 
 • Manual Text: Enter your own caption text to display throughout the video
   Example: "THE DOG MAN"
@@ -584,11 +967,38 @@ The final video will be:
 • Yellow captions with black text (if enabled)
 • Audio: Reaction + Background Music (original video is muted)
 
+⚙️ RENDER ENGINE
+• numpy: Fast built-in compositor (recommended)
+• ffmpeg: Renders everything inside ffmpeg - fastest, falls back to
+  numpy automatically if ffmpeg reports an error
+• moviepy: Original MoviePy compositing, for compatibility
+• "Also save 720p and preview copies" writes name_720p.mp4 and
+  name_preview.mp4 next to your short from the same render pass
+• "Profile render" writes a name_profile folder with a .pstats file
+  per stage and summary.txt listing where time and memory went
+
+👀 PREVIEW
+• Click Preview to render a quick 5-second, low-resolution clip starting
+  at the chosen second - handy for checking layout and captions before
+  the full render. It is saved next to your output as name.preview.mp4
+
 ⏱️ PROCESSING TIME
 Video creation typically takes 2-10 minutes depending on:
 • Video length
 • Caption mode (auto-captions take longer)
 • Computer speed
+Cancel stops every render within a frame and deletes the partly written videos.
+
+📥 JOB QUEUE
+• Each click on "Create YouTube Short" adds a job with the current settings
+  to the queue, so you can line up many shorts and change files in between
+• Several jobs run at once when your CPU cores and memory allow it (the
+  Whisper model size counts towards memory)
+• Jobs using the same Whisper model run one after another on the same
+  worker, so the model is loaded only once
+• The Progress column shows each job's current step, frames, speed and time
+  left; the bar above shows progress of everything queued
+• "Cancel Selected" stops the selected jobs; "Clear Finished" tidies the list
 
 💡 TIPS
 • Use high-quality video files for best results
@@ -654,6 +1064,8 @@ Console output will appear here during processing.
 
 def main():
     """Main entry point"""
+    # Worker processes (segmented rendering) re-launch the frozen executable
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = ShortsCreatorGUI(root)
     root.mainloop()
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+YouTube Shorts Creator - Job Control
+Cancellation and job-size limits shared by the render stack and the processes
+that schedule it; standard library only, so the GUI, queue and batch runner
+can use them without importing moviepy, numpy or Pillow
+"""
+
+
+# Variants encoded together in one decode pass (each adds a decoder, an
+# encoder and ~1 GB of memory)
+MAX_OUTPUTS_PER_PASS = 4
+
+
+class RenderCancelled(Exception):
+    """The job was cancelled before it finished"""
+
+
+def check_cancelled(cancel_event):
+    """Raise RenderCancelled if cancel_event (a threading/multiprocessing Event) is set"""
+    if cancel_event is not None and cancel_event.is_set():
+        raise RenderCancelled("Render cancelled")
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+YouTube Shorts Creator - Render Processes
+Runs ShortsCreator jobs in child processes that can be cancelled at any time
+"""
+
+import importlib
+import multiprocessing
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from shorts_creator_progress import ProgressEvent
+from shorts_creator_jobs import RenderCancelled
+from shorts_creator_transcribe import get_model_pool, estimate_model_memory_mb, DEFAULT_BACKEND
+
+
+# Seconds a cancelled job gets to stop at its next checkpoint before it is killed
+CANCEL_GRACE_SECONDS = 3.0
+
+
+def job_model_key(creator_kwargs):
+    """
+    (Whisper model, transcription backend) a ShortsCreator job loads, or
+    None if it does not transcribe; the same model on another backend is
+    a different model in memory
+    """
+    if creator_kwargs.get('auto_captions', True) and not creator_kwargs.get('caption_text'):
+        return (creator_kwargs.get('whisper_model', 'base'),
+                creator_kwargs.get('transcription_backend', DEFAULT_BACKEND))
+    return None
+
+
+def write_output(stream, text):
+    """Default output relay: write a child's text to this process's stdout/stderr"""
+    (sys.stderr if stream == 'stderr' else sys.stdout).write(text)
+
+
+class _QueueWriter:
+    """File-like object that forwards a child's prints to the parent process"""
+
+    def __init__(self, output_queue, stream):
+        self.output_queue = output_queue
+        self.stream = stream
+
+    def write(self, text):
+        if text:
+            self.output_queue.put((self.stream, text))
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def _job_outputs(creator, method, method_kwargs):
+    """Files a job writes, so a cancelled job's partial files can be removed"""
+    if method == 'create_preview':
+        return [creator.preview_path(method_kwargs.get('output_path'))]
+    return [creator.output_path] + [rendition['output_path'] for rendition in creator.renditions]
+
+
+def _warm_up(preload_whisper=False):
+    """
+    Import the render stack (and Whisper, which pulls in torch) ahead of the
+    first job; a worker does this while it is idle, so the importing
+    process (e.g. the GUI) never pays for it
+    """
+    try:
+        importlib.import_module('shorts_creator_core')
+        if preload_whisper:
+            importlib.import_module('whisper')
+    except Exception:
+        # Left for the first job that needs it to report
+        pass
+
+
+def _run_job(creator_kwargs, method, method_kwargs, output_queue, cancel_event):
+    """Run one job inside a worker and report how it ended"""
+    try:
+        from shorts_creator_core import ShortsCreator
+        model_key = job_model_key(creator_kwargs)
+        if model_key is not None:
+            # One warm model per worker: a job needing another model or backend replaces it
+            get_model_pool().set_memory_budget(estimate_model_memory_mb(model_key[0]))
+        creator = ShortsCreator(
+            cancel_event=cancel_event,
+            progress=lambda event: output_queue.put(('progress', event.as_dict())),
+            **creator_kwargs
+        )
+        output_queue.put(('outputs', [str(path) for path in _job_outputs(creator, method, method_kwargs)]))
+        result = getattr(creator, method)(**method_kwargs)
+        output_queue.put(('done', result))
+    except RenderCancelled:
+        print("⏹️ Render cancelled")
+        output_queue.put(('cancelled', None))
+    except Exception as e:
+        output_queue.put(('error', f"{type(e).__name__}: {e}"))
+
+
+class _ParentWatchEvent:
+    """
+    A worker's cancel event that also counts as set once the parent is gone
+    Jobs poll it at every cancellation checkpoint (between stages, before each
+    frame), so a job whose GUI crashed stops there instead of rendering on as
+    an orphan
+    """
+
+    def __init__(self, cancel_event, parent):
+        self.cancel_event = cancel_event
+        self.parent = parent
+
+    def is_set(self):
+        return self.cancel_event.is_set() or not self.parent.is_alive()
+
+
+def _worker_main(inbox, output_queue, cancel_event, temp_dir, preload_whisper=False):
+    """Child-process entry point: run jobs from inbox until it yields None"""
+    if hasattr(os, 'setsid'):
+        # Own process group, so a kill also reaches ffmpeg and segment workers
+        os.setsid()
+    # Every temp file of a job (ours, ffmpeg's, workers') lands in temp_dir
+    for name in ('TMPDIR', 'TEMP', 'TMP'):
+        os.environ[name] = temp_dir
+    tempfile.tempdir = temp_dir
+    sys.stdout = _QueueWriter(output_queue, 'stdout')
+    sys.stderr = _QueueWriter(output_queue, 'stderr')
+    _warm_up(preload_whisper)
+
+    parent = multiprocessing.parent_process()
+    job_cancel_event = _ParentWatchEvent(cancel_event, parent)
+    while parent.is_alive():
+        try:
+            job = inbox.get(timeout=1.0)
+        except queue.Empty:
+            continue
+        if job is None:
+            return
+        _run_job(*job, output_queue, job_cancel_event)
+
+    # The parent is gone (e.g. after a crash): a worker must not outlive it,
+    # and nobody is left to read our output or remove temp_dir
+    output_queue.cancel_join_thread()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class RenderWorker:
+    """
+    A child process that runs ShortsCreator jobs one after another
+
+    The worker keeps its Whisper model loaded between jobs (one model at a
+    time), so consecutive jobs with the same model skip the reload. It
+    imports the render stack (and optionally Whisper) as soon as it starts,
+    so a worker started ahead of time takes jobs without import delay.
+
+    cancel() asks the running job to stop at its next checkpoint (between
+    stages, or before the next frame while rendering) and kills the worker's
+    whole process tree, ffmpeg included, if the job is still running
+    CANCEL_GRACE_SECONDS later. A cancelled job's partial output is deleted,
+    and the worker's temp directory is removed once the worker is gone.
+
+    Usage:
+        worker = RenderWorker()
+        worker.start()
+        output = worker.run(creator_kwargs)  # relays the job's prints
+        worker.stop()
+    """
+
+    def __init__(self):
+        # 'spawn' keeps the child independent of the parent's threads (GUI, pools)
+        self._context = multiprocessing.get_context('spawn')
+        self._cancel_event = self._context.Event()
+        self._inbox = self._context.Queue()
+        self._output = self._context.Queue()
+        self._process = None
+        self._temp_dir = None
+        self._kill_timer = None
+        self._lock = threading.Lock()
+        self._busy = False
+        self._job_id = 0
+        self._job_cancelled = False
+        self._job_outputs = []
+        self._job_started_at = None
+
+    @property
+    def alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    def start(self, preload_whisper=False):
+        """Start the worker process (preload_whisper: also import Whisper and torch up front)"""
+        self._temp_dir = tempfile.mkdtemp(prefix='shorts_job_')
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(self._inbox, self._output, self._cancel_event, self._temp_dir, preload_whisper)
+        )
+        self._process.start()
+
+    def run(self, creator_kwargs, method='create_short', method_kwargs=None, output=write_output,
+            progress=None):
+        """Run a ShortsCreator method in the worker and wait for it (submit + wait)"""
+        self.submit(creator_kwargs, method, method_kwargs)
+        return self.wait(output, progress)
+
+    def submit(self, creator_kwargs, method='create_short', method_kwargs=None):
+        """Hand the worker its next job; from now on cancel() applies to it"""
+        if not self.alive:
+            raise RuntimeError("Render worker is not running")
+        with self._lock:
+            if self._busy:
+                raise RuntimeError("Render worker is already running a job")
+            self._busy = True
+            self._job_id += 1
+            self._job_outputs = []
+            self._job_started_at = time.time()
+        self._inbox.put((dict(creator_kwargs), method, dict(method_kwargs or {})))
+
+    def wait(self, output=write_output, progress=None):
+        """
+        Wait for the submitted job, passing its prints to output(stream, text)
+        and its ProgressEvents to progress(event)
+        Returns the method's result; raises RenderCancelled if the job was
+        cancelled and RuntimeError if it failed or the worker died
+        """
+        outcome = None
+        try:
+            exited = False
+            while outcome is None:
+                try:
+                    kind, payload = self._output.get(timeout=0.2)
+                except queue.Empty:
+                    # One more read after exit picks up anything still in the pipe
+                    if self._process.is_alive() or not exited:
+                        exited = not self._process.is_alive()
+                        continue
+                    break
+                if kind in ('stdout', 'stderr'):
+                    output(kind, payload)
+                elif kind == 'progress':
+                    if progress is not None:
+                        progress(ProgressEvent(**payload))
+                elif kind == 'outputs':
+                    self._job_outputs = payload
+                else:
+                    outcome = (kind, payload)
+        finally:
+            with self._lock:
+                cancelled = self._job_cancelled
+                self._busy = False
+                self._job_cancelled = False
+                if self._kill_timer is not None:
+                    self._kill_timer.cancel()
+                    self._kill_timer = None
+                self._cancel_event.clear()
+            if outcome is None:
+                # The worker died (killed after a cancel, or crashed)
+                self._process.join()
+                self._cleanup(killed=cancelled)
+
+        if outcome is not None and outcome[0] == 'done':
+            return outcome[1]
+        if cancelled or (outcome is not None and outcome[0] == 'cancelled'):
+            self._remove_partial_outputs()
+            raise RenderCancelled("Render cancelled")
+        if outcome is not None:
+            raise RuntimeError(outcome[1])
+        raise RuntimeError(f"Render process exited unexpectedly (exit code {self._process.exitcode})")
+
+    def cancel(self, grace=CANCEL_GRACE_SECONDS):
+        """Ask the running job to stop; kill the worker if it is still running after grace seconds"""
+        with self._lock:
+            if not self._busy or self._job_cancelled:
+                return
+            self._job_cancelled = True
+            self._cancel_event.set()
+            self._kill_timer = threading.Timer(grace, self._kill_after_grace, args=(self._job_id,))
+            self._kill_timer.daemon = True
+            self._kill_timer.start()
+
+    def kill(self):
+        """Stop the worker and its job right away (e.g. when the application is closing)"""
+        if self._process is None:
+            return
+        with self._lock:
+            self._job_cancelled = self._busy
+            self._cancel_event.set()
+        self._kill_tree()
+        self._process.join(timeout=5)
+        self._cleanup(killed=True)
+        self._remove_partial_outputs()
+
+    def stop(self, timeout=10):
+        """Let the worker exit after its current job and remove its temp directory"""
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            self._inbox.put(None)
+            self._process.join(timeout)
+        killed = self._process.is_alive()
+        if killed:
+            self._kill_tree()
+            self._process.join()
+        self._cleanup(killed=killed)
+
+    def _kill_after_grace(self, job_id):
+        """Kill a worker whose cancelled job has not reached a checkpoint in time"""
+        # The timer may fire just as the job ends: only kill while that job is
+        # still running, never a worker that went idle or took the next job
+        with self._lock:
+            if not self._busy or self._job_id != job_id or self._process.exitcode is not None:
+                return
+            print("⏹️ Job did not stop in time, killing it...")
+            self._kill_tree()
+
+    def _kill_tree(self):
+        """Kill the worker and everything it started (ffmpeg, segment workers)"""
+        if self._process.exitcode is not None:
+            return
+        if sys.platform == 'win32':
+            subprocess.run(
+                ['taskkill', '/F', '/T', '/PID', str(self._process.pid)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                creationflags=subprocess.CREATE_NO_WINDOW
+            )
+        else:
+            try:
+                os.killpg(self._process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+    def _cleanup(self, killed=False):
+        """Remove the temp directory of a worker that has exited"""
+        if killed and hasattr(os, 'killpg'):
+            # Anything of the worker's process group that outlived it
+            try:
+                os.killpg(self._process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+    def _remove_partial_outputs(self):
+        """Delete output files the cancelled job had started writing"""
+        outputs, self._job_outputs = self._job_outputs, []
+        for output in outputs:
+            path = Path(output)
+            try:
+                if path.stat().st_mtime >= self._job_started_at:
+                    path.unlink()
+                    print(f"🗑️ Removed partial output: {path}")
+            except OSError:
+                pass
+
+
+class RenderProcess:
+    """
+    One ShortsCreator job in its own RenderWorker, stopped when the job ends
+
+    Usage:
+        job = RenderProcess(creator_kwargs)
+        job.start()
+        output = job.wait()  # relays the job's prints; raises RenderCancelled
+    """
+
+    def __init__(self, creator_kwargs, method='create_short', method_kwargs=None):
+        """
+        Args:
+            creator_kwargs: ShortsCreator constructor arguments (must be picklable)
+            method: ShortsCreator method to run (create_short or create_preview)
+            method_kwargs: Arguments for that method
+        """
+        self.creator_kwargs = dict(creator_kwargs)
+        self.method = method
+        self.method_kwargs = dict(method_kwargs or {})
+        self.worker = RenderWorker()
+
+    def start(self):
+        """Start the child process and its job"""
+        self.worker.start()
+        self.worker.submit(self.creator_kwargs, self.method, self.method_kwargs)
+
+    def wait(self, progress=None):
+        """Wait for the job (see RenderWorker.wait)"""
+        try:
+            return self.worker.wait(progress=progress)
+        finally:
+            self.worker.stop()
+
+    def cancel(self, grace=CANCEL_GRACE_SECONDS):
+        """Ask the job to stop, killing its process tree after grace seconds"""
+        self.worker.cancel(grace)
+
+    def kill(self):
+        """Stop the job right away"""
+        self.worker.kill()
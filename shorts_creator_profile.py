@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+YouTube Shorts Creator - Profiling
+Per-stage cProfile and tracemalloc reports for finding where a slow render
+spends its time and memory
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+
+# Rows per stage in the summary report
+TOP_FUNCTIONS = 15
+TOP_ALLOCATIONS = 10
+
+# Keep the profiler's own bookkeeping out of the allocation report
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+)
+
+# Since Python 3.12 one enabled profiler sees every thread; before that each
+# thread needs its own
+PROFILER_COVERS_THREADS = sys.version_info >= (3, 12)
+
+
+class StageProfiler:
+    """
+    Profiles each stage of a render with cProfile and tracemalloc
+
+    The progress reporter calls start_stage()/end_stage() around every
+    stage. Each stage gets a <NN>_<stage>.pstats file in report_dir (open
+    it with pstats or snakeviz), and write_summary() writes summary.txt
+    with the top functions and allocation sites of every stage.
+
+    Threads started during a stage (pipeline decoders, encoder feeders,
+    caption renderers) are profiled too; work in ffmpeg and worker
+    processes shows up only as time spent waiting for them.
+    """
+
+    def __init__(self, report_dir):
+        self.report_dir = Path(report_dir)
+        self.stages = []
+        self._current = None
+        self._thread_profiles = []
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    def start_stage(self, name):
+        """Start profiling a stage (a stage started inside another is left to the outer one)"""
+        if self._current is not None:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._current = {
+            'name': name,
+            'memory_start': tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS),
+            'started': time.perf_counter(),
+            'profile': cProfile.Profile(),
+        }
+        if not PROFILER_COVERS_THREADS:
+            self._thread_profiles = []
+            threading.setprofile(self._profile_thread)
+        self._current['profile'].enable()
+
+    def _profile_thread(self, frame, event, arg):
+        """threading.setprofile hook: give each new thread its own profiler"""
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        with self._lock:
+            self._thread_profiles.append(profile)
+        profile.enable()
+
+    def end_stage(self, name):
+        """Stop profiling the current stage and save its .pstats file"""
+        current = self._current
+        if current is None or current['name'] != name:
+            return
+        current['profile'].disable()
+        if not PROFILER_COVERS_THREADS:
+            threading.setprofile(None)
+        seconds = time.perf_counter() - current['started']
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        memory_end = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        self._current = None
+
+        stats = pstats.Stats(current['profile'])
+        with self._lock:
+            thread_profiles, self._thread_profiles = self._thread_profiles, []
+        for profile in thread_profiles:
+            profile.create_stats()
+            if profile.stats:
+                stats.add(profile)
+
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        stats_path = self.report_dir / f"{len(self.stages) + 1:02d}_{name}.pstats"
+        stats.dump_stats(str(stats_path))
+        self.stages.append({
+            'name': name,
+            'seconds': seconds,
+            'peak_mb': peak_bytes / (1024 * 1024),
+            'stats_path': stats_path,
+            'stats': stats,
+            'allocations': memory_end.compare_to(current['memory_start'], 'lineno')[:TOP_ALLOCATIONS],
+        })
+
+    def write_summary(self):
+        """Write summary.txt for the profiled stages; returns its path (None if nothing ran)"""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if not self.stages:
+            return None
+
+        lines = [
+            "YouTube Shorts Creator - render profile",
+            "Function times are summed over all threads of a stage, so threads",
+            "waiting on each other show up as time in lock acquire/wait.",
+            "",
+        ]
+        lines.append(f"{'Stage':<16}{'Wall time':>12}{'Peak traced':>14}")
+        for stage in self.stages:
+            lines.append(f"{stage['name']:<16}{stage['seconds']:>11.2f}s{stage['peak_mb']:>11.1f} MB")
+
+        for stage in self.stages:
+            lines += ["", "=" * 78, f"{stage['name']} ({stage['seconds']:.2f}s) - {stage['stats_path'].name}", "=" * 78]
+            for sort_key, title in (('tottime', "Top functions by own time"),
+                                    ('cumulative', "Top functions by cumulative time")):
+                output = io.StringIO()
+                stage['stats'].stream = output
+                stage['stats'].sort_stats(sort_key).print_stats(TOP_FUNCTIONS)
+                # Skip pstats' preamble (file name, call counts) up to the table
+                table = output.getvalue()
+                table = table[table.find('   ncalls'):] if '   ncalls' in table else table
+                lines += ["", f"{title}:", table.rstrip()]
+            lines += ["", "Top allocation sites (memory still held at the end of the stage):"]
+            for difference in stage['allocations']:
+                frame = difference.traceback[0]
+                lines.append(
+                    f"  {difference.size_diff / 1024:>10.1f} KB  {difference.count_diff:>+8} blocks  "
+                    f"{frame.filename}:{frame.lineno}"
+                )
+
+        summary_path = self.report_dir / 'summary.txt'
+        summary_path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        return summary_path
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+YouTube Shorts Creator - Progress Events
+Typed per-stage progress and timing events (wall time, frames, fps, ETA,
+peak memory) for the GUI progress bar and batch metrics
+"""
+
+import sys
+import threading
+import time
+
+
+# Stages of a render, in the order they run
+STAGES = ('probe', 'model_load', 'transcription', 'caption_build', 'composite', 'encode', 'mux')
+
+STAGE_LABELS = {
+    'probe': 'Reading inputs',
+    'model_load': 'Loading Whisper model',
+    'transcription': 'Transcribing',
+    'caption_build': 'Building captions',
+    'composite': 'Compositing layout',
+    'encode': 'Encoding',
+    'mux': 'Muxing audio',
+}
+
+# Rough share of a typical job's wall time, used for the overall percentage
+STAGE_WEIGHTS = {
+    'probe': 2,
+    'model_load': 8,
+    'transcription': 20,
+    'caption_build': 3,
+    'composite': 2,
+    'encode': 60,
+    'mux': 5,
+}
+
+# Event kinds
+STAGE_START = 'stage_start'
+STAGE_PROGRESS = 'stage_progress'
+STAGE_END = 'stage_end'
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, in MB (None if unknown)"""
+    if sys.platform == 'win32':
+        import ctypes
+
+        class MemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ('cb', ctypes.c_ulong), ('PageFaultCount', ctypes.c_ulong),
+                ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        counters = MemoryCounters()
+        counters.cb = ctypes.sizeof(MemoryCounters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return round(counters.PeakWorkingSetSize / (1024 * 1024), 1)
+        return None
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KB elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class ProgressEvent:
+    """
+    One progress report from a running job
+
+    kind is STAGE_START, STAGE_PROGRESS or STAGE_END; elapsed is the stage's
+    wall time so far and percent the whole job's estimated completion.
+    Frame counts, fps and eta (seconds) are set for frame-based stages
+    (encode) and None otherwise.
+    """
+
+    def __init__(self, kind, stage, elapsed, percent, frames_done=None, frames_total=None,
+                 fps=None, eta=None, peak_rss_mb=None, time=None):
+        self.kind = kind
+        self.stage = stage
+        self.elapsed = elapsed
+        self.percent = percent
+        self.frames_done = frames_done
+        self.frames_total = frames_total
+        self.fps = fps
+        self.eta = eta
+        self.peak_rss_mb = peak_rss_mb
+        self.time = time
+
+    def as_dict(self):
+        """Plain dict (JSON-serializable, and ProgressEvent(**d) rebuilds the event)"""
+        return dict(vars(self))
+
+    def describe(self):
+        """Short human-readable status line"""
+        label = STAGE_LABELS.get(self.stage, self.stage)
+        if self.kind == STAGE_END:
+            return f"{label}: done in {self.elapsed:.1f}s"
+        text = label
+        if self.frames_total:
+            text += f" {self.frames_done}/{self.frames_total} frames"
+        if self.fps:
+            text += f" · {self.fps:.1f} fps"
+        if self.eta is not None:
+            text += f" · ETA {format_seconds(self.eta)}"
+        return text
+
+
+def format_seconds(seconds):
+    """m:ss for short durations"""
+    seconds = int(round(seconds))
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+class _Stage:
+    """A running stage; update() reports frames done (throttled)"""
+
+    def __init__(self, reporter, name, frames_total):
+        self.reporter = reporter
+        self.name = name
+        self.frames_total = frames_total
+        self.frames_done = 0
+        self.started = time.perf_counter()
+        self._last_report = self.started
+        self._last_frames = 0
+        self._lock = threading.Lock()
+
+    def update(self, frames_done):
+        """Record frames_done (since the stage started); may be called from any thread"""
+        with self._lock:
+            self.frames_done = frames_done
+            now = time.perf_counter()
+            if now - self._last_report < self.reporter.min_interval:
+                return
+            fps = (frames_done - self._last_frames) / (now - self._last_report)
+            self._last_report = now
+            self._last_frames = frames_done
+        self.reporter._emit(STAGE_PROGRESS, self, fps=fps)
+
+    def fraction(self):
+        if not self.frames_total:
+            return 0.0
+        return min(1.0, self.frames_done / self.frames_total)
+
+    def eta(self):
+        """Seconds left at the stage's average frame rate so far"""
+        elapsed = time.perf_counter() - self.started
+        if not self.frames_total or not self.frames_done or elapsed <= 0:
+            return None
+        return (self.frames_total - self.frames_done) / (self.frames_done / elapsed)
+
+
+class ProgressReporter:
+    """
+    Turns a job's stages into ProgressEvents for a callback
+
+    Usage:
+        reporter = ProgressReporter(callback)
+        reporter.plan(['probe', 'composite', 'encode', 'mux'])
+        with reporter.stage('encode', frames_total=900) as stage:
+            for frame_index in range(900):
+                ...
+                stage.update(frame_index + 1)
+
+    Stages left out of plan() do not count towards the percentage; planned
+    stages that turn out not to be needed (e.g. transcription on a cache
+    hit) are marked done with skip(). A stage may run more than once (per
+    variant, or mux before and after encoding).
+    Progress updates are sent at most every min_interval seconds; start and
+    end events always are. Without a callback nothing is measured.
+
+    A profiler (see StageProfiler) gets start_stage()/end_stage() calls
+    around every stage, whether it succeeds or not.
+    """
+
+    def __init__(self, callback=None, min_interval=0.5, profiler=None):
+        self.callback = callback
+        self.min_interval = min_interval
+        self.profiler = profiler
+        self._planned = STAGES
+        self._fractions = {}
+        self._percent = 0.0
+        self._lock = threading.Lock()
+
+    def plan(self, stages):
+        """Set the stages this job will run (restarts the percentage)"""
+        with self._lock:
+            self._planned = tuple(stage for stage in STAGES if stage in stages)
+            self._fractions = {}
+            self._percent = 0.0
+
+    def skip(self, *stages):
+        """Count planned stages that will not run as done"""
+        with self._lock:
+            for stage in stages:
+                self._fractions[stage] = 1.0
+
+    def stage(self, name, frames_total=None):
+        """Context manager for one stage; emits its start and (on success) end event"""
+        return _StageContext(self, name, frames_total)
+
+    def _job_percent(self, stage, fraction):
+        """Whole-job completion with this stage fraction done (never goes backwards)"""
+        with self._lock:
+            self._fractions[stage] = max(fraction, self._fractions.get(stage, 0.0))
+            total = sum(STAGE_WEIGHTS[name] for name in self._planned)
+            done = sum(STAGE_WEIGHTS[name] * self._fractions.get(name, 0.0) for name in self._planned)
+            if total:
+                self._percent = max(self._percent, 100.0 * done / total)
+            return round(self._percent, 1)
+
+    def _emit(self, kind, stage, fps=None):
+        if self.callback is None:
+            return
+        fraction = 1.0 if kind == STAGE_END else stage.fraction()
+        elapsed = time.perf_counter() - stage.started
+        if kind == STAGE_END and stage.frames_total and elapsed > 0:
+            # Average rate over the whole stage
+            fps = stage.frames_done / elapsed
+        eta = stage.eta() if kind == STAGE_PROGRESS else None
+        event = ProgressEvent(
+            kind, stage.name,
+            elapsed=round(elapsed, 3),
+            percent=self._job_percent(stage.name, fraction),
+            frames_done=stage.frames_done if stage.frames_total else None,
+            frames_total=stage.frames_total,
+            fps=round(fps, 1) if fps is not None else None,
+            eta=round(eta, 1) if eta is not None else None,
+            peak_rss_mb=peak_rss_mb(),
+            time=round(time.time(), 3)
+        )
+        self.callback(event)
+
+
+class _StageContext:
+    """Times one stage: start event on entry, end event on a clean exit"""
+
+    def __init__(self, reporter, name, frames_total):
+        self.reporter = reporter
+        self.name = name
+        self.frames_total = frames_total
+        self.stage = None
+
+    def __enter__(self):
+        self.stage = _Stage(self.reporter, self.name, self.frames_total)
+        self.reporter._emit(STAGE_START, self.stage)
+        if self.reporter.profiler is not None:
+            self.reporter.profiler.start_stage(self.name)
+        return self.stage
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.reporter.profiler is not None:
+            self.reporter.profiler.end_stage(self.name)
+        if exc_type is None:
+            if self.stage.frames_total:
+                self.stage.frames_done = self.stage.frames_total
+            self.reporter._emit(STAGE_END, self.stage)
+        return False
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+YouTube Shorts Creator - Job Queue
+Runs many queued shorts concurrently on warm worker processes, within the
+machine's CPU and memory limits
+"""
+
+import itertools
+import os
+import threading
+import time
+from pathlib import Path
+
+from shorts_creator_batch import CORES_PER_JOB, RENDER_MEMORY_MB, available_memory_mb
+from shorts_creator_process import RenderWorker, job_model_key, write_output
+from shorts_creator_jobs import RenderCancelled
+from shorts_creator_transcribe import estimate_model_memory_mb
+
+
+# Jobs in these states will not change again
+FINISHED_STATES = ('done', 'failed', 'cancelled')
+
+
+class QueuedJob:
+    """One short in the queue and its current state"""
+
+    def __init__(self, job_id, creator_kwargs, label=None):
+        self.id = job_id
+        self.creator_kwargs = dict(creator_kwargs)
+        self.label = label or Path(creator_kwargs['output_path']).name
+        # (Whisper model, backend) the job loads, or None (see job_model_key)
+        self.model_key = job_model_key(self.creator_kwargs)
+        self.whisper_model = self.model_key[0] if self.model_key else None
+        self.status = 'queued'  # queued, running, done, failed, cancelled
+        self.stage = ''  # last line the job printed
+        self.progress = None  # last ProgressEvent
+        self.error = None
+        self.started = None
+        self.finished = None
+        self.cancel_requested = False
+
+    @property
+    def output_path(self):
+        return Path(self.creator_kwargs['output_path'])
+
+    @property
+    def percent(self):
+        """Estimated completion, 0-100"""
+        if self.status in FINISHED_STATES:
+            return 100.0
+        return self.progress.percent if self.progress is not None else 0.0
+
+    @property
+    def elapsed(self):
+        """Seconds the job has been running (or ran)"""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+
+class _JobOutput:
+    """Relays a job's output a line at a time, tagged with the job number"""
+
+    def __init__(self, job, write):
+        self.job = job
+        self.write = write
+        self._partial = {'stdout': '', 'stderr': ''}
+
+    def __call__(self, stream, text):
+        *lines, self._partial[stream] = (self._partial[stream] + text).split('\n')
+        for line in lines:
+            self._emit(stream, line)
+
+    def flush(self):
+        for stream, line in self._partial.items():
+            if line:
+                self._emit(stream, line)
+            self._partial[stream] = ''
+
+    def _emit(self, stream, line):
+        # Carriage returns redraw a progress line; only its latest state matters
+        latest = line.split('\r')[-1].strip()
+        if latest:
+            self.job.stage = latest
+        self.write(stream, f"[#{self.job.id}] {line}\n")
+
+
+class _Slot:
+    """One concurrency slot: a worker process, the model it holds and its job"""
+
+    def __init__(self):
+        self.worker = None
+        self.model_key = None  # (Whisper model, backend) loaded in the worker
+        self.job = None
+
+    def resident_mb(self):
+        """Memory this slot is using: its loaded model plus a render if busy"""
+        memory_mb = estimate_model_memory_mb(self.model_key[0]) if self.model_key else 0
+        if self.job is not None:
+            memory_mb += RENDER_MEMORY_MB
+        return memory_mb
+
+
+class JobScheduler:
+    """
+    Runs queued ShortsCreator jobs concurrently on worker processes
+
+    At most max_concurrent jobs run at once (CPU cores / CORES_PER_JOB, as in
+    batch mode), and a job only starts if its render plus any Whisper model
+    it has to load fits in the memory that was free when the scheduler was
+    created (one job may always run). Each slot keeps its worker process,
+    and so its loaded Whisper model, between jobs. A free slot first takes
+    the oldest queued job that needs the model it already holds, then the
+    oldest job whose model no busy slot holds, so jobs sharing a model run
+    back to back on one worker without reloading it.
+
+    Methods may be called from any thread; read job state via snapshot().
+    """
+
+    def __init__(self, max_concurrent=None, memory_mb=None, output=write_output):
+        """
+        Args:
+            max_concurrent: Jobs run at once (default: from CPU cores)
+            memory_mb: Memory the jobs may use (default: currently available)
+            output: Called as output(stream, text) with every job's tagged output lines
+        """
+        self.max_concurrent = max_concurrent or max(1, (os.cpu_count() or 1) // CORES_PER_JOB)
+        self.memory_mb = memory_mb if memory_mb is not None else available_memory_mb()
+        self.output = output
+        self.jobs = []
+        self._slots = [_Slot() for _ in range(self.max_concurrent)]
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._closed = False
+
+    def submit(self, creator_kwargs, label=None):
+        """Queue a job (ShortsCreator constructor arguments); returns its QueuedJob"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The job queue has been shut down")
+            job = QueuedJob(next(self._ids), creator_kwargs, label)
+            self.jobs.append(job)
+            self._schedule()
+            return job
+
+    def warm_up(self, preload_whisper=False):
+        """
+        Start one idle worker ahead of the first job, so the render stack
+        (and with preload_whisper, Whisper and torch) is imported by then
+        """
+        with self._lock:
+            if self._closed or any(slot.worker is not None for slot in self._slots):
+                return
+            slot = self._slots[0]
+            slot.worker = RenderWorker()
+            slot.worker.start(preload_whisper=preload_whisper)
+
+    def cancel(self, job):
+        """Cancel a queued or running job"""
+        with self._lock:
+            if job.status == 'queued':
+                job.status = 'cancelled'
+                job.finished = time.time()
+            elif job.status == 'running' and not job.cancel_requested:
+                job.cancel_requested = True
+                job.stage = 'Cancelling...'
+                for slot in self._slots:
+                    if slot.job is job:
+                        slot.worker.cancel()
+
+    def cancel_all(self):
+        """Cancel every queued and running job"""
+        with self._lock:
+            for job in self.jobs:
+                self.cancel(job)
+
+    def clear_finished(self):
+        """Drop finished jobs from the list"""
+        with self._lock:
+            self.jobs = [job for job in self.jobs if job.status not in FINISHED_STATES]
+
+    def snapshot(self):
+        """Current jobs, oldest first"""
+        with self._lock:
+            return list(self.jobs)
+
+    @property
+    def busy(self):
+        """Whether any job is queued or running"""
+        with self._lock:
+            return any(job.status in ('queued', 'running') for job in self.jobs)
+
+    def shutdown(self):
+        """Cancel queued jobs, kill running ones and stop every worker process"""
+        with self._lock:
+            self._closed = True
+            for job in self.jobs:
+                if job.status == 'queued':
+                    self.cancel(job)
+            workers = [(slot.worker, slot.job is not None) for slot in self._slots if slot.worker]
+            for slot in self._slots:
+                slot.worker = None
+                slot.model_key = None
+        for worker, running in workers:
+            if running:
+                worker.kill()
+            else:
+                worker.stop()
+
+    def _reserved_mb(self):
+        """Memory held by every slot's model and running render"""
+        return sum(slot.resident_mb() for slot in self._slots)
+
+    def _extra_mb(self, job, slot):
+        """Additional memory needed to run job on slot"""
+        extra_mb = RENDER_MEMORY_MB
+        if job.model_key is not None and job.model_key != slot.model_key:
+            # The slot's worker swaps its current model for the job's
+            extra_mb += estimate_model_memory_mb(job.model_key[0])
+            if slot.model_key:
+                extra_mb -= estimate_model_memory_mb(slot.model_key[0])
+        return extra_mb
+
+    def _fits(self, job, slot):
+        """Whether job can start on slot within the memory limit"""
+        if self.memory_mb is None or all(other.job is None for other in self._slots):
+            return True
+        return self._reserved_mb() + self._extra_mb(job, slot) <= self.memory_mb
+
+    def _pick(self):
+        """Next (job, slot) pair to start, or None"""
+        queued = [job for job in self.jobs if job.status == 'queued']
+        idle = [slot for slot in self._slots if slot.job is None]
+        if not queued or not idle:
+            return None
+        # Keep warm models busy before loading new ones
+        for job in queued:
+            for slot in idle:
+                if job.model_key is not None and slot.model_key == job.model_key:
+                    return job, slot
+        # Leave jobs whose model a busy slot holds for that slot, if another job can go first
+        busy_models = {slot.model_key for slot in self._slots if slot.job is not None}
+        waiting = [job for job in queued if job.model_key is None or job.model_key not in busy_models]
+        job = (waiting or queued)[0]
+        # A slot holding no model loses nothing by taking the job
+        return job, min(idle, key=lambda slot: slot.model_key is not None)
+
+    def _release_idle_models(self, keep):
+        """Stop idle workers other than keep, freeing the models they hold"""
+        for slot in self._slots:
+            if slot is not keep and slot.job is None and slot.worker is not None:
+                threading.Thread(target=slot.worker.stop, daemon=True).start()
+                slot.worker = None
+                slot.model_key = None
+
+    def _schedule(self):
+        """Start queued jobs while slots and memory allow (called with the lock held)"""
+        while not self._closed:
+            pick = self._pick()
+            if pick is None:
+                return
+            job, slot = pick
+            if not self._fits(job, slot):
+                self._release_idle_models(keep=slot)
+                if not self._fits(job, slot):
+                    return
+            self._start(job, slot)
+
+    def _start(self, job, slot):
+        """Hand job to slot's worker, starting a worker if the slot has none"""
+        job.status = 'running'
+        job.started = time.time()
+        slot.job = job
+        try:
+            if slot.worker is None or not slot.worker.alive:
+                slot.worker = RenderWorker()
+                slot.model_key = None
+                slot.worker.start()
+            slot.worker.submit(job.creator_kwargs)
+        except Exception as e:
+            self._finish(job, slot, 'failed', f"{type(e).__name__}: {e}")
+            return
+        if job.model_key is not None:
+            slot.model_key = job.model_key
+        threading.Thread(target=self._wait, args=(job, slot), daemon=True).start()
+
+    def _wait(self, job, slot):
+        """Wait for a running job on its slot's worker (runs in its own thread)"""
+        output = _JobOutput(job, self.output)
+        status, error = 'done', None
+        try:
+            slot.worker.wait(output, progress=lambda event: setattr(job, 'progress', event))
+        except RenderCancelled:
+            status = 'cancelled'
+        except Exception as e:
+            status, error = 'failed', str(e)
+        output.flush()
+        with self._lock:
+            self._finish(job, slot, status, error)
+            self._schedule()
+
+    def _finish(self, job, slot, status, error=None):
+        """Record a job's outcome and free its slot (called with the lock held)"""
+        job.status = status
+        job.error = error
+        job.finished = time.time()
+        slot.job = None
+        if slot.worker is not None and not slot.worker.alive:
+            # Killed after a cancel or crashed: the next job starts a new worker
+            slot.worker = None
+            slot.model_key = None
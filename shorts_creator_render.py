@@ -0,0 +1,778 @@
+#!/usr/bin/env python3
+"""
+YouTube Shorts Creator - Render Engines
+Fast frame resampling and compositing for the fixed split-screen layout, plus a
+native ffmpeg filtergraph backend that bypasses the Python frame loop
+"""
+
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+import numpy as np
+from PIL import Image
+import imageio_ffmpeg
+from moviepy.video.VideoClip import VideoClip
+from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+
+from shorts_creator_jobs import RenderCancelled, check_cancelled
+
+
+class FFmpegRenderError(RuntimeError):
+    """ffmpeg exited with an error while rendering"""
+
+
+def crop_rectangle(source_width, source_height, target_width, target_height):
+    """
+    Source region that fills the target after an aspect-preserving resize
+    Returns (x0, y0, width, height) in source pixels (floats, centered)
+    """
+    source_aspect = source_width / source_height
+    target_aspect = target_width / target_height
+    if source_aspect > target_aspect:
+        # Source is wider - keep full height, crop width
+        crop_width = source_height * target_aspect
+        return (source_width - crop_width) / 2, 0.0, crop_width, float(source_height)
+    # Source is taller - keep full width, crop height
+    crop_height = source_width / target_aspect
+    return 0.0, (source_height - crop_height) / 2, float(source_width), crop_height
+
+
+class ResizeMap:
+    """
+    Crop-then-resize for one clip geometry
+
+    The crop rectangle is worked out once, in source coordinates, so each
+    frame only resamples the pixels that survive the crop (Pillow's LANCZOS
+    via resize(box=...)). If the crop alone already yields the target size
+    the frame is just sliced, with no resampling at all.
+    """
+
+    def __init__(self, source_size, target_size):
+        self.source_width, self.source_height = source_size
+        self.target_size = tuple(target_size)
+        x0, y0, crop_width, crop_height = crop_rectangle(
+            self.source_width, self.source_height, *self.target_size
+        )
+        self.box = (x0, y0, x0 + crop_width, y0 + crop_height)
+
+        # Whole-pixel crops at 1:1 scale need no resampling
+        self.slices = None
+        if (abs(crop_width - self.target_size[0]) < 1e-6
+                and abs(crop_height - self.target_size[1]) < 1e-6):
+            x, y = int(round(x0)), int(round(y0))
+            self.slices = (slice(y, y + self.target_size[1]), slice(x, x + self.target_size[0]))
+
+    def __call__(self, frame):
+        """Resample one RGB uint8 frame to the target size"""
+        if self.slices is not None:
+            return frame[self.slices]
+        image = Image.fromarray(frame)
+        return np.asarray(image.resize(self.target_size, Image.LANCZOS, box=self.box))
+
+
+class SplitScreenCompositor:
+    """
+    Composites the split-screen layout into one preallocated uint8 buffer
+
+    The divider is painted once. Each frame only copies the top and bottom
+    video regions and the active caption into place with array slicing; no
+    fresh canvas, masks or float conversion are involved. The returned
+    buffer is reused, so consume each frame before requesting the next,
+    or pass your own buffers from new_canvas() to keep several in flight.
+    """
+
+    def __init__(self, width, height, top_y, divider_y, divider_height, bottom_y,
+                 divider_color=(0, 0, 0), caption_timeline=None, caption_position=None):
+        self.width = width
+        self.height = height
+        self.top_y = top_y
+        self.bottom_y = bottom_y
+        self.divider_y = divider_y
+        self.divider_height = divider_height
+        self.caption_timeline = caption_timeline
+        self.caption_position = caption_position
+
+        self.canvas = np.zeros((height, width, 3), dtype=np.uint8)
+        self.canvas[divider_y:divider_y + divider_height] = divider_color
+        self._divider = self.canvas[divider_y:divider_y + divider_height].copy()
+        self._caption_drawn = False
+
+    def new_canvas(self):
+        """Allocate another frame buffer with the divider already painted"""
+        canvas = np.empty_like(self.canvas)
+        canvas[self.divider_y:self.divider_y + self.divider_height] = self._divider
+        return canvas
+
+    def _paste(self, canvas, frame, y):
+        """Copy a frame into the canvas at row y, horizontally centered and clipped"""
+        frame_height, frame_width = frame.shape[:2]
+        x = int((self.width - frame_width) / 2)  # same rounding as moviepy's blit
+        x1, y1 = max(0, -x), max(0, -y)
+        x2 = min(frame_width, self.width - x)
+        y2 = min(frame_height, self.height - y)
+        if x1 >= x2 or y1 >= y2:
+            return
+        canvas[y + y1:y + y2, x + x1:x + x2] = frame[y1:y2, x1:x2]
+
+    def compose(self, top_frame, bottom_frame, t, canvas=None):
+        """
+        Return the composited frame for time t
+        Draws into the shared canvas, or into canvas if one from new_canvas() is given
+        """
+        if canvas is None:
+            canvas = self.canvas
+            # Restore the divider where the previous frame's caption was drawn
+            if self._caption_drawn:
+                canvas[self.divider_y:self.divider_y + self.divider_height] = self._divider
+                self._caption_drawn = False
+        elif self.caption_timeline is not None:
+            # Caller buffers rotate, so we don't know what each one last held
+            canvas[self.divider_y:self.divider_y + self.divider_height] = self._divider
+
+        self._paste(canvas, top_frame, self.top_y)
+
+        if self.caption_timeline is not None:
+            drawn = self.caption_timeline.blit(canvas, t, self.caption_position)
+            if canvas is self.canvas:
+                self._caption_drawn = drawn
+
+        self._paste(canvas, bottom_frame, self.bottom_y)
+        return canvas
+
+
+class CompositorClip(VideoClip):
+    """moviepy clip whose frames come from a SplitScreenCompositor"""
+
+    def __init__(self, compositor, top_clip, bottom_clip, duration):
+        self.compositor = compositor
+        self.top_clip = top_clip
+        self.bottom_clip = bottom_clip
+
+        def make_frame(t):
+            return compositor.compose(top_clip.get_frame(t), bottom_clip.get_frame(t), t)
+
+        VideoClip.__init__(self, make_frame=make_frame, duration=duration)
+
+
+def write_caption_track(timeline, duration, directory):
+    """
+    Write a caption timeline as PNG banners plus an ffconcat playlist
+    Each banner is shown for its time range, with a transparent frame in the
+    gaps, so the whole caption track is a single overlay input for ffmpeg.
+    Returns the playlist path.
+    """
+    directory = Path(directory)
+    blank_name = 'caption_blank.png'
+    Image.fromarray(np.zeros_like(timeline.banners[0])).save(directory / blank_name)
+
+    entries = []
+    banner_files = {}
+    cursor = 0.0
+    for start, end, banner in zip(timeline.starts, timeline.ends, timeline.banners):
+        start, end = max(start, cursor), min(end, duration)
+        if end <= start:
+            continue
+        if start > cursor:
+            entries.append((blank_name, start - cursor))
+
+        # Identical captions share one rendered banner array, and one PNG
+        name = banner_files.get(id(banner))
+        if name is None:
+            name = f"caption_{len(banner_files):05d}.png"
+            Image.fromarray(banner).save(directory / name, compress_level=1)
+            banner_files[id(banner)] = name
+        entries.append((name, end - start))
+        cursor = end
+    if cursor < duration:
+        entries.append((blank_name, duration - cursor))
+
+    playlist = directory / 'captions.ffconcat'
+    with open(playlist, 'w', encoding='utf-8') as playlist_file:
+        playlist_file.write("ffconcat version 1.0\n")
+        for name, entry_duration in entries:
+            playlist_file.write(f"file '{name}'\nduration {entry_duration:.6f}\n")
+        # The concat demuxer ignores the last duration unless the file repeats
+        playlist_file.write(f"file '{entries[-1][0]}'\n")
+    return playlist
+
+
+def _crop_scale_filter(source_size, target_size):
+    """ffmpeg crop+scale chain that crops first, like ResizeMap"""
+    x0, y0, crop_width, crop_height = crop_rectangle(*source_size, *target_size)
+    crop_width, crop_height = int(round(crop_width)), int(round(crop_height))
+    x0, y0 = int(round(x0)), int(round(y0))
+    return (f"crop={crop_width}:{crop_height}:{x0}:{y0},"
+            f"scale={target_size[0]}:{target_size[1]}:flags=lanczos,setsar=1")
+
+
+def _rendition_filter(rendition, source_size, source_fps):
+    """ffmpeg filter chain that turns the full-size stream into a rendition"""
+    parts = []
+    if (rendition['width'], rendition['height']) != tuple(source_size):
+        parts.append(f"scale={rendition['width']}:{rendition['height']}:flags=lanczos")
+    if rendition['fps'] != source_fps:
+        parts.append(f"fps={rendition['fps']}")
+    return ','.join(parts)
+
+
+def build_filtergraph_command(original_path, original_size, reaction_path, reaction_size,
+                              music_path, output_path, duration, width, height,
+                              top_height, bottom_y, fps, video_codec, audio_codec,
+                              preset, bitrate, music_volume, reaction_has_audio=True,
+                              reaction_pcm=None, caption_playlist=None, caption_position=None,
+                              renditions=None):
+    """
+    Build the ffmpeg command that renders the whole split-screen short
+
+    Both videos are cropped and scaled, the top panel is padded to the full
+    canvas (which paints the black divider), the reaction is overlaid below,
+    and the caption track is overlaid on the divider. The reaction audio is
+    mixed with the music at music_volume. reaction_pcm, if given, is an
+    already decoded (path, sample_rate, channels) float32 soundtrack to use
+    instead of decoding the reaction file's audio again. renditions, if
+    given, are extra outputs (dicts with output_path, width, height, fps,
+    bitrate, preset) split off the composited stream and mixed audio.
+    """
+    command = [imageio_ffmpeg.get_ffmpeg_exe(), '-y', '-v', 'error', '-nostats', '-progress', 'pipe:1']
+    command += ['-i', str(original_path), '-i', str(reaction_path)]
+    next_input = 2
+
+    caption_input = None
+    if caption_playlist is not None:
+        command += ['-f', 'concat', '-safe', '0', '-i', str(caption_playlist)]
+        caption_input = next_input
+        next_input += 1
+
+    reaction_audio_input = None
+    if reaction_pcm is not None:
+        pcm_path, sample_rate, channels = reaction_pcm
+        command += ['-f', 'f32le', '-ar', str(sample_rate), '-ac', str(channels), '-i', str(pcm_path)]
+        reaction_audio_input = f"{next_input}:a"
+        next_input += 1
+    elif reaction_has_audio:
+        reaction_audio_input = "1:a:0"
+
+    command += ['-i', str(music_path)]
+    music_input = next_input
+
+    filters = [
+        f"[0:v]{_crop_scale_filter(original_size, (width, top_height))},"
+        f"pad={width}:{height}:0:0:color=black[canvas]",
+        f"[1:v]{_crop_scale_filter(reaction_size, (width, height - bottom_y))}[bottom]",
+        f"[canvas][bottom]overlay=x=0:y={bottom_y}[base]",
+    ]
+    video_label = 'base'
+    if caption_input is not None:
+        filters.append(
+            f"[base][{caption_input}:v]overlay=x={caption_position[0]}:y={caption_position[1]}"
+            f":eof_action=pass[captioned]"
+        )
+        video_label = 'captioned'
+    filters.append(f"[{video_label}]fps={fps},format=yuv420p[vout]")
+
+    filters.append(
+        f"[{music_input}:a:0]atrim=0:{duration:.6f},asetpts=PTS-STARTPTS,"
+        f"volume={music_volume}[music]"
+    )
+    if reaction_audio_input is not None:
+        filters.append(f"[{reaction_audio_input}]atrim=0:{duration:.6f},asetpts=PTS-STARTPTS[reaction]")
+        filters.append("[reaction][music]amix=inputs=2:duration=longest:normalize=0[aout]")
+    else:
+        filters.append("[music]anull[aout]")
+
+    outputs = [(output_path, 'vout', 'aout', preset, bitrate)]
+    if renditions:
+        count = len(renditions) + 1
+        filters.append("[vout]split=" + str(count) + ''.join(f"[vsplit{i}]" for i in range(count)))
+        filters.append("[aout]asplit=" + str(count) + ''.join(f"[asplit{i}]" for i in range(count)))
+        outputs = [(output_path, 'vsplit0', 'asplit0', preset, bitrate)]
+        for i, rendition in enumerate(renditions, start=1):
+            chain = _rendition_filter(rendition, (width, height), fps) or 'null'
+            filters.append(f"[vsplit{i}]{chain}[vrend{i}]")
+            outputs.append((rendition['output_path'], f"vrend{i}", f"asplit{i}",
+                            rendition['preset'], rendition['bitrate']))
+
+    command += ['-filter_complex', ';'.join(filters)]
+    for path, video_label, audio_label, output_preset, output_bitrate in outputs:
+        command += [
+            '-map', f"[{video_label}]", '-map', f"[{audio_label}]",
+            '-t', f"{duration:.6f}",
+            '-c:v', video_codec, '-preset', output_preset, '-b:v', output_bitrate,
+            '-c:a', audio_codec,
+            str(path)
+        ]
+    return command
+
+
+def run_ffmpeg(command, duration, progress_step=10, cancel_event=None, on_progress=None):
+    """
+    Run an ffmpeg command, printing progress every progress_step percent
+    on_progress, if given, is called with the seconds of output written so far.
+    Raises FFmpegRenderError with ffmpeg's error output on failure, or
+    RenderCancelled (after stopping ffmpeg) once cancel_event is set
+    """
+    with tempfile.TemporaryFile() as error_log:
+        process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=error_log, universal_newlines=True
+        )
+        next_report = progress_step
+        for line in process.stdout:
+            if cancel_event is not None and cancel_event.is_set():
+                process.kill()
+                process.wait()
+                check_cancelled(cancel_event)
+            key, _, value = line.strip().partition('=')
+            if key != 'out_time_us' or not value.isdigit() or duration <= 0:
+                continue
+            if on_progress is not None:
+                on_progress(min(duration, int(value) / 1e6))
+            percent = min(100, int(int(value) / 1e6 / duration * 100))
+            if percent >= next_report:
+                print(f"   ⏳ Rendering: {percent}%")
+                next_report = (percent // progress_step + 1) * progress_step
+        process.wait()
+
+        if process.returncode != 0:
+            error_log.seek(0)
+            message = error_log.read().decode('utf-8', 'replace').strip()
+            raise FFmpegRenderError(f"ffmpeg exited with code {process.returncode}: {message[-2000:]}")
+
+
+def count_frames(duration, fps):
+    """Number of frames moviepy writes for a clip (t = 0, 1/fps, ... < duration)"""
+    return int(np.ceil(duration * fps - 1e-6))
+
+
+def plan_segments(total_frames, segment_count, gop_frames):
+    """
+    Split [0, total_frames) into at most segment_count ranges
+    Every boundary falls on a multiple of gop_frames, so each segment starts
+    on a keyframe of the regular GOP grid and the joined stream keeps it.
+    """
+    gops = max(1, int(np.ceil(total_frames / gop_frames)))
+    gops_per_segment = int(np.ceil(gops / max(1, segment_count)))
+    frames_per_segment = gops_per_segment * gop_frames
+    return [
+        (start, min(start + frames_per_segment, total_frames))
+        for start in range(0, total_frames, frames_per_segment)
+    ]
+
+
+def gop_params(gop_frames):
+    """x264 options for a fixed GOP length (no scene-cut keyframes)"""
+    return ['-g', str(gop_frames), '-keyint_min', str(gop_frames), '-sc_threshold', '0']
+
+
+def encode_frames(clip, start_frame, end_frame, fps, output_path, codec, preset,
+                  bitrate, ffmpeg_params=None, cancel_event=None):
+    """
+    Encode frames [start_frame, end_frame) of a clip to a video-only file
+    Frame times are exact multiples of 1/fps, so consecutive ranges tile the
+    timeline with no duplicated or missing frames.
+    """
+    writer = VideoWriter(
+        str(output_path), clip.size, fps, codec=codec, preset=preset,
+        bitrate=bitrate, ffmpeg_params=ffmpeg_params
+    )
+    try:
+        write_clip_frames(clip, writer, start_frame, end_frame, fps, cancel_event)
+    except RenderCancelled:
+        abort_writer(writer)
+        raise
+    finally:
+        writer.close()
+
+
+def write_clip_frames(clip, writer, start_frame, end_frame, fps, cancel_event=None, progress=None):
+    """
+    Feed frames [start_frame, end_frame) of a clip to an open writer, one at a time
+    Raises RenderCancelled before the next frame once cancel_event is set;
+    progress, if given, is called with the number of frames written so far
+    """
+    for frame_index in range(start_frame, end_frame):
+        check_cancelled(cancel_event)
+        frame = clip.get_frame(frame_index / fps)
+        if frame.dtype != np.uint8:
+            frame = frame.astype(np.uint8)
+        writer.write_frame(frame)
+        if progress is not None:
+            progress(frame_index - start_frame + 1)
+
+
+def abort_writer(writer):
+    """
+    Kill a frame writer's ffmpeg instead of letting it finish the file
+    Used when a job is cancelled, so close() does not wait for the encoder to
+    drain its buffered frames
+    """
+    writer.abort()
+
+
+def _kill_encoder(process):
+    """Kill an encoder process and close its pipes"""
+    process.kill()
+    for pipe in (process.stdin, process.stderr):
+        if pipe is not None:
+            try:
+                pipe.close()
+            except OSError:
+                pass
+    process.wait()
+
+
+class VideoWriter(FFMPEG_VideoWriter):
+    """moviepy's frame writer, plus abort() for cancelled jobs"""
+
+    def abort(self):
+        """Kill ffmpeg, leaving an unfinished file"""
+        if self.proc is None:
+            return
+        _kill_encoder(self.proc)
+        self.proc = None
+
+
+class _StageStats:
+    """Busy time of one pipeline stage"""
+
+    def __init__(self):
+        self.frames = 0
+        self.busy_seconds = 0.0
+
+    def as_dict(self, elapsed):
+        return {
+            'frames': self.frames,
+            'ms_per_frame': round(1000 * self.busy_seconds / self.frames, 2) if self.frames else None,
+            'utilization': round(self.busy_seconds / elapsed, 2) if elapsed > 0 else None,
+        }
+
+
+class _DepthQueue(queue.Queue):
+    """Bounded queue that samples its occupancy each time a consumer takes an item"""
+
+    def __init__(self, maxsize):
+        super().__init__(maxsize)
+        self.depth_total = 0
+        self.depth_samples = 0
+        self.depth_max = 0
+
+    def _get(self):
+        depth = self._qsize()
+        self.depth_total += depth
+        self.depth_samples += 1
+        self.depth_max = max(self.depth_max, depth)
+        return super()._get()
+
+    def as_dict(self):
+        return {
+            'capacity': self.maxsize,
+            'depth_avg': round(self.depth_total / self.depth_samples, 2) if self.depth_samples else None,
+            'depth_max': self.depth_max,
+        }
+
+
+class _PipelineOutput:
+    """One compositor + bottom clip + encoder branch fed by the shared top decoder"""
+
+    def __init__(self, compositor, bottom_clip, writer, end_frame):
+        self.compositor = compositor
+        self.bottom_clip = bottom_clip
+        self.writer = writer
+        self.end_frame = end_frame
+
+
+class FramePipeline:
+    """
+    Streams frames through decode, composite and encode stages on threads
+
+    One decoder thread per input (decode + ResizeMap), a compositor thread
+    and an encoder-feeder thread are joined by bounded queues. Composited
+    frames travel in a fixed pool of preallocated canvases that the encoder
+    hands back once written, so nothing is allocated per frame and
+    throughput is set by the slowest stage instead of the sum of all of them
+    (ffmpeg pipe I/O, PIL resampling and NumPy copies release the GIL).
+
+    Several outputs can share one top clip: its frames are decoded and
+    resized once and handed (read-only) to every output's compositor, each
+    with its own bottom decoder and encoder.
+
+    After run(), stats holds each stage's ms/frame and utilization, and the
+    average and peak depth of each queue: a queue that stays full sits in
+    front of the bottleneck, one that stays empty feeds a starved stage.
+
+    A cancel_event passed to run() is checked before every decoded frame;
+    once it is set every stage stops and run() raises RenderCancelled.
+    A progress callback passed to run() is called from the encoder threads
+    with the number of frames encoded so far (all outputs together).
+
+    Usage:
+        pipeline = FramePipeline(top_clip, fps=30)
+        pipeline.add_output(compositor, bottom_clip, writer, end_frame)
+        pipeline.run(start_frame=0)
+    """
+
+    def __init__(self, top_clip, fps, queue_depth=4):
+        self.top_clip = top_clip
+        self.fps = fps
+        self.queue_depth = max(1, queue_depth)
+        self.outputs = []
+        self.stats = {}
+
+    def add_output(self, compositor, bottom_clip, writer, end_frame):
+        """Add an output that encodes frames up to end_frame through writer.write_frame()"""
+        self.outputs.append(_PipelineOutput(compositor, bottom_clip, writer, end_frame))
+
+    def run(self, start_frame=0, cancel_event=None, progress=None):
+        """
+        Encode every output from start_frame to its end_frame
+        Returns the stats dict; the first error raised by any stage is re-raised
+        """
+        end_frame = max(output.end_frame for output in self.outputs)
+        # Stage and queue names get an output suffix only when there are several
+        suffixes = [''] if len(self.outputs) == 1 else [f"[{i}]" for i in range(len(self.outputs))]
+        stages = {'decode_top': _StageStats()}
+        queues = {}
+        branches = []
+        for output, suffix in zip(self.outputs, suffixes):
+            branch = {
+                'output': output,
+                'decode': stages.setdefault(f"decode_bottom{suffix}", _StageStats()),
+                'composite': stages.setdefault(f"composite{suffix}", _StageStats()),
+                'encode': stages.setdefault(f"encode{suffix}", _StageStats()),
+                'top': queues.setdefault(f"top{suffix}", _DepthQueue(self.queue_depth)),
+                'bottom': queues.setdefault(f"bottom{suffix}", _DepthQueue(self.queue_depth)),
+                'encoded': queues.setdefault(f"encode{suffix}", _DepthQueue(self.queue_depth)),
+                # Enough canvases to fill the encode queue plus one being
+                # composited and one being written
+                'canvases': queue.Queue(),
+            }
+            for _ in range(self.queue_depth + 2):
+                branch['canvases'].put(output.compositor.new_canvas())
+            branches.append(branch)
+
+        stop = threading.Event()
+        errors = []
+
+        def put(target, item):
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(source):
+            while not stop.is_set():
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return None
+
+        def read_frame(clip, frame_index, stats):
+            check_cancelled(cancel_event)
+            started = time.perf_counter()
+            frame = clip.get_frame(frame_index / self.fps)
+            if frame.dtype != np.uint8:
+                frame = frame.astype(np.uint8)
+            stats.busy_seconds += time.perf_counter() - started
+            stats.frames += 1
+            return frame
+
+        def decode_top():
+            for frame_index in range(start_frame, end_frame):
+                frame = read_frame(self.top_clip, frame_index, stages['decode_top'])
+                for branch in branches:
+                    if frame_index < branch['output'].end_frame and not put(branch['top'], frame):
+                        return
+
+        def decode_bottom(branch):
+            for frame_index in range(start_frame, branch['output'].end_frame):
+                frame = read_frame(branch['output'].bottom_clip, frame_index, branch['decode'])
+                if not put(branch['bottom'], frame):
+                    return
+
+        def composite(branch):
+            compositor = branch['output'].compositor
+            stats = branch['composite']
+            for frame_index in range(start_frame, branch['output'].end_frame):
+                top_frame = get(branch['top'])
+                bottom_frame = get(branch['bottom'])
+                canvas = get(branch['canvases'])
+                if canvas is None:
+                    return
+                started = time.perf_counter()
+                compositor.compose(top_frame, bottom_frame, frame_index / self.fps, canvas=canvas)
+                stats.busy_seconds += time.perf_counter() - started
+                stats.frames += 1
+                if not put(branch['encoded'], canvas):
+                    return
+
+        def encode(branch):
+            writer = branch['output'].writer
+            stats = branch['encode']
+            for _ in range(start_frame, branch['output'].end_frame):
+                canvas = get(branch['encoded'])
+                if canvas is None:
+                    return
+                started = time.perf_counter()
+                writer.write_frame(canvas)
+                stats.busy_seconds += time.perf_counter() - started
+                stats.frames += 1
+                branch['canvases'].put(canvas)
+                if progress is not None:
+                    progress(sum(other['encode'].frames for other in branches))
+
+        def guarded(stage, *args):
+            try:
+                stage(*args)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+
+        workers = [threading.Thread(target=guarded, args=(decode_top,))]
+        for branch in branches:
+            for stage in (decode_bottom, composite, encode):
+                workers.append(threading.Thread(target=guarded, args=(stage, branch)))
+        started = time.perf_counter()
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        frames = sum(branch['encode'].frames for branch in branches)
+        self.stats = {
+            'frames': frames,
+            'seconds': round(elapsed, 3),
+            'fps': round(frames / elapsed, 1) if elapsed > 0 else None,
+            'stages': {name: stats.as_dict(elapsed) for name, stats in stages.items()},
+            'queues': {name: depth_queue.as_dict() for name, depth_queue in queues.items()},
+        }
+
+        if errors:
+            raise errors[0]
+        return self.stats
+
+
+def format_pipeline_stats(stats):
+    """One line per stage and queue, for the render log"""
+    lines = [f"{stats['frames']} frames in {stats['seconds']:.1f}s ({stats['fps']} fps)"]
+    for name, stage in stats['stages'].items():
+        lines.append(f"{name}: {stage['ms_per_frame']} ms/frame, {stage['utilization'] or 0:.0%} busy")
+    for name, depth in stats['queues'].items():
+        lines.append(f"{name} queue: avg {depth['depth_avg']} / max {depth['depth_max']} of {depth['capacity']}")
+    return lines
+
+
+class RenditionWriter:
+    """
+    Encodes one stream of raw RGB frames into several renditions at once
+
+    A single ffmpeg process reads the composited frames from stdin, splits
+    them inside its filtergraph and scales each copy, so every rendition
+    shares one decode and composite pass and one mixed audio track (copied
+    into each output). Drop-in replacement for VideoWriter.
+    """
+
+    def __init__(self, size, fps, renditions, codec='libx264', audio_path=None, ffmpeg_params=None):
+        self.size = tuple(size)
+        command = [
+            imageio_ffmpeg.get_ffmpeg_exe(), '-y', '-v', 'error',
+            '-f', 'rawvideo', '-vcodec', 'rawvideo',
+            '-s', f"{size[0]}x{size[1]}", '-pix_fmt', 'rgb24', '-r', f"{fps:.02f}",
+            '-an', '-i', '-'
+        ]
+        if audio_path is not None:
+            command += ['-i', str(audio_path)]
+
+        filters = [f"[0:v]split={len(renditions)}" + ''.join(f"[split{i}]" for i in range(len(renditions)))]
+        for i, rendition in enumerate(renditions):
+            chain = _rendition_filter(rendition, size, fps) or 'null'
+            filters.append(f"[split{i}]{chain}[out{i}]")
+        command += ['-filter_complex', ';'.join(filters)]
+
+        for i, rendition in enumerate(renditions):
+            command += ['-map', f"[out{i}]"]
+            if audio_path is not None:
+                command += ['-map', '1:a:0', '-c:a', 'copy']
+            command += ['-c:v', codec, '-preset', rendition['preset'], '-b:v', rendition['bitrate']]
+            command += list(ffmpeg_params or [])
+            command += ['-pix_fmt', 'yuv420p', str(rendition['output_path'])]
+
+        self._error_log = tempfile.TemporaryFile()
+        self._failed = False
+        self.proc = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._error_log
+        )
+
+    def write_frame(self, frame):
+        """Send one RGB uint8 frame at the input size"""
+        try:
+            self.proc.stdin.write(frame.tobytes())
+        except (BrokenPipeError, OSError):
+            self.proc.wait()
+            self._failed = True
+            raise FFmpegRenderError(f"ffmpeg stopped accepting frames: {self._error_message()}")
+
+    def _error_message(self):
+        self._error_log.seek(0)
+        return self._error_log.read().decode('utf-8', 'replace').strip()[-2000:]
+
+    def abort(self):
+        """Kill ffmpeg, leaving unfinished files"""
+        if self.proc is None:
+            return
+        _kill_encoder(self.proc)
+        self.proc = None
+        self._error_log.close()
+
+    def close(self):
+        """Finish encoding every rendition"""
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        returncode = self.proc.wait()
+        self.proc = None
+        message = self._error_message() if returncode != 0 else None
+        self._error_log.close()
+        # A failed write has already raised this error
+        if message is not None and not self._failed:
+            raise FFmpegRenderError(f"ffmpeg exited with code {returncode}: {message}")
+
+
+def concat_segments(segment_paths, audio_path, output_path):
+    """
+    Join video segments with ffmpeg's concat demuxer and mux in the audio
+    Nothing is re-encoded, so this takes seconds regardless of length.
+    """
+    output_path = Path(output_path)
+    with tempfile.NamedTemporaryFile('w', suffix='.ffconcat', delete=False, encoding='utf-8') as playlist:
+        playlist.write("ffconcat version 1.0\n")
+        for segment_path in segment_paths:
+            escaped = str(Path(segment_path).resolve()).replace("'", "'\\''")
+            playlist.write(f"file '{escaped}'\n")
+
+    command = [
+        imageio_ffmpeg.get_ffmpeg_exe(), '-y', '-v', 'error',
+        '-f', 'concat', '-safe', '0', '-i', playlist.name
+    ]
+    if audio_path is not None:
+        command += ['-i', str(audio_path), '-map', '0:v:0', '-map', '1:a:0']
+    command += ['-c', 'copy', '-movflags', '+faststart', str(output_path)]
+
+    try:
+        result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    finally:
+        Path(playlist.name).unlink()
+    if result.returncode != 0:
+        raise FFmpegRenderError(
+            f"Failed to join segments: {result.stderr.decode('utf-8', 'replace').strip()[-2000:]}"
+        )
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+YouTube Shorts Creator - Transcription Server
+Optional local daemon that keeps Whisper models loaded for every GUI, batch
+and API instance on this machine
+
+Usage:
+    python shorts_creator_server.py [--workers 1] [--memory-mb 6000] [--preload base] [--backend whisper]
+    python shorts_creator_server.py --status
+
+The server listens on a localhost port and records the port and a random
+access key in SERVER_INFO_FILE (readable by the current user only). Every
+ShortsCreator that finds the file sends its transcriptions there instead
+of loading its own model, and transcribes in-process as before when the
+server is not running.
+
+Requests are queued and run by a fixed number of transcription threads
+(--workers, default 1), so several instances transcribing at once do not
+fight over the CPU; a free thread takes queued requests for the model (and
+transcription backend) it used last first, so requests for a loaded model
+run back to back.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Listener, AuthenticationError
+from pathlib import Path
+
+from shorts_creator_transcribe import (
+    WhisperModelPool, DEFAULT_MEMORY_BUDGET_MB, TRANSCRIPTION_BACKENDS, DEFAULT_BACKEND
+)
+
+
+# Where a running server publishes its port and access key
+SERVER_INFO_FILE = Path(os.environ.get(
+    'SHORTS_CREATOR_SERVER_FILE', Path.home() / '.shorts_creator' / 'transcription_server.json'
+))
+
+SERVER_HOST = '127.0.0.1'
+
+# Seconds a client waits for the connection handshake before transcribing in-process
+CONNECT_TIMEOUT = 2.0
+
+# How often a waiting client checks for cancellation
+POLL_SECONDS = 0.2
+
+
+class TranscriptionServerError(Exception):
+    """The server could not be reached or failed the request"""
+
+
+def read_server_info(info_file=None):
+    """Port and access key of the running server, or None if none is published"""
+    try:
+        with open(info_file or SERVER_INFO_FILE, encoding='utf-8') as handle:
+            info = json.load(handle)
+        return {'port': int(info['port']), 'authkey': bytes.fromhex(info['authkey'])}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _model_label(model_name, backend):
+    """Model name as shown in logs and status, with any non-default backend"""
+    return model_name if backend == DEFAULT_BACKEND else f"{model_name} [{backend}]"
+
+
+def _write_server_info(info_file, port, authkey):
+    """Publish the server's address and key, readable by this user only"""
+    info_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = info_file.with_name(f"{info_file.name}.{os.getpid()}.tmp")
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+        json.dump({'port': port, 'authkey': authkey.hex(), 'pid': os.getpid()}, handle)
+    os.replace(temp_path, info_file)
+
+
+class _Request:
+    """One queued transcription and, once done, its result"""
+
+    def __init__(self, request_id, payload):
+        self.id = request_id
+        self.payload = payload
+        self.model = _model_label(payload['model'], payload.get('backend') or DEFAULT_BACKEND)
+        self.result = None
+        self.done = threading.Event()
+
+
+class TranscriptionServer:
+    """
+    Serves Whisper transcriptions to ShortsCreator instances on this machine
+
+    Usage:
+        server = TranscriptionServer(workers=1)
+        server.serve_forever()  # until Ctrl+C or shutdown()
+    """
+
+    def __init__(self, workers=1, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, port=0,
+                 download_root=None, info_file=None):
+        """
+        Args:
+            workers: Transcriptions run at once (default: 1)
+            memory_budget_mb: Memory budget of the server's model pool
+            port: Port to listen on (default: any free port)
+            download_root: Whisper model folder (default: Whisper's own cache)
+            info_file: Where to publish the address and key (default: SERVER_INFO_FILE)
+        """
+        self.workers = max(1, workers)
+        self.download_root = download_root
+        self.model_pool = WhisperModelPool(memory_budget_mb)
+        self.info_file = Path(info_file or SERVER_INFO_FILE)
+        self._authkey = secrets.token_bytes(32)
+        self._listener = Listener((SERVER_HOST, port), authkey=self._authkey)
+        self.port = self._listener.address[1]
+        self._pending = []
+        self._running = 0
+        self._served = 0
+        self._ids = itertools.count(1)
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def serve_forever(self):
+        """Accept clients until shutdown(); removes the published info on exit"""
+        _write_server_info(self.info_file, self.port, self._authkey)
+        for index in range(self.workers):
+            threading.Thread(target=self._work, name=f"transcribe-{index + 1}", daemon=True).start()
+        print(f"🛰️ Transcription server listening on {SERVER_HOST}:{self.port} "
+              f"({self.workers} worker{'s' if self.workers != 1 else ''})")
+        try:
+            while not self._closed:
+                try:
+                    connection = self._listener.accept()
+                except AuthenticationError:
+                    continue
+                except OSError:
+                    break
+                threading.Thread(target=self._serve_client, args=(connection,), daemon=True).start()
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """Stop accepting clients and withdraw the published info"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._listener.close()
+        info = read_server_info(self.info_file)
+        if info is not None and info['port'] == self.port:
+            try:
+                self.info_file.unlink()
+            except OSError:
+                pass
+
+    def preload(self, model_name, device=None, backend=DEFAULT_BACKEND):
+        """Load a model before the first request needs it"""
+        self.model_pool.acquire(model_name, device, self.download_root, backend)
+
+    def status(self):
+        """Loaded models, queue length and requests served so far"""
+        with self._condition:
+            return {
+                'models': [_model_label(key[0], key[3]) for key in self.model_pool.loaded_models()],
+                'memory_mb': self.model_pool.memory_usage_mb(),
+                'queued': len(self._pending),
+                'running': self._running,
+                'served': self._served,
+                'workers': self.workers,
+            }
+
+    def _serve_client(self, connection):
+        """Answer one client's requests in order (runs in its own thread)"""
+        with connection:
+            while True:
+                try:
+                    message = connection.recv()
+                except (EOFError, OSError):
+                    return
+                if not isinstance(message, dict):
+                    reply = {'error': 'Malformed request'}
+                elif message.get('op') == 'status':
+                    reply = {'status': self.status()}
+                elif message.get('op') == 'transcribe':
+                    reply = self._transcribe(connection, message)
+                    if reply is None:
+                        return
+                else:
+                    reply = {'error': f"Unknown request: {message.get('op')}"}
+                try:
+                    connection.send(reply)
+                except OSError:
+                    return
+
+    def _transcribe(self, connection, message):
+        """Queue a transcription and wait for it; None if the client went away"""
+        request = _Request(next(self._ids), message)
+        with self._condition:
+            self._pending.append(request)
+            self._condition.notify()
+        while not request.done.wait(POLL_SECONDS):
+            # A client only sends again after our reply, so readable means it hung up
+            if connection.poll():
+                with self._condition:
+                    if request in self._pending:
+                        self._pending.remove(request)
+                return None
+        return request.result
+
+    def _next_request(self, last_model):
+        """Oldest queued request for last_model, else the oldest one (condition held)"""
+        for request in self._pending:
+            if request.model == last_model:
+                return request
+        return self._pending[0]
+
+    def _work(self):
+        """Transcription thread: run queued requests until shutdown"""
+        last_model = None
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                request = self._next_request(last_model)
+                self._pending.remove(request)
+                self._running += 1
+            started = time.perf_counter()
+            try:
+                request.result = {'word_segments': self._run(request.payload)}
+            except Exception as e:
+                request.result = {'error': f"{type(e).__name__}: {e}"}
+            with self._condition:
+                self._running -= 1
+                self._served += 1
+            request.done.set()
+            last_model = request.model
+            print(f"   ✓ Request #{request.id} ({request.model}) done in {time.perf_counter() - started:.1f}s")
+
+    def _run(self, payload):
+        """Transcribe one request's audio with a pooled model"""
+        pooled_model = self.model_pool.acquire(
+            payload['model'], device=payload.get('device'), download_root=self.download_root,
+            backend=payload.get('backend') or DEFAULT_BACKEND
+        )
+        return pooled_model.transcribe(
+            payload['audio'],
+            language=payload.get('language'),
+            word_timestamps=payload.get('word_timestamps', True)
+        )
+
+
+class TranscriptionClient:
+    """
+    Connection to a running TranscriptionServer
+
+    Usage:
+        client = TranscriptionClient.connect()
+        if client is not None:
+            with client:
+                words = client.transcribe(audio, 'base')
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    @classmethod
+    def connect(cls, info_file=None, timeout=CONNECT_TIMEOUT):
+        """Connect to the published server; returns None if it is not running"""
+        info = read_server_info(info_file)
+        if info is None:
+            return None
+        # The handshake runs in a helper thread so a stale port held by some
+        # other program cannot block the job
+        outcome = {'abandoned': False}
+        lock = threading.Lock()
+
+        def handshake():
+            connection = None
+            try:
+                connection = Client((SERVER_HOST, info['port']), authkey=info['authkey'])
+            except (OSError, EOFError, AuthenticationError):
+                pass
+            finally:
+                with lock:
+                    if connection is not None and not outcome['abandoned']:
+                        outcome['connection'], connection = connection, None
+                # A handshake that finishes after connect() gave up has no other owner
+                if connection is not None:
+                    connection.close()
+
+        thread = threading.Thread(target=handshake, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        with lock:
+            outcome['abandoned'] = True
+            connection = outcome.get('connection')
+        return cls(connection) if connection is not None else None
+
+    def transcribe(self, audio, model_name, language=None, word_timestamps=True,
+                   device=None, backend=DEFAULT_BACKEND, check_cancelled=None):
+        """
+        Transcribe audio (16 kHz mono float32 samples, or a media file path)
+        Returns word segments like ShortsCreator._transcribe_audio. While
+        waiting, check_cancelled() is called and may raise to abandon the
+        request. Raises TranscriptionServerError if the server fails.
+        """
+        self._request({
+            'op': 'transcribe', 'audio': audio, 'model': model_name, 'language': language,
+            'word_timestamps': word_timestamps, 'device': device, 'backend': backend,
+        })
+        while not self._connection.poll(POLL_SECONDS):
+            if check_cancelled is not None:
+                check_cancelled()
+        return self._reply()['word_segments']
+
+    def status(self):
+        """The server's status dict (see TranscriptionServer.status)"""
+        self._request({'op': 'status'})
+        return self._reply()['status']
+
+    def _request(self, message):
+        try:
+            self._connection.send(message)
+        except OSError as e:
+            raise TranscriptionServerError(f"Transcription server went away: {e}")
+
+    def _reply(self):
+        try:
+            reply = self._connection.recv()
+        except (EOFError, OSError) as e:
+            raise TranscriptionServerError(f"Transcription server went away: {e}")
+        if 'error' in reply:
+            raise TranscriptionServerError(reply['error'])
+        return reply
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Shared Whisper transcription server for YouTube Shorts Creator")
+    parser.add_argument('--workers', type=int, default=1, help="Transcriptions run at once (default: 1)")
+    parser.add_argument('--memory-mb', type=int, default=DEFAULT_MEMORY_BUDGET_MB,
+                        help=f"Memory budget for loaded models (default: {DEFAULT_MEMORY_BUDGET_MB})")
+    parser.add_argument('--port', type=int, default=0, help="Port to listen on (default: any free port)")
+    parser.add_argument('--download-root', help="Whisper model folder (default: Whisper's own cache)")
+    parser.add_argument('--preload', nargs='*', default=[], metavar='MODEL',
+                        help="Whisper models to load at startup (e.g. base small)")
+    parser.add_argument('--backend', default=DEFAULT_BACKEND, choices=list(TRANSCRIPTION_BACKENDS),
+                        help=f"Transcription backend of the preloaded models (default: {DEFAULT_BACKEND})")
+    parser.add_argument('--status', action='store_true', help="Show the running server's status and exit")
+    args = parser.parse_args()
+
+    if args.status:
+        client = TranscriptionClient.connect()
+        if client is None:
+            print("💤 No transcription server is running")
+            return 1
+        with client:
+            status = client.status()
+        print(f"🛰️ Transcription server: {status['workers']} worker(s), {status['queued']} queued, "
+              f"{status['running']} running, {status['served']} served")
+        print(f"   Models: {', '.join(status['models']) or 'none loaded'} ({status['memory_mb']} MB)")
+        return 0
+
+    server = TranscriptionServer(
+        workers=args.workers, memory_budget_mb=args.memory_mb, port=args.port,
+        download_root=args.download_root
+    )
+    for model_name in args.preload:
+        print(f"📥 Preloading Whisper model '{_model_label(model_name, args.backend)}'...")
+        server.preload(model_name, backend=args.backend)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Transcription server stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
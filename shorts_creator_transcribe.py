@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+YouTube Shorts Creator - Transcription Helpers
+Transcription backends, the process-wide Whisper model pool and the on-disk
+transcript cache shared by every ShortsCreator job
+"""
+
+import os
+import json
+import hashlib
+import subprocess
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from collections import OrderedDict
+from functools import lru_cache
+from contextlib import contextmanager
+import imageio_ffmpeg
+
+
+# Approximate resident memory per model in MB (see DEVELOPER_GUIDE.md)
+MODEL_MEMORY_MB = {
+    'tiny': 1000,
+    'base': 1000,
+    'small': 2000,
+    'medium': 5000,
+    'large': 10000,
+}
+
+# Default memory budget for warm models, overridable via environment
+DEFAULT_MEMORY_BUDGET_MB = int(os.environ.get('SHORTS_CREATOR_MODEL_BUDGET_MB', 6000))
+
+# Default size cap for cached transcripts, overridable via environment
+DEFAULT_TRANSCRIPT_CACHE_MB = int(os.environ.get('SHORTS_CREATOR_TRANSCRIPT_CACHE_MB', 50))
+
+
+def estimate_model_memory_mb(model_name):
+    """
+    Estimate the resident memory of a Whisper model by name
+    Handles variants such as 'base.en' or 'large-v3'
+    """
+    family = model_name.split('.')[0].split('-')[0]
+    return MODEL_MEMORY_MB.get(family, MODEL_MEMORY_MB['large'])
+
+
+def word_segments_from_result(result):
+    """Flatten a Whisper transcribe() result into [{'word', 'start', 'end'}, ...]"""
+    word_segments = []
+    for segment in result['segments']:
+        if 'words' in segment:
+            for word in segment['words']:
+                word_segments.append({
+                    'word': word['word'].strip(),
+                    'start': word['start'],
+                    'end': word['end']
+                })
+    return word_segments
+
+
+def merge_word_segments(chunks):
+    """
+    Join word segments of several chunks (already on one timeline) into one
+    ordered list, dropping a word repeated where two chunks meet (same text,
+    overlapping in time)
+    """
+    merged = []
+    words = sorted((word for chunk in chunks for word in chunk), key=lambda word: (word['start'], word['end']))
+    for word in words:
+        # Whisper words carry their leading space, which differs between chunks
+        if (merged and word['word'].strip().lower() == merged[-1]['word'].strip().lower()
+                and word['start'] < merged[-1]['end']):
+            continue
+        merged.append(word)
+    return merged
+
+
+class TranscriptionBackend(ABC):
+    """
+    How a Whisper model is loaded and run
+
+    A backend turns a model name into a loaded model (load) and a model plus
+    audio into word segments (transcribe). Subclasses set name, the key used
+    by ShortsCreator(transcription_backend=...), the model pool, the
+    transcript cache and the transcription server, and label, shown in the GUI.
+    """
+
+    name = None
+    label = None
+
+    @abstractmethod
+    def load(self, model_name, device=None, download_root=None):
+        """Load a model (downloading it if needed)"""
+
+    @abstractmethod
+    def transcribe(self, model, audio, language=None, word_timestamps=True):
+        """
+        Transcribe audio (16 kHz mono float32 samples, or a media file path)
+        Returns [{'word', 'start', 'end'}, ...]
+        """
+
+    def memory_mb(self, model, model_name):
+        """Parameter memory of a loaded model, falling back to the table"""
+        try:
+            total_bytes = sum(p.numel() * p.element_size() for p in model.parameters())
+            return max(1, total_bytes // (1024 * 1024))
+        except AttributeError:
+            # Not a torch module
+            return estimate_model_memory_mb(model_name)
+
+
+class WhisperBackend(TranscriptionBackend):
+    """Reference backend: openai-whisper's PyTorch model as published"""
+
+    name = 'whisper'
+    label = 'Whisper (PyTorch)'
+
+    def load(self, model_name, device=None, download_root=None):
+        # Whisper pulls in torch, which takes seconds to import: only
+        # jobs that transcribe pay for it
+        import whisper
+        return whisper.load_model(model_name, device=device, download_root=download_root)
+
+    def transcribe(self, model, audio, language=None, word_timestamps=True, **options):
+        result = model.transcribe(audio, word_timestamps=word_timestamps, language=language, **options)
+        return word_segments_from_result(result)
+
+
+@lru_cache(maxsize=None)
+def _dynamic_int8_linear():
+    """
+    PyTorch's dynamic int8 Linear, convertible from Whisper's Linear
+    Whisper's Linear subclass only casts weights to the input dtype, but the
+    stock from_float() accepts nn.Linear and nothing derived from it
+    """
+    import torch
+
+    class DynamicInt8Linear(torch.ao.nn.quantized.dynamic.Linear):
+        @classmethod
+        def from_float(cls, mod, use_precomputed_fake_quant=False):
+            observer = mod.qconfig.weight()
+            observer(mod.weight)
+            scale, zero_point = observer.calculate_qparams()
+            weight = torch.quantize_per_tensor(mod.weight.float(), float(scale), int(zero_point), torch.qint8)
+            linear = cls(mod.in_features, mod.out_features, dtype=torch.qint8)
+            linear.set_weight_bias(weight, mod.bias)
+            return linear
+
+    return DynamicInt8Linear
+
+
+class QuantizedWhisperBackend(WhisperBackend):
+    """
+    Whisper on the CPU with int8 weights
+
+    The model's linear layers (nearly all of its compute) are converted with
+    PyTorch dynamic quantization: weights are stored as int8 and activations
+    quantized on the fly, which typically runs the model faster on the CPU
+    and roughly quarters the memory of those layers. Convolutions,
+    embeddings and layer norms stay in float32.
+    """
+
+    name = 'whisper-int8'
+    label = 'Whisper int8 (CPU)'
+
+    def load(self, model_name, device=None, download_root=None):
+        import torch
+        engines = [engine for engine in ('x86', 'fbgemm', 'qnnpack')
+                   if engine in torch.backends.quantized.supported_engines]
+        if not engines:
+            raise RuntimeError(f"This PyTorch build has no int8 CPU kernels, use the '{WhisperBackend.name}' backend")
+        if torch.backends.quantized.engine not in engines:
+            torch.backends.quantized.engine = engines[0]
+        if device not in (None, 'cpu'):
+            print(f"   ⚠️ The {self.name} backend runs on the CPU only, ignoring device '{device}'")
+
+        try:
+            from torch.ao.quantization import quantize_dynamic, default_dynamic_qconfig
+            int8_linear = _dynamic_int8_linear()
+        except (ImportError, AttributeError) as e:
+            raise RuntimeError(
+                f"This PyTorch build has no dynamic quantization ({e}), use the '{WhisperBackend.name}' backend"
+            ) from e
+
+        from whisper.model import Linear
+        model = super().load(model_name, device='cpu', download_root=download_root)
+        return quantize_dynamic(
+            model, {Linear: default_dynamic_qconfig}, dtype=torch.qint8,
+            mapping={Linear: int8_linear}, inplace=True
+        )
+
+    def transcribe(self, model, audio, language=None, word_timestamps=True):
+        return super().transcribe(model, audio, language, word_timestamps, fp16=False)
+
+    def memory_mb(self, model, model_name):
+        import torch
+        total_bytes = sum(p.numel() * p.element_size() for p in model.parameters())
+        # Quantized layers keep their int8 weights and float biases packed
+        # outside parameters()
+        for module in model.modules():
+            if isinstance(module, torch.ao.nn.quantized.dynamic.Linear):
+                weight, bias = module.weight(), module.bias()
+                total_bytes += weight.numel() * weight.element_size()
+                if bias is not None:
+                    total_bytes += bias.numel() * bias.element_size()
+        return max(1, total_bytes // (1024 * 1024))
+
+
+# Available backends by name; DEFAULT_BACKEND is the reference implementation
+TRANSCRIPTION_BACKENDS = {backend.name: backend for backend in (WhisperBackend(), QuantizedWhisperBackend())}
+DEFAULT_BACKEND = WhisperBackend.name
+
+
+def get_backend(name=None):
+    """The TranscriptionBackend registered under name (default: DEFAULT_BACKEND)"""
+    backend = TRANSCRIPTION_BACKENDS.get(name or DEFAULT_BACKEND)
+    if backend is None:
+        raise ValueError(
+            f"Unknown transcription backend '{name}'. "
+            f"Choose one of: {', '.join(TRANSCRIPTION_BACKENDS)}"
+        )
+    return backend
+
+
+class _PooledModel:
+    """A loaded model, the backend that runs it and the lock that serializes inference on it"""
+
+    def __init__(self, model, memory_mb, backend):
+        self.model = model
+        self.memory_mb = memory_mb
+        self.backend = backend
+        # Whisper installs kv-cache hooks per transcribe() call, so a single
+        # model instance must not run two transcriptions at once
+        self.lock = threading.Lock()
+
+    def transcribe(self, audio, language=None, word_timestamps=True):
+        """Transcribe with this model (waits for its lock); returns word segments"""
+        with self.lock:
+            return self.backend.transcribe(self.model, audio, language, word_timestamps)
+
+
+class WhisperModelPool:
+    """
+    Keeps loaded Whisper models resident across jobs
+
+    Models are keyed by (model name, device, download_root, backend name) and
+    evicted in least-recently-used order once the memory budget is exceeded. The model
+    that was requested last is never evicted, even if it alone exceeds the budget.
+    """
+
+    def __init__(self, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB):
+        self.memory_budget_mb = memory_budget_mb
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def _evict_over_budget(self, keep_key):
+        """Drop least-recently-used models until the pool fits its budget (lock held)"""
+        while self.memory_usage_mb() > self.memory_budget_mb:
+            victim = next((key for key in self._models if key != keep_key), None)
+            if victim is None:
+                break
+            self._models.pop(victim)
+            print(f"   ♻️ Evicted Whisper model '{victim[0]}' from memory pool")
+
+    def acquire(self, model_name, device=None, download_root=None, backend=DEFAULT_BACKEND):
+        """
+        Return the pooled entry for a model, loading it on first use
+        with the named backend; entry.transcribe() runs inference (or hold
+        entry.lock while using entry.model directly)
+        """
+        backend = get_backend(backend)
+        key = (model_name, device, download_root, backend.name)
+
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                print(f"   ✓ Reusing warm Whisper model '{model_name}'")
+                return entry
+            # Only one thread loads a given model; others wait for it
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    self._models.move_to_end(key)
+                    return entry
+
+            print("   📥 Loading Whisper model (will download if needed)...")
+            model = backend.load(model_name, device=device, download_root=download_root)
+            entry = _PooledModel(model, backend.memory_mb(model, model_name), backend)
+            print("   ✓ Model loaded successfully")
+
+            with self._lock:
+                self._models[key] = entry
+                self._loading.pop(key, None)
+                self._evict_over_budget(keep_key=key)
+
+        return entry
+
+    def get(self, model_name, device=None, download_root=None, backend=DEFAULT_BACKEND):
+        """Return a loaded model, loading it on first use"""
+        return self.acquire(model_name, device, download_root, backend).model
+
+    @contextmanager
+    def lease(self, model_name, device=None, download_root=None, backend=DEFAULT_BACKEND):
+        """
+        Borrow a model for exclusive use while transcribing
+
+        Usage:
+            with pool.lease('base', download_root=cache_dir) as model:
+                model.transcribe(...)
+        """
+        entry = self.acquire(model_name, device, download_root, backend)
+        with entry.lock:
+            yield entry.model
+
+    def memory_usage_mb(self):
+        """Total memory of the models currently held in the pool"""
+        return sum(entry.memory_mb for entry in self._models.values())
+
+    def loaded_models(self):
+        """List pooled model keys, least recently used first"""
+        with self._lock:
+            return list(self._models.keys())
+
+    def set_memory_budget(self, memory_budget_mb):
+        """Change the memory budget, evicting models if needed"""
+        with self._lock:
+            self.memory_budget_mb = memory_budget_mb
+            self._evict_over_budget(keep_key=next(reversed(self._models), None))
+
+    def clear(self):
+        """Release every pooled model"""
+        with self._lock:
+            self._models.clear()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_model_pool():
+    """Return the process-wide Whisper model pool"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = WhisperModelPool()
+        return _default_pool
+
+
+def hash_audio_stream(media_path, chunk_size=1024 * 1024):
+    """
+    Fast content hash of a media file's first audio stream
+    The compressed audio packets are copied out by ffmpeg without decoding,
+    so re-muxed or renamed copies of the same reaction hash identically.
+    Falls back to hashing the whole file if the stream cannot be extracted.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    command = [
+        imageio_ffmpeg.get_ffmpeg_exe(), '-v', 'error', '-i', str(media_path),
+        '-map', '0:a:0', '-c', 'copy', '-f', 'data', '-'
+    ]
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        received = 0
+        for chunk in iter(lambda: process.stdout.read(chunk_size), b''):
+            digest.update(chunk)
+            received += len(chunk)
+        process.wait()
+        if process.returncode == 0 and received:
+            return digest.hexdigest()
+    except OSError:
+        pass
+
+    digest = hashlib.blake2b(digest_size=20)
+    with open(media_path, 'rb') as media_file:
+        for chunk in iter(lambda: media_file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    """
+    Persistent on-disk cache of Whisper word segments
+
+    Entries are JSON files named after a key derived from the audio content
+    hash and the transcription settings. Reads refresh an entry's mtime, and
+    the least recently used entries are removed once the cache exceeds max_mb.
+    """
+
+    def __init__(self, cache_dir, max_mb=DEFAULT_TRANSCRIPT_CACHE_MB):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(audio_hash, model_name, language, word_timestamps, speech_only=False,
+                 backend=DEFAULT_BACKEND):
+        """Combine the audio hash with the settings that affect the transcript"""
+        settings = f"{audio_hash}|{model_name}|{language}|{bool(word_timestamps)}"
+        if speech_only:
+            settings += "|speech_only"
+        # The reference backend keeps the keys of transcripts cached before backends existed
+        if backend != DEFAULT_BACKEND:
+            settings += f"|{backend}"
+        return hashlib.blake2b(settings.encode('utf-8'), digest_size=20).hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key):
+        """Return cached word segments for a key, or None on a miss"""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as entry_file:
+                word_segments = json.load(entry_file)['word_segments']
+            os.utime(entry_path)
+            return word_segments
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key, word_segments):
+        """Store word segments for a key and enforce the size cap"""
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            entry_path = self._entry_path(key)
+            temp_path = entry_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as entry_file:
+                json.dump({'word_segments': word_segments}, entry_file)
+            os.replace(temp_path, entry_path)
+            self._evict_over_cap(keep=entry_path)
+
+    def _evict_over_cap(self, keep):
+        """Remove least recently used entries until the cache fits max_bytes"""
+        entries = []
+        for entry_path in self.cache_dir.glob('*.json'):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            if entry_path == keep:
+                continue
+            try:
+                entry_path.unlink()
+                total_bytes -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Delete every cached transcript"""
+        with self._lock:
+            for entry_path in self.cache_dir.glob('*.json'):
+                try:
+                    entry_path.unlink()
+                except OSError:
+                    pass
@@ -0,0 +1,48 @@
+"""Shared fixtures: the modules live at the repository root"""
+
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def tone(frequency, seconds, sample_rate, amplitude=0.5):
+    """Sine wave as float32 samples"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def write_wav(path, samples, sample_rate):
+    """Write float samples (mono, or frames x channels) as a 16-bit WAV file"""
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.ndim == 1:
+        samples = samples[:, None]
+    pcm = (np.clip(samples, -1, 1) * 32767).astype('<i2')
+    with wave.open(str(path), 'wb') as handle:
+        handle.setnchannels(samples.shape[1])
+        handle.setsampwidth(2)
+        handle.setframerate(sample_rate)
+        handle.writeframes(pcm.tobytes())
+    return path
+
+
+@pytest.fixture
+def wav_file(tmp_path):
+    """Factory: wav_file(name, samples, sample_rate) -> path of a WAV in tmp_path"""
+    return lambda name, samples, sample_rate: write_wav(tmp_path / name, samples, sample_rate)
+
+
+@pytest.fixture
+def creator(tmp_path):
+    """ShortsCreator with a manual caption over empty placeholder inputs (for unit tests)"""
+    from shorts_creator_core import ShortsCreator
+    inputs = []
+    for name in ('original.mp4', 'reaction.mp4', 'music.mp3'):
+        path = tmp_path / name
+        path.write_bytes(b'')
+        inputs.append(path)
+    return ShortsCreator(*inputs, caption_text='PIXEL TEST', output_path=tmp_path / 'out.mp4')
@@ -0,0 +1,66 @@
+import os
+import weakref
+
+import numpy as np
+
+from conftest import tone
+from shorts_creator_audio import decode_audio, WHISPER_SAMPLE_RATE
+from shorts_creator_core import ShortsCreator
+
+
+def tone_snr_db(samples, frequency, sample_rate):
+    """Power of the best-fitting sine at frequency vs everything else, in dB"""
+    t = np.arange(len(samples)) / sample_rate
+    basis = np.stack([np.sin(2 * np.pi * frequency * t), np.cos(2 * np.pi * frequency * t)], axis=1)
+    fit = basis @ np.linalg.lstsq(basis, samples, rcond=None)[0]
+    return 10 * np.log10(np.sum(fit ** 2) / np.sum((samples - fit) ** 2))
+
+
+def test_tone_survives_the_mix(wav_file):
+    # A 48 kHz source, as phone recordings usually are, resampled to the output rate
+    reaction = wav_file('reaction.wav', np.repeat(tone(5000, 1.0, 48000)[:, None], 2, axis=1), 48000)
+    music = wav_file('music.wav', np.zeros(44100, dtype=np.float32), 44100)
+    creator = ShortsCreator(reaction, reaction, music, auto_captions=False, caption_text='Hi')
+
+    decoded = decode_audio(reaction)
+    try:
+        final_audio, music_clip = creator._mix_audio(1.0, decoded)
+        mixed = final_audio.to_soundarray(fps=creator.AUDIO_FPS)
+        music_clip.close()
+    finally:
+        decoded.close()
+
+    # Skip the resampler's edges
+    left = mixed[2000:-2000, 0]
+    assert tone_snr_db(left, 5000, creator.AUDIO_FPS) > 40
+
+
+def test_whisper_copy_is_16khz_mono(wav_file):
+    reaction = wav_file('reaction.wav', np.repeat(tone(1000, 2.0, 44100)[:, None], 2, axis=1), 44100)
+    decoded = decode_audio(reaction)
+    try:
+        whisper_audio = decoded.to_whisper()
+        assert whisper_audio.ndim == 1
+        assert abs(len(whisper_audio) - 2 * WHISPER_SAMPLE_RATE) < 100
+        assert tone_snr_db(np.asarray(whisper_audio[500:-500]), 1000, WHISPER_SAMPLE_RATE) > 40
+    finally:
+        decoded.close()
+
+
+def test_close_unmaps_samples_still_used_by_the_mix(wav_file):
+    reaction = wav_file('reaction.wav', np.repeat(tone(1000, 1.0, 44100)[:, None], 2, axis=1), 44100)
+    music = wav_file('music.wav', np.zeros(44100, dtype=np.float32), 44100)
+    creator = ShortsCreator(reaction, reaction, music, auto_captions=False, caption_text='Hi')
+
+    decoded = decode_audio(reaction)
+    mapping = weakref.ref(decoded.samples._mmap)
+    temp_path = decoded.temp_path
+    final_audio, music_clip = creator._mix_audio(1.0, decoded)
+    final_audio.to_soundarray(fps=creator.AUDIO_FPS)
+    music_clip.close()
+
+    # The job still holds final_audio when it closes the decoded audio
+    decoded.close()
+    assert mapping() is None
+    assert not os.path.exists(temp_path)
+    assert final_audio is not None
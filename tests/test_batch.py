@@ -0,0 +1,106 @@
+import json
+from concurrent.futures import Future
+
+import pytest
+
+import shorts_creator_batch as batch
+from shorts_creator_batch import ManifestError, load_manifest, validate_job, run_batch
+
+
+VARIANTS_JOB = {
+    'original': 'original.mp4',
+    'variants': [
+        {'reaction': 'r1.mp4', 'music': 'm.mp3', 'output': 'out1.mp4'},
+        {'reaction': 'r2.mp4', 'music': 'm.mp3', 'output': 'out2.mp4', 'caption_mode': 'none'},
+    ],
+}
+
+
+def test_csv_manifest_resolves_paths_and_drops_blanks(tmp_path):
+    manifest = tmp_path / 'jobs.csv'
+    manifest.write_text(
+        "original,reaction,music,output,caption_mode,caption_text,whisper_model\n"
+        "o.mp4,r.mp4,m.mp3,out.mp4,manual, Hi ,\n"
+        "o.mp4,r.mp4,m.mp3,out2.mp4,,,tiny\n",
+        encoding='utf-8'
+    )
+    first, second = load_manifest(manifest)
+    assert first['original'] == str(tmp_path / 'o.mp4')
+    assert first['output'] == str(tmp_path / 'out.mp4')
+    assert first['caption_text'] == 'Hi' and 'whisper_model' not in first
+    assert (first['id'], second['id']) == ('1', '2')
+    assert second['caption_mode'] == 'auto' and second['whisper_model'] == 'tiny'
+
+
+def test_json_manifest_with_variants(tmp_path):
+    manifest = tmp_path / 'jobs.json'
+    manifest.write_text(json.dumps({'jobs': [dict(VARIANTS_JOB, id='pair')]}), encoding='utf-8')
+    [job] = load_manifest(manifest)
+    assert job['id'] == 'pair'
+    assert [variant['output'] for variant in job['variants']] == [
+        str(tmp_path / 'out1.mp4'), str(tmp_path / 'out2.mp4')
+    ]
+    assert job['variants'][0]['caption_mode'] == 'auto'
+    assert validate_job(job) is None
+
+
+def test_unreadable_manifest(tmp_path):
+    manifest = tmp_path / 'jobs.json'
+    manifest.write_text('{"jobs": ', encoding='utf-8')
+    with pytest.raises(ManifestError):
+        load_manifest(manifest)
+
+
+@pytest.mark.parametrize('job, error', [
+    ({'original': 'o', 'reaction': 'r', 'music': 'm', 'caption_mode': 'auto'}, "Missing field(s): output"),
+    ({'original': 'o', 'reaction': 'r', 'music': 'm', 'output': 'x', 'caption_mode': 'loud'}, "Unknown caption_mode"),
+    ({'original': 'o', 'reaction': 'r', 'music': 'm', 'output': 'x', 'caption_mode': 'manual'}, "needs caption_text"),
+    ({'original': 'o', 'variants': [], 'caption_mode': 'auto'}, "non-empty list"),
+    ({'original': 'o', 'variants': [{'reaction': 'r', 'music': 'm', 'caption_mode': 'auto'}],
+      'caption_mode': 'auto'}, "Variant 1: Missing field(s): output"),
+])
+def test_validate_job_errors(job, error):
+    assert error in validate_job(job)
+
+
+def _variants_job(tmp_path):
+    manifest = tmp_path / 'jobs.json'
+    manifest.write_text(json.dumps([VARIANTS_JOB]), encoding='utf-8')
+    return load_manifest(manifest)[0]
+
+
+def test_crashed_worker_on_variants_job_is_reported(tmp_path):
+    future = Future()
+    future.set_exception(RuntimeError("worker died"))
+    result = batch._collect_result(future, _variants_job(tmp_path))
+    assert result['status'] == 'failed' and result['output'] is None
+    assert "Worker crashed" in result['error']
+
+
+class _IdleExecutor:
+    """Executor whose jobs never start, so Ctrl+C finds them all still queued"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, *args):
+        return Future()
+
+
+def test_interrupted_batch_with_variants_job_still_summarizes(tmp_path, monkeypatch):
+    def interrupted(futures):
+        raise KeyboardInterrupt
+        yield
+
+    monkeypatch.setattr(batch, 'ProcessPoolExecutor', _IdleExecutor)
+    monkeypatch.setattr(batch, 'as_completed', interrupted)
+    summary = run_batch([_variants_job(tmp_path)], workers=1, log_dir=tmp_path / 'logs')
+    [result] = summary['results']
+    assert result['status'] == 'cancelled' and result['output'] is None
+    assert summary['cancelled'] == 1 and summary['failed'] == 0
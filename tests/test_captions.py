@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from shorts_creator_captions import CaptionTimeline
+
+
+def banner(value, alpha=255, size=(4, 6)):
+    """Solid RGBA banner"""
+    array = np.full((*size, 4), value, dtype=np.uint8)
+    array[:, :, 3] = alpha
+    return array
+
+
+@pytest.fixture
+def timeline():
+    # Given out of order: the timeline sorts by start time
+    chunks = [{'start': 2.0, 'end': 3.0}, {'start': 0.0, 'end': 1.0}, {'start': 1.0, 'end': 1.5}]
+    return CaptionTimeline(chunks, [banner(30), banner(10), banner(20)])
+
+
+@pytest.mark.parametrize('t, expected', [
+    (0.0, 10), (0.99, 10), (1.0, 20), (1.49, 20), (1.5, None), (1.9, None),
+    (2.0, 30), (2.99, 30), (3.0, None), (-0.1, None),
+])
+def test_caption_shown_at_each_time(timeline, t, expected):
+    shown = timeline.banner_at(t)
+    assert (shown[0, 0, 0] if shown is not None else None) == expected
+
+
+def test_blit_draws_opaque_banner_in_place(timeline):
+    frame = np.zeros((10, 10, 3), dtype=np.uint8)
+    assert timeline.blit(frame, 0.5, (2, 3))
+    assert (frame[3:7, 2:8] == 10).all()
+    assert frame[:3].sum() == 0 and frame[7:].sum() == 0
+    assert not timeline.blit(frame, 1.7, (2, 3))
+
+
+def test_blit_blends_translucent_banner():
+    timeline = CaptionTimeline([{'start': 0.0, 'end': 1.0}], [banner(200, alpha=128)])
+    frame = np.full((4, 6, 3), 100, dtype=np.uint8)
+    timeline.blit(frame, 0.0, (0, 0))
+    assert (frame == round((200 * 128 + 100 * 127) / 255)).all()
@@ -0,0 +1,78 @@
+import threading
+
+import numpy as np
+import pytest
+from moviepy.video.VideoClip import VideoClip
+
+from shorts_creator_jobs import RenderCancelled
+from shorts_creator_render import RenditionWriter
+
+
+class CountingWriter:
+    """Frame writer stand-in that records frames, close() and abort() calls"""
+
+    def __init__(self, fail_after=None):
+        self.frames = 0
+        self.closes = 0
+        self.aborts = 0
+        self.fail_after = fail_after
+
+    def write_frame(self, frame):
+        if self.fail_after is not None and self.frames >= self.fail_after:
+            raise OSError("encoder died")
+        self.frames += 1
+
+    def close(self):
+        self.closes += 1
+
+    def abort(self):
+        self.aborts += 1
+
+
+@pytest.fixture
+def encoding(creator, monkeypatch):
+    """creator with no audio track to encode, at 10 fps"""
+    monkeypatch.setattr(creator, '_write_audio_track', lambda final_audio, audio_path: None)
+    creator.OUTPUT_FPS = 10
+    return creator
+
+
+def black_clip(duration=1.0):
+    return VideoClip(lambda t: np.zeros((4, 4, 3), dtype=np.uint8), duration=duration)
+
+
+@pytest.mark.parametrize('fail_after, error', [(None, None), (3, OSError)])
+def test_writer_is_closed_exactly_once(encoding, monkeypatch, fail_after, error):
+    creator = encoding
+    writer = CountingWriter(fail_after)
+    monkeypatch.setattr(creator, '_open_writer', lambda *args, **kwargs: writer)
+    if error is None:
+        creator._write_encoded(black_clip(), None, 1.0, 'moviepy')
+        assert writer.frames == 10
+    else:
+        with pytest.raises(error):
+            creator._write_encoded(black_clip(), None, 1.0, 'moviepy')
+    assert writer.closes == 1
+
+
+def test_cancelled_encode_aborts_instead_of_closing(encoding, monkeypatch):
+    creator = encoding
+    creator.cancel_event = threading.Event()
+    creator.cancel_event.set()
+    writer = CountingWriter()
+    monkeypatch.setattr(creator, '_open_writer', lambda *args, **kwargs: writer)
+    with pytest.raises(RenderCancelled):
+        creator._write_encoded(black_clip(), None, 1.0, 'moviepy')
+    assert writer.closes == 0 and writer.frames == 0 and writer.aborts == 1
+
+
+def test_aborted_rendition_writer_releases_its_error_log(tmp_path):
+    renditions = [{'output_path': tmp_path / 'out.mp4', 'width': 16, 'height': 16, 'fps': 10,
+                   'preset': 'ultrafast', 'bitrate': '100k'}]
+    writer = RenditionWriter((16, 16), 10, renditions)
+    writer.write_frame(np.zeros((16, 16, 3), dtype=np.uint8))
+    process = writer.proc
+    writer.abort()
+    assert writer.proc is None and process.returncode is not None
+    assert writer._error_log.closed
+    writer.close()
@@ -0,0 +1,51 @@
+"""Tests for the render worker's cancel handling"""
+
+import threading
+from types import SimpleNamespace
+
+from shorts_creator_process import RenderWorker, _ParentWatchEvent
+
+
+def make_worker(kills):
+    """A RenderWorker with a live-looking process whose kills are recorded"""
+    worker = RenderWorker()
+    worker._process = SimpleNamespace(exitcode=None, pid=0)
+    worker._kill_tree = lambda: kills.append(worker._job_id)
+    return worker
+
+
+def test_grace_timer_kills_the_cancelled_job():
+    kills = []
+    worker = make_worker(kills)
+    worker._busy, worker._job_id = True, 1
+    worker._kill_after_grace(1)
+    assert kills == [1]
+
+
+def test_grace_timer_spares_an_idle_worker():
+    kills = []
+    worker = make_worker(kills)
+    worker._busy, worker._job_id = False, 1
+    worker._kill_after_grace(1)
+    assert kills == []
+
+
+def test_grace_timer_spares_the_next_job():
+    kills = []
+    worker = make_worker(kills)
+    worker._busy, worker._job_id = True, 2
+    worker._kill_after_grace(1)
+    assert kills == []
+
+
+def test_job_is_cancelled_once_the_parent_is_gone():
+    parent = SimpleNamespace(alive=True)
+    parent.is_alive = lambda: parent.alive
+    cancel_event = threading.Event()
+    job_cancel_event = _ParentWatchEvent(cancel_event, parent)
+    assert not job_cancel_event.is_set()
+    parent.alive = False
+    assert job_cancel_event.is_set()
+    parent.alive = True
+    cancel_event.set()
+    assert job_cancel_event.is_set()
@@ -0,0 +1,35 @@
+"""Tests for the GUI job scheduler's slot assignment"""
+
+from shorts_creator_process import job_model_key
+from shorts_creator_queue import JobScheduler, QueuedJob
+
+
+def queued(job_id, **creator_kwargs):
+    return QueuedJob(job_id, {'output_path': f'out{job_id}.mp4', **creator_kwargs})
+
+
+def scheduler_with_models(*model_keys):
+    """A scheduler whose idle slots hold the given models (no workers started)"""
+    scheduler = JobScheduler(max_concurrent=len(model_keys), memory_mb=100000)
+    for slot, model_key in zip(scheduler._slots, model_keys):
+        slot.model_key = model_key
+    return scheduler
+
+
+def test_model_key_includes_the_backend():
+    assert job_model_key({'whisper_model': 'base'}) == ('base', 'whisper')
+    assert job_model_key({'whisper_model': 'base', 'transcription_backend': 'whisper-int8'}) == \
+        ('base', 'whisper-int8')
+    assert job_model_key({'caption_text': 'Hi'}) is None
+
+
+def test_warm_slot_needs_the_same_backend():
+    scheduler = scheduler_with_models(('base', 'whisper'), None)
+    job = queued(1, whisper_model='base', transcription_backend='whisper-int8')
+    scheduler.jobs.append(job)
+    assert scheduler._pick() == (job, scheduler._slots[1])
+
+    same = queued(2, whisper_model='base')
+    scheduler.jobs.insert(0, same)
+    assert scheduler._pick() == (same, scheduler._slots[0])
+
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from PIL import Image
+from moviepy.video.VideoClip import VideoClip
+
+from shorts_creator_render import ResizeMap, crop_rectangle
+
+
+def gradient_frame(width, height, t=0.0):
+    """Smooth synthetic test pattern (shifts with t)"""
+    x = np.linspace(0, 1, width)[None, :]
+    y = np.linspace(0, 1, height)[:, None]
+    red = 255 * (0.5 + 0.5 * np.sin(2 * np.pi * (x * 3 + t)))
+    green = 255 * y
+    blue = 255 * (0.5 + 0.5 * np.cos(2 * np.pi * (x + y) * 2))
+    return np.stack(np.broadcast_arrays(red, green, blue), axis=2).astype(np.uint8)
+
+
+def noise_clip(width, height, seed, duration=1.0):
+    """Clip of fresh random pixels per frame (worst case for blending errors)"""
+    def make_frame(t):
+        rng = np.random.default_rng(seed + int(t * 1000))
+        return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return VideoClip(make_frame, duration=duration)
+
+
+def baseline_resize_and_crop(frame, target_width, target_height):
+    """The original _resize_and_crop: moviepy's PIL resizer on the full frame, then a center crop"""
+    height, width = frame.shape[:2]
+    clip_aspect = width / height
+    if clip_aspect > target_width / target_height:
+        new_height = target_height
+        new_width = int(new_height * clip_aspect)
+    else:
+        new_width = target_width
+        new_height = int(new_width / clip_aspect)
+    # moviepy passes the float size through int() and Pillow's ANTIALIAS, now named LANCZOS
+    resized = np.array(Image.fromarray(frame).resize((new_width, new_height), Image.LANCZOS))
+    x1 = (new_width - target_width) // 2
+    y1 = (new_height - target_height) // 2
+    return resized[y1:y1 + target_height, x1:x1 + target_width]
+
+
+def test_crop_rectangle_keeps_target_aspect():
+    x0, y0, width, height = crop_rectangle(1920, 1080, 1080, 954)
+    assert y0 == 0 and height == 1080
+    assert width / height == pytest.approx(1080 / 954)
+    assert x0 == pytest.approx((1920 - width) / 2)
+
+
+def test_resize_map_slices_whole_pixel_crops_exactly():
+    frame = gradient_frame(1280, 954)
+    resize_map = ResizeMap((1280, 954), (1080, 954))
+    assert resize_map.slices is not None
+    np.testing.assert_array_equal(resize_map(frame), baseline_resize_and_crop(frame, 1080, 954))
+
+
+@pytest.mark.parametrize('source_size', [(1920, 1080), (3840, 2160), (1080, 1920)])
+def test_resize_map_matches_baseline_resize_then_crop(source_size):
+    frame = gradient_frame(*source_size)
+    result = ResizeMap(source_size, (1080, 954))(frame)
+    expected = baseline_resize_and_crop(frame, 1080, 954)
+    assert result.shape == expected.shape == (954, 1080, 3)
+    # Cropping first resamples at a slightly different phase: allow rounding-level differences
+    difference = np.abs(result.astype(int) - expected.astype(int))
+    assert difference.mean() < 1.0
+    assert np.percentile(difference, 99) <= 4
+
+
+def test_numpy_compositor_is_pixel_identical_to_moviepy_composite(creator):
+    original = noise_clip(1280, 720, seed=1)
+    reaction = noise_clip(720, 1280, seed=2)
+    caption_timeline = creator._build_captions(1.0)
+
+    numpy_video = creator._compose_video(original, reaction, caption_timeline, 1.0, 'numpy')
+    moviepy_video = creator._compose_video(original, reaction, caption_timeline, 1.0, 'moviepy')
+    for t in (0.0, 0.25, 0.5, 0.9):
+        np.testing.assert_array_equal(numpy_video.get_frame(t), moviepy_video.get_frame(t))
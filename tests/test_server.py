@@ -0,0 +1,53 @@
+"""Tests for the transcription server client"""
+
+import threading
+import time
+from multiprocessing import Pipe
+
+import shorts_creator_server as server
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def close(self):
+        self.closed.set()
+
+
+def test_late_handshake_is_closed(monkeypatch):
+    connection = FakeConnection()
+
+    def slow_client(address, authkey=None):
+        time.sleep(0.3)
+        return connection
+
+    monkeypatch.setattr(server, 'read_server_info', lambda info_file=None: {'port': 1, 'authkey': b'k'})
+    monkeypatch.setattr(server, 'Client', slow_client)
+    assert server.TranscriptionClient.connect(timeout=0.05) is None
+    assert connection.closed.wait(5)
+
+
+def test_prompt_handshake_is_kept(monkeypatch):
+    connection = FakeConnection()
+    monkeypatch.setattr(server, 'read_server_info', lambda info_file=None: {'port': 1, 'authkey': b'k'})
+    monkeypatch.setattr(server, 'Client', lambda address, authkey=None: connection)
+    client = server.TranscriptionClient.connect(timeout=5)
+    assert client is not None and not connection.closed.is_set()
+
+
+def test_malformed_request_gets_an_error_reply(tmp_path):
+    transcription_server = server.TranscriptionServer(info_file=tmp_path / 'server.json')
+    client_end, server_end = Pipe()
+    thread = threading.Thread(target=transcription_server._serve_client, args=(server_end,), daemon=True)
+    thread.start()
+    try:
+        client_end.send(['status'])
+        assert client_end.recv() == {'error': 'Malformed request'}
+        # The connection is still served
+        client_end.send({'op': 'status'})
+        assert client_end.recv()['status']['queued'] == 0
+    finally:
+        client_end.close()
+        thread.join(5)
+        transcription_server.shutdown()
@@ -0,0 +1,125 @@
+"""Tests for speech-only transcription and chunking"""
+
+import os
+import queue
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import shorts_creator_core as core
+from shorts_creator_audio import WHISPER_SAMPLE_RATE, split_at_pauses
+from shorts_creator_transcribe import TranscriptCache, merge_word_segments
+
+
+WORDS = [{'word': 'hi', 'start': 0.0, 'end': 0.2}]
+
+
+class FakeAudio:
+    """Decoded reaction audio of silence (find_speech_regions is patched)"""
+
+    def __init__(self, seconds):
+        self.samples = np.zeros(int(seconds * WHISPER_SAMPLE_RATE), dtype=np.float32)
+
+    def to_whisper(self):
+        return self.samples
+
+
+class RecordingCache:
+    """Transcript cache that remembers the keys it was asked for"""
+
+    def __init__(self):
+        self.keys = []
+
+    def get(self, key):
+        self.keys.append(key)
+        return WORDS
+
+
+def cache_key(creator, speech_only):
+    return TranscriptCache.make_key(
+        'hash', creator.whisper_model, creator.WHISPER_LANGUAGE, creator.WORD_TIMESTAMPS,
+        speech_only=speech_only
+    )
+
+
+def test_speech_detection_is_opt_in(creator):
+    assert creator.detect_speech is False
+
+
+@pytest.mark.parametrize('regions, speech_only', [
+    ([(1.0, 4.0)], True),          # 3 s of 10 s: only the speech is transcribed
+    ([(0.0, 9.5)], False),         # speech throughout: whole-track fallback
+    ([], False),                   # no speech found: whole-track fallback
+])
+def test_cache_key_follows_the_speech_only_decision(creator, monkeypatch, regions, speech_only):
+    monkeypatch.setattr(core, 'hash_audio_stream', lambda path: 'hash')
+    monkeypatch.setattr(core, 'find_speech_regions', lambda audio: regions)
+    creator.detect_speech = True
+    creator.transcript_cache = RecordingCache()
+    assert creator._transcribe_audio(creator.reaction_video_path, FakeAudio(10.0)) == WORDS
+    assert creator.transcript_cache.keys == [cache_key(creator, speech_only)]
+
+
+REGIONS = [(0.0, 10.0), (12.0, 22.0), (24.0, 34.0), (36.0, 46.0)]
+
+
+def test_split_at_pauses_balances_speech_and_keeps_order():
+    groups = split_at_pauses(REGIONS, 2)
+    assert groups == [REGIONS[:2], REGIONS[2:]]
+    assert [region for group in split_at_pauses(REGIONS, 3) for region in group] == REGIONS
+
+
+def test_split_at_pauses_limits_the_number_of_groups():
+    assert len(split_at_pauses(REGIONS, 10)) == len(REGIONS)
+    assert split_at_pauses(REGIONS, 4, min_chunk_seconds=25.0) == [REGIONS]
+    assert len(split_at_pauses(REGIONS, 4, min_chunk_seconds=20.0)) == 2
+    assert split_at_pauses([], 3) == [[]]
+
+
+def word(text, start, end):
+    return {'word': text, 'start': start, 'end': end}
+
+
+def test_merge_word_segments_orders_and_drops_boundary_repeats():
+    first = [word('hello', 0.0, 0.4), word('there', 9.6, 10.1)]
+    second = [word(' There', 9.8, 10.2), word('friend', 10.3, 10.7)]
+    assert merge_word_segments([second, first]) == [
+        word('hello', 0.0, 0.4), word('there', 9.6, 10.1), word('friend', 10.3, 10.7)
+    ]
+
+
+def test_merge_word_segments_keeps_repeats_that_do_not_overlap():
+    words = [[word('no', 0.0, 0.2)], [word('no', 0.3, 0.5)]]
+    assert merge_word_segments(words) == [word('no', 0.0, 0.2), word('no', 0.3, 0.5)]
+
+
+def test_init_worker_reports_its_pid_before_the_initializer():
+    worker_pids, calls = queue.SimpleQueue(), []
+    core._init_worker(worker_pids, lambda *args: calls.append(args), ('tiny', None))
+    core._init_worker(worker_pids, None, ())
+    assert [worker_pids.get(), worker_pids.get()] == [os.getpid()] * 2
+    assert calls == [('tiny', None)]
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.shutdown_calls = []
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdown_calls.append((wait, cancel_futures))
+
+
+def test_stop_workers_cancels_queued_work_and_terminates_workers():
+    worker = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+    worker_pids = queue.SimpleQueue()
+    worker_pids.put(worker.pid)
+    executor = FakeExecutor()
+    try:
+        core._stop_workers(executor, worker_pids)
+        assert worker.wait(timeout=10) != 0
+    finally:
+        worker.kill()
+    assert executor.shutdown_calls == [(False, True)]
+    assert worker_pids.empty()
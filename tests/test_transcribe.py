@@ -0,0 +1,89 @@
+import os
+import subprocess
+
+import imageio_ffmpeg
+import pytest
+
+from conftest import tone
+from shorts_creator_transcribe import (
+    QuantizedWhisperBackend, TranscriptCache, TranscriptionBackend, hash_audio_stream
+)
+
+
+WORDS = [{'word': 'hello', 'start': 0.0, 'end': 0.4}, {'word': 'there', 'start': 0.5, 'end': 0.9}]
+
+
+def test_make_key_is_stable_and_depends_on_every_setting():
+    key = TranscriptCache.make_key('abc', 'base', 'en', True)
+    assert key == TranscriptCache.make_key('abc', 'base', 'en', 1)
+    variants = {
+        TranscriptCache.make_key('abd', 'base', 'en', True),
+        TranscriptCache.make_key('abc', 'small', 'en', True),
+        TranscriptCache.make_key('abc', 'base', 'de', True),
+        TranscriptCache.make_key('abc', 'base', 'en', False),
+    }
+    assert key not in variants and len(variants) == 4
+
+
+def test_cache_round_trip_and_miss(tmp_path):
+    cache = TranscriptCache(tmp_path / 'transcripts')
+    key = TranscriptCache.make_key('abc', 'base', 'en', True)
+    assert cache.get(key) is None
+    cache.put(key, WORDS)
+    assert cache.get(key) == WORDS
+    assert TranscriptCache(tmp_path / 'transcripts').get(key) == WORDS
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = TranscriptCache(tmp_path)
+    key = TranscriptCache.make_key('abc', 'base', 'en', True)
+    (tmp_path / f"{key}.json").write_text('{not json', encoding='utf-8')
+    assert cache.get(key) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    words = [dict(WORDS[0], word='x' * 200) for _ in range(20)]
+    entry_bytes = len(str(words))
+    cache = TranscriptCache(tmp_path, max_mb=2.5 * entry_bytes / (1024 * 1024))
+    keys = [TranscriptCache.make_key(str(index), 'base', 'en', True) for index in range(3)]
+    cache.put(keys[0], words)
+    cache.put(keys[1], words)
+    # Reading the first entry makes the second one the least recently used
+    past = os.path.getmtime(tmp_path / f"{keys[1]}.json") - 10
+    os.utime(tmp_path / f"{keys[1]}.json", (past, past))
+    cache.get(keys[0])
+    cache.put(keys[2], words)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == words and cache.get(keys[2]) == words
+
+
+def test_audio_hash_ignores_the_container(wav_file, tmp_path):
+    audio = wav_file('voice.wav', tone(440, 1.0, 16000), 16000)
+    remuxed = tmp_path / 'voice.mkv'
+    subprocess.run(
+        [imageio_ffmpeg.get_ffmpeg_exe(), '-v', 'error', '-i', str(audio), '-c:a', 'copy', str(remuxed)],
+        check=True
+    )
+    other = wav_file('other.wav', tone(880, 1.0, 16000), 16000)
+    assert hash_audio_stream(audio) == hash_audio_stream(remuxed)
+    assert hash_audio_stream(audio) != hash_audio_stream(other)
+
+
+def test_quantized_memory_counts_int8_weights():
+    torch = pytest.importorskip('torch')
+    model = torch.nn.Sequential(torch.nn.Embedding(1024, 256), torch.nn.Linear(2048, 2048))
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    # 1 MB float32 embedding + 4 MB int8 weight + 8 kB float32 bias, where
+    # float32 weights would be 16 MB
+    assert QuantizedWhisperBackend().memory_mb(model, 'large') == 5
+
+
+def test_incomplete_backend_cannot_be_created():
+    class LoadOnly(TranscriptionBackend):
+        name = 'load-only'
+
+        def load(self, model_name, device=None, download_root=None):
+            return object()
+
+    with pytest.raises(TypeError):
+        LoadOnly()